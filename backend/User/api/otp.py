@@ -0,0 +1,143 @@
+"""
+Storage and verification of email registration OTPs.
+
+An OTP is six digits that lives for five minutes and allows five tries,
+so a slow password hash buys nothing; what protects it is the expiry and
+the attempt limit. Codes are stored as an HMAC-SHA256 of the email and
+code, keyed with SECRET_KEY, which costs microseconds to issue and check.
+
+OTP_BACKEND picks where they live:
+
+- "redis": one hash per email with a native TTL; attempts are counted
+  atomically in Redis. This is the SECURITY_REDIS_URL instance, which
+  never evicts, so memory pressure cannot reset the attempt limit.
+- "database": the EmailOTP table, the fallback when Redis is not set up.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import F
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from backend.redis_client import get_security_redis
+from User.api.utils import verify_otp
+from User.models import EmailOTP
+
+OTP_TTL = timedelta(minutes=5)
+OTP_MAX_ATTEMPTS = 5
+
+# verify() results
+OTP_OK = "ok"
+OTP_NOT_FOUND = "not_found"
+OTP_EXPIRED = "expired"
+OTP_TOO_MANY_ATTEMPTS = "too_many_attempts"
+OTP_INVALID = "invalid"
+
+
+def otp_digest(email: str, otp: str) -> str:
+    return salted_hmac("User.api.otp", f"{email}:{otp}", algorithm="sha256").hexdigest()
+
+
+class RedisOTPBackend:
+
+    prefix = "otp:email:"
+
+    # Counts the attempt and returns it with the stored digest, or nil if
+    # the OTP expired; a single script so a missing key is never recreated
+    _attempt_script = """
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return nil
+    end
+    local attempts = redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+    return {attempts, redis.call('HGET', KEYS[1], 'digest')}
+    """
+
+    def _key(self, email):
+        return self.prefix + email
+
+    def issue(self, email, otp):
+        key = self._key(email)
+
+        pipe = get_security_redis().pipeline()
+        pipe.delete(key)
+        pipe.hset(key, mapping={"digest": otp_digest(email, otp), "attempts": 0})
+        pipe.expire(key, OTP_TTL)
+        pipe.execute()
+
+    def verify(self, email, otp):
+        redis = get_security_redis()
+        key = self._key(email)
+
+        result = redis.eval(self._attempt_script, 1, key)
+        if result is None:
+            return OTP_NOT_FOUND
+
+        attempts, digest = int(result[0]), result[1].decode()
+        if attempts > OTP_MAX_ATTEMPTS:
+            return OTP_TOO_MANY_ATTEMPTS
+
+        if not constant_time_compare(digest, otp_digest(email, otp)):
+            return OTP_INVALID
+
+        # Consume it; of two concurrent correct tries only one deletes it
+        return OTP_OK if redis.delete(key) else OTP_NOT_FOUND
+
+
+class DatabaseOTPBackend:
+
+    def issue(self, email, otp):
+        EmailOTP.objects.update_or_create(
+            email=email,
+            defaults={
+                "otp_hash": otp_digest(email, otp),
+                "attempts": 0,
+                "expires_at": timezone.now() + OTP_TTL,
+            }
+        )
+
+    def verify(self, email, otp):
+        otp_obj = EmailOTP.objects.filter(email=email).first()
+        if not otp_obj:
+            return OTP_NOT_FOUND
+
+        if otp_obj.is_expired():
+            otp_obj.delete()
+            return OTP_EXPIRED
+
+        # Count the attempt before checking it, in the same statement that
+        # checks the limit, so concurrent guesses cannot all pass the check
+        counted = EmailOTP.objects.filter(
+            pk=otp_obj.pk, attempts__lt=OTP_MAX_ATTEMPTS,
+        ).update(attempts=F("attempts") + 1)
+        if not counted:
+            # Or a concurrent correct try consumed it meanwhile
+            exists = EmailOTP.objects.filter(pk=otp_obj.pk).exists()
+            return OTP_TOO_MANY_ATTEMPTS if exists else OTP_NOT_FOUND
+
+        if otp_obj.otp_hash.startswith("$2"):
+            # bcrypt hash issued before the switch to HMAC
+            matches = verify_otp(otp, otp_obj.otp_hash)
+        else:
+            matches = constant_time_compare(otp_obj.otp_hash, otp_digest(email, otp))
+
+        if not matches:
+            return OTP_INVALID
+
+        deleted, _ = EmailOTP.objects.filter(pk=otp_obj.pk).delete()
+        return OTP_OK if deleted else OTP_NOT_FOUND
+
+
+def build_otp_backend():
+    backend = settings.OTP_BACKEND
+
+    if backend == "redis":
+        return RedisOTPBackend()
+    if backend == "database":
+        return DatabaseOTPBackend()
+
+    raise ImproperlyConfigured(f"Unknown OTP_BACKEND {backend!r}")
+
+
+otp_backend = build_otp_backend()
@@ -0,0 +1,62 @@
+"""
+Background delivery of registration OTP emails.
+
+The send endpoint stores the OTP, hands the email to the Celery "otp"
+queue and answers straight away with a delivery id, so registration does
+not wait on the SMTP handshake. The delivery id is the Celery task id; a
+small record in the Django cache marks it as a real OTP delivery for as
+long as the OTP lives, so unknown or stale ids are reported as not found
+rather than as forever queued.
+"""
+import uuid
+
+from celery.result import AsyncResult
+from django.core.cache import cache
+
+from User.api.otp import OTP_TTL
+from User.api.tasks import send_otp_email_task
+
+OTP_DELIVERY_PREFIX = "otp:delivery:"
+
+QUEUED = "queued"
+SENDING = "sending"
+RETRYING = "retrying"
+SENT = "sent"
+FAILED = "failed"
+
+# Celery task state -> delivery status
+_STATES = {
+    "PENDING": QUEUED,
+    "RECEIVED": QUEUED,
+    "STARTED": SENDING,
+    "RETRY": RETRYING,
+    "SUCCESS": SENT,
+    "FAILURE": FAILED,
+    "REVOKED": FAILED,
+}
+
+
+def _delivery_cache_key(delivery_id):
+    return OTP_DELIVERY_PREFIX + delivery_id
+
+
+def dispatch_otp_email(email, otp):
+    """Queue the OTP email and return its delivery id."""
+    delivery_id = uuid.uuid4().hex
+    ttl = OTP_TTL.total_seconds()
+
+    # Recorded first so a status poll never races the task
+    cache.set(_delivery_cache_key(delivery_id), {"email": email}, timeout=ttl)
+
+    # An OTP that could not go out before it expires is not worth sending
+    send_otp_email_task.apply_async((email, otp), task_id=delivery_id, expires=ttl)
+
+    return delivery_id
+
+
+def otp_delivery_status(delivery_id):
+    """The delivery status, or None if the id is unknown or has expired."""
+    if cache.get(_delivery_cache_key(delivery_id)) is None:
+        return None
+
+    return _STATES.get(AsyncResult(delivery_id).state, QUEUED)
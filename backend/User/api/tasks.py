@@ -0,0 +1,19 @@
+import smtplib
+
+from celery import shared_task
+
+from User.api.utils import send_otp_email
+
+
+# Runs on the "otp" queue (CELERY_TASK_ROUTES) so codes are not stuck
+# behind quotation PDFs and email batches. Retries stay short: the OTP
+# itself expires after five minutes.
+@shared_task(
+    autoretry_for=(smtplib.SMTPException, ConnectionError, TimeoutError),
+    retry_backoff=5,
+    retry_backoff_max=60,
+    max_retries=3,
+)
+def send_otp_email_task(email, otp):
+    # The result is kept for status polling, so it must not carry the OTP
+    return send_otp_email(email, otp)
@@ -0,0 +1,136 @@
+"""
+Sliding-window rate limits for the OTP and password endpoints.
+
+A view opts in with a throttle_scope and the throttle classes for the
+identities to limit by; each class limits "<throttle_scope>_<ident>"
+(e.g. "otp_send_email") at the rate set in DEFAULT_THROTTLE_RATES, and
+scopes without a rate are not limited.
+
+Each limited key is a Redis sorted set of request timestamps, kept in
+the SECURITY_REDIS_URL instance, which never evicts them. One Lua
+script drops the ones older than the window, counts the rest and records
+the new request, so concurrent requests on any number of web workers can
+never overshoot the limit, and the window slides instead of resetting on
+a boundary. Floods are rejected before the view touches SMTP or Postgres.
+
+The client IP is DRF's get_ident(), which only reads X-Forwarded-For
+behind NUM_PROXIES trusted proxies; otherwise any client could pick a
+fresh address per request.
+
+Without SECURITY_REDIS_URL the throttles fall back to DRF's cache based
+history.
+"""
+import logging
+import uuid
+
+import redis
+from django.conf import settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from backend.redis_client import get_security_redis
+from User.api.utils import normalize_email
+
+logger = logging.getLogger(__name__)
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+
+    cache_format = "throttle:%(scope)s:%(ident)s"
+    ident_name = None
+
+    # Wait in milliseconds until the key has room, 0 once the request
+    # has been recorded
+    _hit_script = """
+    local now = redis.call('TIME')
+    local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+    local window = tonumber(ARGV[1])
+    local limit = tonumber(ARGV[2])
+
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now_ms - window)
+    if redis.call('ZCARD', KEYS[1]) < limit then
+        redis.call('ZADD', KEYS[1], now_ms, ARGV[3])
+        redis.call('PEXPIRE', KEYS[1], window)
+        return 0
+    end
+
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return math.max(1, tonumber(oldest[2]) + window - now_ms)
+    """
+
+    def __init__(self):
+        # The scope depends on the view, so the rate is read per request
+        self.wait_ms = None
+
+    def get_ident_value(self, request):
+        raise NotImplementedError(".get_ident_value() must be overridden")
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_value(request)
+        if ident is None:
+            return None
+
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def allow_request(self, request, view):
+        view_scope = getattr(view, "throttle_scope", None)
+        if not view_scope:
+            return True
+
+        self.scope = f"{view_scope}_{self.ident_name}"
+        self.rate = self.THROTTLE_RATES.get(self.scope)
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        if not settings.SECURITY_REDIS_URL:
+            return super().allow_request(request, view)
+
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        try:
+            self.wait_ms = get_security_redis().eval(
+                self._hit_script, 1, self.key,
+                self.duration * 1000, self.num_requests, uuid.uuid4().hex,
+            )
+        except redis.RedisError:
+            # An outage should not lock everyone out of registration
+            logger.warning("Rate limit check for %s failed, allowing", self.scope, exc_info=True)
+            return True
+
+        return self.wait_ms == 0
+
+    def wait(self):
+        if self.wait_ms is None:
+            return super().wait()
+        return self.wait_ms / 1000
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    ident_name = "ip"
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class EmailRateThrottle(SlidingWindowThrottle):
+    """Limits by the email in the request body, whoever sends it."""
+    ident_name = "email"
+
+    def get_ident_value(self, request):
+        try:
+            return normalize_email(request.data.get("email"))
+        except ValueError:
+            # Rejected by the view anyway
+            return None
+
+
+class UserRateThrottle(SlidingWindowThrottle):
+    ident_name = "user"
+
+    def get_ident_value(self, request):
+        if not request.user or not request.user.is_authenticated:
+            return None
+        return request.user.pk
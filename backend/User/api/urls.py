@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import user_registration, RegisterSendEmailOTP, RegisterVerifyEmailOTP, VerifyPassword,ChangePassword
+from .views import user_registration, RegisterSendEmailOTP, RegisterVerifyEmailOTP, EmailOTPDeliveryStatus, VerifyPassword,ChangePassword
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.urls import path
 from .views import me
@@ -9,6 +9,7 @@ urlpatterns = [
     path('api/token/refresh/', TokenRefreshView.as_view()),
     path("api/me/", me, name="me"),
     path("send-email-otp/", RegisterSendEmailOTP.as_view()),
+    path("send-email-otp/<str:delivery_id>/", EmailOTPDeliveryStatus.as_view(), name="email-otp-status"),
     path("verify-email-otp/", RegisterVerifyEmailOTP.as_view()),
     path("verify-password/", VerifyPassword.as_view()),
     path("change-password/", ChangePassword.as_view()),
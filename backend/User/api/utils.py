@@ -1,4 +1,4 @@
-import random
+import secrets
 import bcrypt
 
 from django.core.mail import send_mail
@@ -9,17 +9,10 @@ from django.core.exceptions import ValidationError
 
 # ✅ Generate 6 digit OTP
 def generate_otp():
-    return str(random.randint(100000, 999999))
+    return str(100000 + secrets.randbelow(900000))
 
 
-# ✅ Hash OTP using bcrypt (secure)
-def hash_otp(otp: str) -> str:
-    otp_bytes = otp.encode("utf-8")
-    hashed = bcrypt.hashpw(otp_bytes, bcrypt.gensalt())
-    return hashed.decode("utf-8")
-
-
-# ✅ Verify OTP hash
+# ✅ Verify a legacy bcrypt OTP hash (new OTPs use User/api/otp.py)
 def verify_otp(otp: str, otp_hash: str) -> bool:
     try:
         return bcrypt.checkpw(
@@ -9,9 +9,18 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
-
-from User.models import EmailOTP
-from User.api.utils import generate_otp, hash_otp, verify_otp, send_otp_email, normalize_email
+from django.urls import reverse
+
+from User.api.otp import (
+    OTP_EXPIRED,
+    OTP_INVALID,
+    OTP_NOT_FOUND,
+    OTP_TOO_MANY_ATTEMPTS,
+    otp_backend,
+)
+from User.api.otp_delivery import dispatch_otp_email, otp_delivery_status
+from User.api.throttles import EmailRateThrottle, IPRateThrottle, UserRateThrottle
+from User.api.utils import generate_otp, normalize_email
 User= get_user_model()
 from .serializers import MeSerializer
 
@@ -72,6 +81,8 @@ def user_registration(request):
 
 class VerifyPassword(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_classes = [UserRateThrottle, IPRateThrottle]
+    throttle_scope = "password"
 
     def post(self, request):
         password = request.data.get("password")
@@ -85,6 +96,8 @@ class VerifyPassword(APIView):
         return Response({"message": "Wrong password"}, status=400)
 class ChangePassword(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_classes = [UserRateThrottle, IPRateThrottle]
+    throttle_scope = "password"
 
     def post(self, request):
         current_password = request.data.get("current_password")
@@ -98,6 +111,9 @@ class ChangePassword(APIView):
 
         return Response({"message": "Password updated successfully"}, status=200)
 class RegisterSendEmailOTP(APIView):
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = "otp_send"
+
     def post(self, request):
         email = request.data.get("email")
 
@@ -115,23 +131,31 @@ class RegisterSendEmailOTP(APIView):
 
         otp = generate_otp()
 
-        EmailOTP.objects.update_or_create(
-            email=email,
-            defaults={
-                "otp_hash": hash_otp(otp),
-                "attempts": 0,
-            }
-        )
+        otp_backend.issue(email, otp)
 
-        resp = send_otp_email(email, otp)
+        # ✅ Emailed by the Celery "otp" worker; poll status_url for delivery
+        delivery_id = dispatch_otp_email(email, otp)
 
         return Response({
             "message": "OTP sent",
-            "gateway_response": resp
-        }, status=status.HTTP_200_OK)
+            "delivery_id": delivery_id,
+            "status_url": reverse("email-otp-status", args=[delivery_id]),
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class EmailOTPDeliveryStatus(APIView):
+    def get(self, request, delivery_id):
+        delivery_status = otp_delivery_status(delivery_id)
+        if delivery_status is None:
+            return Response({"message": "Delivery not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({"delivery_id": delivery_id, "status": delivery_status})
 
 
 class RegisterVerifyEmailOTP(APIView):
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = "otp_verify"
+
     def post(self, request):
         email = request.data.get("email")
         otp = request.data.get("otp")
@@ -157,26 +181,23 @@ class RegisterVerifyEmailOTP(APIView):
         if User.objects.filter(email=email).exists():
             return Response({"message": "Email already registered"}, status=status.HTTP_400_BAD_REQUEST)
 
-        # ✅ Find OTP
-        otp_obj = EmailOTP.objects.filter(email=email).first()
-        if not otp_obj:
+        # ✅ Verify OTP (consumed on success)
+        otp_clean = str(otp).strip().replace(" ", "")
+        result = otp_backend.verify(email, otp_clean)
+
+        if result == OTP_NOT_FOUND:
             return Response({"message": "OTP not found"}, status=status.HTTP_400_BAD_REQUEST)
 
-        if otp_obj.is_expired():
-            otp_obj.delete()
+        if result == OTP_EXPIRED:
             return Response({"message": "OTP expired"}, status=status.HTTP_400_BAD_REQUEST)
 
-        if otp_obj.attempts >= 5:
+        if result == OTP_TOO_MANY_ATTEMPTS:
             return Response(
                 {"message": "Too many attempts. Please resend OTP."},
                 status=status.HTTP_429_TOO_MANY_REQUESTS
             )
 
-        # ✅ Verify OTP
-        otp_clean = str(otp).strip().replace(" ", "")
-        if not verify_otp(otp_clean, otp_obj.otp_hash):
-            otp_obj.attempts += 1
-            otp_obj.save()
+        if result == OTP_INVALID:
             return Response({"message": "Invalid OTP"}, status=status.HTTP_400_BAD_REQUEST)
 
         # ✅ Create user after OTP success
@@ -187,6 +208,4 @@ class RegisterVerifyEmailOTP(APIView):
             first_name=full_name
         )
 
-        otp_obj.delete()
-
         return Response({"message": "Account created successfully"}, status=status.HTTP_201_CREATED)
\ No newline at end of file
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    auth_user belongs to django.contrib.auth, so its index for keyset
+    pagination of the admin users list (date_joined, id) is added here as
+    plain SQL.
+    """
+
+    dependencies = [
+        ('User', '0003_emailotp_delete_phoneotp'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS "auth_user_date_joined_id_idx" ON "auth_user" ("date_joined", "id")',
+            reverse_sql='DROP INDEX IF EXISTS "auth_user_date_joined_id_idx"',
+        ),
+    ]
@@ -1,3 +1,132 @@
-from django.test import TestCase
+import time
+from datetime import timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+from backend import redis_client
+from User.api.otp import (
+    OTP_EXPIRED,
+    OTP_INVALID,
+    OTP_MAX_ATTEMPTS,
+    OTP_NOT_FOUND,
+    OTP_OK,
+    OTP_TOO_MANY_ATTEMPTS,
+    DatabaseOTPBackend,
+    RedisOTPBackend,
+)
+from User.api.throttles import SlidingWindowThrottle
+from User.models import EmailOTP
+
+
+@override_settings(SECURITY_REDIS_URL=None)
+class IPRateThrottleTests(TestCase):
+
+    url = "/accounts/verify-email-otp/"
+
+    def setUp(self):
+        cache.clear()
+        rates = mock.patch.object(SlidingWindowThrottle, "THROTTLE_RATES", {"otp_verify_ip": "2/hour"})
+        rates.start()
+        self.addCleanup(rates.stop)
+
+        self.client = APIClient()
+
+    def verify(self, n, **headers):
+        return self.client.post(self.url, {"email": f"user{n}@example.com"}, format="json", **headers)
+
+    def test_forwarded_for_does_not_reset_the_ip_limit(self):
+        # Without trusted proxies the header is the client's to choose
+        statuses = [
+            self.verify(n, HTTP_X_FORWARDED_FOR=f"203.0.113.{n}").status_code
+            for n in range(3)
+        ]
+
+        self.assertEqual(statuses[:2], [400, 400])
+        self.assertEqual(statuses[2], 429)
+
+    @override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 1})
+    def test_trusted_proxy_address_is_used(self):
+        statuses = [
+            self.verify(n, HTTP_X_FORWARDED_FOR=f"203.0.113.{n}").status_code
+            for n in range(3)
+        ]
+
+        self.assertNotIn(429, statuses)
+
+
+class OTPBackendTests:
+    """Shared checks; subclasses set backend and expire()."""
+
+    email = "new@example.com"
+    expired_result = OTP_EXPIRED
+
+    def setUp(self):
+        super().setUp()
+        self.backend.issue(self.email, "123456")
+
+    def test_code_works_once(self):
+        self.assertEqual(self.backend.verify(self.email, "123456"), OTP_OK)
+        self.assertEqual(self.backend.verify(self.email, "123456"), OTP_NOT_FOUND)
+
+    def test_expired_code_is_refused(self):
+        self.expire()
+
+        self.assertEqual(self.backend.verify(self.email, "123456"), self.expired_result)
+
+    def test_attempts_run_out(self):
+        for _ in range(OTP_MAX_ATTEMPTS):
+            self.assertEqual(self.backend.verify(self.email, "000000"), OTP_INVALID)
+
+        # Even the right code, once the tries are used up
+        self.assertEqual(self.backend.verify(self.email, "123456"), OTP_TOO_MANY_ATTEMPTS)
+
+    def test_new_code_replaces_the_old_one(self):
+        self.backend.issue(self.email, "654321")
+
+        self.assertEqual(self.backend.verify(self.email, "123456"), OTP_INVALID)
+        self.assertEqual(self.backend.verify(self.email, "654321"), OTP_OK)
+
+
+class DatabaseOTPBackendTests(OTPBackendTests, TestCase):
+
+    backend = DatabaseOTPBackend()
+
+    def expire(self):
+        EmailOTP.objects.filter(email=self.email).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+    def test_limit_holds_for_guesses_read_before_it_was_reached(self):
+        # What concurrent guesses see: the row as it was before the others
+        # counted their attempts
+        stale = EmailOTP.objects.get(email=self.email)
+        EmailOTP.objects.filter(pk=stale.pk).update(attempts=OTP_MAX_ATTEMPTS)
+
+        with mock.patch("django.db.models.query.QuerySet.first", return_value=stale):
+            self.assertEqual(self.backend.verify(self.email, "123456"), OTP_TOO_MANY_ATTEMPTS)
+
+
+@skipUnless(fakeredis, "fakeredis is not installed")
+class RedisOTPBackendTests(OTPBackendTests, TestCase):
+
+    backend = RedisOTPBackend()
+    # Redis drops the key with its TTL, so there is nothing left to tell apart
+    expired_result = OTP_NOT_FOUND
+
+    def setUp(self):
+        client = mock.patch.object(redis_client, "_security_client", fakeredis.FakeRedis())
+        self.redis = client.start()
+        self.addCleanup(client.stop)
+        super().setUp()
+
+    def expire(self):
+        self.redis.pexpire(self.backend._key(self.email), 1)
+        time.sleep(0.01)
@@ -7,3 +7,5 @@ app = Celery('backend')
 
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
+# Apps keep their tasks in api/tasks.py
+app.autodiscover_tasks(["pricingModel.api", "User.api"])
@@ -0,0 +1,46 @@
+"""
+Shared redis-py clients for the few features that need Redis data
+structures (lists, atomic counters) rather than the Django cache API.
+
+get_redis() is the general Redis at REDIS_URL, which also holds the
+cache and evicts under memory pressure. get_security_redis() is for
+state that must never be evicted, like OTP attempt counters and rate
+limit windows: SECURITY_REDIS_URL, a Redis run with noeviction.
+"""
+import threading
+
+import redis
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+_client = None
+_security_client = None
+_client_lock = threading.Lock()
+
+
+def get_redis() -> redis.Redis:
+    """The process-wide client; redis-py pools connections underneath."""
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if not settings.REDIS_URL:
+                    raise ImproperlyConfigured("REDIS_URL is not set")
+                _client = redis.Redis.from_url(settings.REDIS_URL)
+
+    return _client
+
+
+def get_security_redis() -> redis.Redis:
+    """The process-wide client for SECURITY_REDIS_URL."""
+    global _security_client
+
+    if _security_client is None:
+        with _client_lock:
+            if _security_client is None:
+                if not settings.SECURITY_REDIS_URL:
+                    raise ImproperlyConfigured("SECURITY_REDIS_URL is not set")
+                _security_client = redis.Redis.from_url(settings.SECURITY_REDIS_URL)
+
+    return _security_client
@@ -1,6 +1,7 @@
 from pathlib import Path
 from datetime import timedelta
 import os
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -101,10 +102,43 @@ SIMPLE_JWT = {
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+    ),
+    'EXCEPTION_HANDLER': 'pricingModel.api.exceptions.pricing_exception_handler',
+    # Reverse proxies in front of gunicorn that append to X-Forwarded-For.
+    # 0 (gunicorn is exposed directly) makes client IPs REMOTE_ADDR, so a
+    # client cannot spoof its way past the per-IP rate limits
+    'NUM_PROXIES': int(os.getenv("NUM_PROXIES", 0)),
+    # Sliding windows per "<view throttle_scope>_<ip|email|user>" (User/api/throttles.py)
+    'DEFAULT_THROTTLE_RATES': {
+        'otp_send_ip': os.getenv("THROTTLE_OTP_SEND_IP", "20/hour"),
+        'otp_send_email': os.getenv("THROTTLE_OTP_SEND_EMAIL", "5/hour"),
+        'otp_verify_ip': os.getenv("THROTTLE_OTP_VERIFY_IP", "60/hour"),
+        'otp_verify_email': os.getenv("THROTTLE_OTP_VERIFY_EMAIL", "10/hour"),
+        'password_user': os.getenv("THROTTLE_PASSWORD_USER", "10/hour"),
+        'password_ip': os.getenv("THROTTLE_PASSWORD_IP", "30/hour"),
+    },
 }
 
 
+# ========================
+# AUDIT LOG (pricingModel/api/audit.py)
+# ========================
+
+# Buffer audit events and write them in batches from a background thread
+AUDIT_BUFFERED = os.getenv("AUDIT_BUFFERED", "1") == "1"
+AUDIT_FLUSH_BATCH_SIZE = int(os.getenv("AUDIT_FLUSH_BATCH_SIZE", 100))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", 2))
+AUDIT_BUFFER_MAX = int(os.getenv("AUDIT_BUFFER_MAX", 10000))
+
+# Monthly partitions (pricingModel/api/audit_archive.py): months older than
+# the retention window go to gzipped NDJSON in AUDIT_ARCHIVE_DIR and are
+# dropped; the admin listing only reads the last AUDIT_HOT_DAYS
+AUDIT_RETENTION_MONTHS = int(os.getenv("AUDIT_RETENTION_MONTHS", 12))
+AUDIT_ARCHIVE_DIR = os.getenv("AUDIT_ARCHIVE_DIR", BASE_DIR / "audit_archive")
+AUDIT_PARTITIONS_AHEAD = int(os.getenv("AUDIT_PARTITIONS_AHEAD", 3))
+AUDIT_HOT_DAYS = int(os.getenv("AUDIT_HOT_DAYS", 90))
+
+
 # ========================
 # CORS (Angular Fix)
 # ========================
@@ -126,14 +160,86 @@ EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Quotation emails drained per batch over one SMTP connection (pricingModel/api/mail.py)
+QUOTATION_EMAIL_BATCH_SIZE = int(os.getenv("QUOTATION_EMAIL_BATCH_SIZE", 50))
+
 
 # ========================
 # CELERY (Optional)
 # ========================
 
+REDIS_URL = os.getenv("REDIS_URL")
+
+# OTP attempt counters and rate limit windows must not be evicted, which
+# REDIS_URL (a bounded cache with volatile-lru) would do under memory
+# pressure; run a separate Redis with noeviction for them (docker-compose
+# "redis-security"). Falls back to REDIS_URL.
+SECURITY_REDIS_URL = os.getenv("SECURITY_REDIS_URL", REDIS_URL)
+
+# Registration OTP store (User/api/otp.py): "redis" or "database"
+OTP_BACKEND = os.getenv("OTP_BACKEND", "redis" if SECURITY_REDIS_URL else "database")
+
 CELERY_BROKER_URL = os.getenv("REDIS_URL")
 CELERY_RESULT_BACKEND = os.getenv("REDIS_URL")
 
+# Report STARTED so PDF render jobs can be polled as "rendering"
+CELERY_TASK_TRACK_STARTED = True
+CELERY_RESULT_EXPIRES = 60 * 60
+
+# Registration OTP emails get their own queue and worker (docker-compose
+# "celery-otp") so they never wait behind PDF renders or email batches
+CELERY_TASK_ROUTES = {
+    "User.api.tasks.send_otp_email_task": {"queue": "otp"},
+}
+
+CELERY_BEAT_SCHEDULE = {
+    "email-delivery-reaper": {
+        "task": "pricingModel.api.tasks.requeue_stale_email_deliveries_task",
+        "schedule": crontab(minute="*/5"),
+    },
+    "audit-log-maintenance": {
+        "task": "pricingModel.api.tasks.maintain_audit_log_task",
+        "schedule": crontab(hour=3, minute=15),
+    },
+}
+
+
+# ========================
+# CACHE (shared across gunicorn / celery workers)
+# ========================
+
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Where workers share the pricing catalog version (pricingModel/api/catalog.py):
+# "cache" needs a cache every process sees, so without Redis it is a DB row
+CATALOG_VERSION_STORE = os.getenv("CATALOG_VERSION_STORE", "cache" if REDIS_URL else "database")
+
+# Memoised quote breakdowns (pricingModel/api/quote_cache.py)
+QUOTE_CACHE_TIMEOUT = int(os.getenv("QUOTE_CACHE_TIMEOUT", 60 * 60))
+QUOTE_CACHE_LOCAL_SIZE = int(os.getenv("QUOTE_CACHE_LOCAL_SIZE", 1024))
+
+# Rendered quotation PDFs (pricingModel/api/pdf_cache.py), shared by web and
+# Celery: "filesystem" (a directory both mount) or "cache" (Redis)
+QUOTATION_PDF_STORE = os.getenv("QUOTATION_PDF_STORE", "filesystem")
+QUOTATION_PDF_CACHE_TIMEOUT = int(os.getenv("QUOTATION_PDF_CACHE_TIMEOUT", 24 * 60 * 60))
+QUOTATION_PDF_CACHE_DIR = os.getenv("QUOTATION_PDF_CACHE_DIR", BASE_DIR / "pdf_cache")
+QUOTATION_PDF_CACHE_MAX_BYTES = int(os.getenv("QUOTATION_PDF_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Renderer processes per web worker (pricingModel/api/pdf_renderer.py), 0 renders inline
+PDF_RENDER_PROCESSES = int(os.getenv("PDF_RENDER_PROCESSES", 2))
+
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 ROOT_URLCONF = 'backend.urls'
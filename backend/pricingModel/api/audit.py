@@ -1,19 +1,185 @@
+"""
+Audit logging off the request path.
+
+create_audit_log only appends the event to an in-process buffer; a
+background thread writes buffered events with one bulk_create per batch,
+as soon as AUDIT_FLUSH_BATCH_SIZE events are waiting or at the latest
+every AUDIT_FLUSH_INTERVAL seconds. Each event keeps the time it happened
+in created_at, so batching does not shift the log.
+
+Whatever is still buffered is written when the process exits: gunicorn
+workers run atexit on a graceful shutdown, Celery pool processes leave
+through os._exit and are flushed from worker_process_shutdown instead.
+
+A batch the database rejects is written again row by row, so one bad
+event (say a user deleted since it was buffered) is logged and dropped
+without holding back the rest. If the database itself is away the
+unwritten events are kept for the next flush; should AUDIT_BUFFER_MAX of
+them pile up, the oldest are dropped rather than letting memory grow.
+
+With AUDIT_BUFFERED off, events are written inline as before.
+"""
+import atexit
+import ipaddress
+import logging
+import os
+import threading
+from collections import deque
+
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, close_old_connections, transaction
+from django.utils import timezone
+from rest_framework.throttling import BaseThrottle
+
 from pricingModel.models import AuditLog
 
+logger = logging.getLogger(__name__)
+
+# Failures that say nothing about the events themselves; anything else
+# means a row was rejected
+DATABASE_AWAY = (OperationalError, InterfaceError)
+
+
 def get_client_ip(request):
-    x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
-    if x_forwarded_for:
-        return x_forwarded_for.split(",")[0].strip()
-    return request.META.get("REMOTE_ADDR")
+    # Same address the throttles use: X-Forwarded-For only counts behind
+    # NUM_PROXIES trusted proxies. Anything that is not an address is
+    # stored as NULL instead of failing the insert later.
+    try:
+        return str(ipaddress.ip_address(BaseThrottle().get_ident(request)))
+    except ValueError:
+        return None
+
+
+class AuditBuffer:
+
+    def __init__(self, batch_size, interval, max_size):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_size = max_size
+
+        self._events = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def _ensure_flusher(self):
+        # Threads do not survive a fork, so each worker starts its own
+        if self._thread is None or self._pid != os.getpid():
+            if self._pid is not None:
+                # Events copied from the parent are the parent's to write
+                self._events.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="audit-flusher", daemon=True)
+            self._thread.start()
+
+    def add(self, event):
+        with self._lock:
+            self._ensure_flusher()
+
+            if len(self._events) >= self.max_size:
+                self._events.popleft()
+                logger.error("Audit buffer full, dropped the oldest event")
+
+            self._events.append(event)
+            if len(self._events) >= self.batch_size:
+                self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Audit flush failed")
+            finally:
+                close_old_connections()
+
+    def _take(self):
+        with self._lock:
+            return [self._events.popleft() for _ in range(min(self.batch_size, len(self._events)))]
+
+    def _restore(self, batch):
+        with self._lock:
+            room = self.max_size - len(self._events)
+            if room < len(batch):
+                logger.error("Audit buffer full, dropped %s events", len(batch) - room)
+            self._events.extendleft(reversed(batch[len(batch) - max(room, 0):]))
+
+    def flush(self):
+        """Write everything buffered so far; the number of events written."""
+        written = 0
+
+        with self._flush_lock:
+            while True:
+                batch = self._take()
+                if not batch:
+                    return written
+
+                try:
+                    with transaction.atomic():
+                        AuditLog.objects.bulk_create([AuditLog(**event) for event in batch])
+                except DATABASE_AWAY:
+                    self._restore(batch)
+                    raise
+                except Exception:
+                    # Some row in the batch is bad; find it
+                    written += self._write_each(batch)
+                else:
+                    written += len(batch)
+
+    def _write_each(self, batch):
+        written = 0
+
+        for i, event in enumerate(batch):
+            try:
+                with transaction.atomic():
+                    AuditLog.objects.create(**event)
+            except DATABASE_AWAY:
+                self._restore(batch[i:])
+                raise
+            except Exception:
+                logger.exception("Dropped an audit event the database rejected: %r", event)
+            else:
+                written += 1
+
+        return written
+
+
+audit_buffer = AuditBuffer(
+    batch_size=settings.AUDIT_FLUSH_BATCH_SIZE,
+    interval=settings.AUDIT_FLUSH_INTERVAL,
+    max_size=settings.AUDIT_BUFFER_MAX,
+)
+
+
+@atexit.register
+@worker_process_shutdown.connect
+def _flush_audit_buffer(**kwargs):
+    try:
+        audit_buffer.flush()
+    except Exception:
+        logger.exception("Could not write buffered audit events on exit")
+
 
 def create_audit_log(request, action: str, details: str = ""):
     try:
-        AuditLog.objects.create(
-            user=request.user if request.user.is_authenticated else None,
-            action=action,
-            details=details,
-            ip_address=get_client_ip(request),
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
-        )
+        event = {
+            "user_id": request.user.id if request.user.is_authenticated else None,
+            "action": action,
+            "details": details,
+            "ip_address": get_client_ip(request),
+            "user_agent": request.META.get("HTTP_USER_AGENT", ""),
+            "created_at": timezone.now(),
+        }
+
+        if settings.AUDIT_BUFFERED:
+            audit_buffer.add(event)
+        else:
+            AuditLog.objects.create(**event)
     except Exception:
         pass
@@ -0,0 +1,264 @@
+"""
+Monthly AuditLog storage, retention and cold archive.
+
+On Postgres the audit table is partitioned by month on created_at
+(migration 0004): every month is its own table, named
+pricingModel_auditlog_pYYYY_MM. A query bounded on created_at, like the
+admin listing over the last AUDIT_HOT_DAYS, only reads the partitions it
+overlaps, and retiring a month is a DROP TABLE instead of a DELETE that
+bloats the table and its indexes.
+
+The daily maintenance task keeps partitions created AUDIT_PARTITIONS_AHEAD
+months in advance, and archives every month older than
+AUDIT_RETENTION_MONTHS: its rows are written to
+AUDIT_ARCHIVE_DIR/auditlog_YYYY_MM.ndjson.gz, one JSON object per line,
+and only once that file is complete is the month dropped.
+
+Should the task stop running, rows for months without a partition land
+in the DEFAULT partition (pricingModel_auditlog_default, migration 0009)
+rather than being rejected. The next run creates those months and moves
+their rows over. Rows for a month that was already archived stay in the
+default partition, since archiving them again would overwrite the
+month's file.
+
+Other databases keep a plain table; their old months are archived the
+same way and then deleted.
+"""
+import gzip
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+
+from pricingModel.models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+AUDIT_TABLE = AuditLog._meta.db_table
+
+ARCHIVE_FIELDS = ["id", "user_id", "action", "details", "ip_address", "user_agent", "created_at"]
+
+# Full-text index (migration 0006) and the statistics target for its
+# lexemes. The default keeps too few of them for the planner to tell a
+# rare word from a common one, and it then reads a rare word's matches
+# by walking every row newest first instead of through the index. A new
+# partition's index does not inherit the target, so it is set here.
+AUDIT_SEARCH_INDEX = "auditlog_search_idx"
+AUDIT_SEARCH_STATISTICS = 1000
+
+
+def month_start(moment):
+    """First instant (UTC) of the month moment falls in."""
+    moment = moment.astimezone(dt_timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month):
+    return f"{AUDIT_TABLE}_p{month:%Y_%m}"
+
+
+DEFAULT_PARTITION = f"{AUDIT_TABLE}_default"
+
+
+def is_partitioned():
+    if connection.vendor != "postgresql":
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [connection.ops.quote_name(AUDIT_TABLE)],
+        )
+        return cursor.fetchone() is not None
+
+
+def partition_months():
+    """Start of the month of every existing partition, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(%s)
+            """,
+            [connection.ops.quote_name(AUDIT_TABLE)],
+        )
+        names = [name for name, in cursor.fetchall()]
+
+    prefix = f"{AUDIT_TABLE}_p"
+    return sorted(
+        datetime.strptime(name[len(prefix):], "%Y_%m").replace(tzinfo=dt_timezone.utc)
+        for name in names if name.startswith(prefix)
+    )
+
+
+def default_partition_months(cursor):
+    """Start of every month with rows in the default partition."""
+    cursor.execute(
+        f"SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC') "
+        f"FROM {connection.ops.quote_name(DEFAULT_PARTITION)}"
+    )
+    return [month.replace(tzinfo=dt_timezone.utc) for month, in cursor.fetchall()]
+
+
+def create_partition(cursor, month):
+    """
+    Create the month's partition and move in its rows from the default
+    partition; Postgres will not add a partition while the default still
+    holds rows that belong in it.
+    """
+    quote = connection.ops.quote_name
+    name = quote(partition_name(month))
+    bounds = [month, add_months(month, 1)]
+    columns = ", ".join(quote(field.column) for field in AuditLog._meta.concrete_fields)
+
+    with transaction.atomic():
+        cursor.execute(f"CREATE TABLE {name} (LIKE {quote(AUDIT_TABLE)} INCLUDING DEFAULTS)")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {quote(DEFAULT_PARTITION)} "
+            f"WHERE created_at >= %s AND created_at < %s RETURNING {columns}) "
+            f"INSERT INTO {name} ({columns}) SELECT {columns} FROM moved",
+            bounds,
+        )
+        cursor.execute(
+            f"ALTER TABLE {quote(AUDIT_TABLE)} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)",
+            bounds,
+        )
+
+
+def ensure_audit_partitions(months_ahead=None):
+    """
+    Create the partitions from this month to months_ahead, and for every
+    month still in retention that has rows in the default partition;
+    their names.
+    """
+    if months_ahead is None:
+        months_ahead = settings.AUDIT_PARTITIONS_AHEAD
+
+    quote = connection.ops.quote_name
+    current = month_start(timezone.now())
+    cutoff = add_months(current, -settings.AUDIT_RETENTION_MONTHS)
+    created = []
+
+    with connection.cursor() as cursor:
+        months = {add_months(current, offset) for offset in range(months_ahead + 1)}
+        months.update(month for month in default_partition_months(cursor) if month >= cutoff)
+
+        for month in sorted(months):
+            cursor.execute("SELECT to_regclass(%s)", [quote(partition_name(month))])
+            if cursor.fetchone()[0] is None:
+                create_partition(cursor, month)
+            created.append(partition_name(month))
+
+        cursor.execute(
+            """
+            SELECT child.relid::text
+            FROM (SELECT inhrelid::regclass AS relid FROM pg_inherits
+                  WHERE inhparent = to_regclass(%s)) child
+            JOIN pg_attribute attribute ON attribute.attrelid = child.relid AND attribute.attnum = 1
+            WHERE attribute.attstattarget IS DISTINCT FROM %s
+            """,
+            [quote(AUDIT_SEARCH_INDEX), AUDIT_SEARCH_STATISTICS],
+        )
+        for index, in cursor.fetchall():
+            cursor.execute(f"ALTER INDEX {index} ALTER COLUMN 1 SET STATISTICS {AUDIT_SEARCH_STATISTICS}")
+
+    return created
+
+
+def export_audit_month(month, directory):
+    """
+    Write the month's rows to a gzipped NDJSON file; (path, rows). Empty
+    months write no file and give a path of None.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"auditlog_{month:%Y_%m}.ndjson.gz"
+
+    rows = (
+        AuditLog.objects
+        .filter(created_at__gte=month, created_at__lt=add_months(month, 1))
+        .order_by("created_at", "id")
+        .values(*ARCHIVE_FIELDS)
+    )
+
+    count = 0
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+            for row in rows.iterator(chunk_size=2000):
+                f.write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+                count += 1
+            f.flush()
+            os.fsync(raw.fileno())
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+    if not count:
+        os.unlink(tmp)
+        return None, 0
+
+    os.replace(tmp, path)
+    return path, count
+
+
+def drop_audit_month(month, partitioned):
+    if partitioned:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {connection.ops.quote_name(partition_name(month))}")
+    else:
+        AuditLog.objects.filter(created_at__gte=month, created_at__lt=add_months(month, 1)).delete()
+
+
+def archive_old_audit_logs(retention_months=None, directory=None):
+    """
+    Archive and drop every month before the retention window; a list of
+    (month, path, rows) for the months archived.
+    """
+    if retention_months is None:
+        retention_months = settings.AUDIT_RETENTION_MONTHS
+    if directory is None:
+        directory = settings.AUDIT_ARCHIVE_DIR
+
+    cutoff = add_months(month_start(timezone.now()), -retention_months)
+    partitioned = is_partitioned()
+
+    if partitioned:
+        months = [month for month in partition_months() if month < cutoff]
+    else:
+        months = []
+        oldest = AuditLog.objects.filter(created_at__lt=cutoff).order_by("created_at").first()
+        month = month_start(oldest.created_at) if oldest else cutoff
+        while month < cutoff:
+            months.append(month)
+            month = add_months(month, 1)
+
+    archived = []
+    for month in months:
+        path, count = export_audit_month(month, directory)
+        with transaction.atomic():
+            drop_audit_month(month, partitioned)
+        logger.info("Archived %s audit log rows for %s to %s", count, f"{month:%Y-%m}", path)
+        archived.append((month, path, count))
+
+    return archived
+
+
+def hot_audit_logs():
+    """Audit logs within the last AUDIT_HOT_DAYS, the window admins browse."""
+    since = timezone.now() - timedelta(days=settings.AUDIT_HOT_DAYS)
+    return AuditLog.objects.filter(created_at__gte=since)
@@ -0,0 +1,69 @@
+"""
+Server-side audit log search.
+
+Filters map onto the B-tree indexes on AuditLog, each ending in
+(created_at, id) so that a filtered search is still read newest first
+straight off the index and pages with the keyset paginator:
+
+- action:   (action, created_at, id)
+- user:     (user, created_at, id)
+- ip:       (ip_address, created_at, id)
+- dates:    a created_at range, which on Postgres also limits the search
+            to the monthly partitions it overlaps
+
+Free text (q) is matched on Postgres against a tsvector of details and
+user_agent, with a GIN index on the very same expression (migration
+0006), using websearch syntax: words, "quoted phrases", -exclusions.
+Other databases fall back to a case-insensitive substring match.
+"""
+from datetime import datetime, time, timedelta
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from pricingModel.models import AuditLog
+
+AUDIT_SEARCH_CONFIG = "english"
+
+
+def audit_search_vector():
+    # Must stay identical to the indexed expression for the index to be used
+    return SearchVector("details", "user_agent", config=AUDIT_SEARCH_CONFIG)
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def search_audit_logs(params):
+    """AuditLog queryset for validated AuditLogSearchSerializer data."""
+    logs = AuditLog.objects.select_related("user")
+
+    if "action" in params:
+        logs = logs.filter(action=params["action"])
+    if "user" in params:
+        logs = logs.filter(user_id=params["user"])
+    if "username" in params:
+        logs = logs.filter(user__username=params["username"])
+    if "ip" in params:
+        logs = logs.filter(ip_address=params["ip"])
+
+    # Whole days as plain ranges, so the created_at index can be used
+    if "date_from" in params:
+        logs = logs.filter(created_at__gte=_day_start(params["date_from"]))
+    if "date_to" in params:
+        logs = logs.filter(created_at__lt=_day_start(params["date_to"] + timedelta(days=1)))
+
+    q = params.get("q")
+    if q:
+        if connection.vendor == "postgresql":
+            logs = logs.annotate(search=audit_search_vector()).filter(
+                search=SearchQuery(q, config=AUDIT_SEARCH_CONFIG, search_type="websearch")
+            )
+        else:
+            for term in q.split():
+                logs = logs.filter(Q(details__icontains=term) | Q(user_agent__icontains=term))
+
+    return logs
@@ -0,0 +1,109 @@
+"""
+In-process snapshot of the pricing catalog.
+
+Every quote needs the CPU_GPU_Config row, the licence, storage, processor
+and AI components and their prices. Instead of querying them per request,
+each worker keeps one immutable CatalogSnapshot built from a single query.
+
+Admin writes bump a shared catalog version (see pricingModel/signals.py).
+A worker compares its snapshot version with the shared one and only
+reloads when they differ.
+
+The version lives in the cache when that is shared (Redis). Without
+REDIS_URL the cache is per process, so a bump would only reach the
+worker that made the write; the version is then kept in a database row
+instead (CATALOG_VERSION_STORE = "database").
+"""
+import threading
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from pricingModel.engine import CatalogItem, CatalogSnapshot, build_catalog
+from pricingModel.models import CatalogVersion, Component, Price
+
+CATALOG_VERSION_KEY = "pricing:catalog:version"
+
+
+def _to_item(component: Component) -> CatalogItem:
+    try:
+        costing = component.price.costing
+    except Price.DoesNotExist:
+        costing = None
+
+    return CatalogItem(
+        id=component.id,
+        category=component.category.name,
+        costing=costing,
+        core_hardware=component.core_hardware,
+        CPUcores=component.CPUcores,
+        ram_required=component.ram_required,
+        AI_feature=component.AI_feature,
+        AI_Component=component.AI_Component,
+        VRAM=component.VRAM,
+        storage_per_cam=component.storage_per_cam,
+        storage_perDay=component.storage_perDay,
+        Duration=component.Duration,
+        cores_required1=component.cores_required1,
+        cores_required2=component.cores_required2,
+        ram_required1=component.ram_required1,
+        VRAM_required=component.VRAM_required,
+    )
+
+
+def load_catalog(version: int) -> CatalogSnapshot:
+    """Build a snapshot of every component and its price in one query."""
+    return build_catalog(
+        version,
+        (_to_item(c) for c in Component.objects.select_related("category", "price")),
+    )
+
+
+def _database_version() -> int:
+    # One row, seeded from the clock like the cache key
+    row, _ = CatalogVersion.objects.get_or_create(pk=1, defaults={"version": time.time_ns()})
+    return row.version
+
+
+def get_catalog_version() -> int:
+    if settings.CATALOG_VERSION_STORE == "database":
+        return _database_version()
+
+    # Seeded from the clock so a flushed cache never reuses an old version
+    return cache.get_or_set(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def bump_catalog_version() -> int:
+    if settings.CATALOG_VERSION_STORE == "database":
+        _database_version()
+        CatalogVersion.objects.filter(pk=1).update(version=F("version") + 1)
+        return _database_version()
+
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+        return cache.incr(CATALOG_VERSION_KEY)
+
+
+_snapshot: Optional[CatalogSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_catalog() -> CatalogSnapshot:
+    """Return this worker's snapshot, reloading it if the version moved."""
+    global _snapshot
+
+    version = get_catalog_version()
+
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = load_catalog(version)
+        return _snapshot
@@ -0,0 +1,12 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.views import exception_handler
+
+from pricingModel.engine import PricingError
+
+
+def pricing_exception_handler(exc, context):
+    # Quotes the engine cannot price are answered like serializer errors (400)
+    if isinstance(exc, PricingError):
+        exc = ValidationError(str(exc))
+
+    return exception_handler(exc, context)
@@ -0,0 +1,294 @@
+"""
+Quotation email delivery.
+
+Every requested email is an EmailDelivery row (queued, sending, sent or
+failed). Its idempotency key covers the quotation, the recipient and a
+hash of the rendered content, so a double click or a retried request
+returns the existing delivery instead of sending twice. Requesting it
+again queues it anew only after it failed, or once EMAIL_RESEND_AFTER has
+passed since it was sent.
+
+Queued delivery ids go onto a Redis list and the drain task pops them in
+batches of QUOTATION_EMAIL_BATCH_SIZE. Every batch goes out over one SMTP
+connection that the worker process keeps open between batches, so the
+TCP/TLS handshake and login are paid once per worker rather than once per
+email. When the server has dropped the connection (idle timeout, restart)
+the message is retried once on a fresh one. Other transient failures are
+retried with exponential backoff up to EMAIL_MAX_ATTEMPTS.
+
+Ids are popped before they are claimed, so a worker that dies in between
+leaves a queued row that is on no list, and one that dies mid-send leaves
+it sending. Such a row is stale once EMAIL_STALE_AFTER has passed beyond
+its retry backoff; the periodic reaper puts it back on the queue, and a
+new request for the same email re-queues it right away.
+"""
+import hashlib
+import json
+import logging
+import os
+import smtplib
+import threading
+from datetime import timedelta
+
+from celery.signals import worker_process_shutdown
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from backend.redis_client import get_redis
+from pricingModel.api.pdf_cache import get_pdf, quotation_pdf_data, quotation_pdf_key
+from pricingModel.api.renderers import QuotationHTMLRenderer
+from pricingModel.models import EmailDelivery
+
+logger = logging.getLogger(__name__)
+
+EMAIL_QUEUE_KEY = "pricing:email:queue"
+
+EMAIL_MAX_ATTEMPTS = 5
+EMAIL_RETRY_BASE_DELAY = 30  # seconds, doubled on every attempt
+EMAIL_RETRY_MAX_DELAY = 60 * 60
+EMAIL_RESEND_AFTER = timedelta(minutes=10)
+EMAIL_STALE_AFTER = timedelta(minutes=15)
+
+# Failures a new connection can fix; anything else (refused recipient,
+# bad sender) would fail again
+RECONNECT_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+class PersistentMailConnection:
+    """One mail connection per process, opened on first use and kept open."""
+
+    def __init__(self, **connection_kwargs):
+        self.connection_kwargs = connection_kwargs
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        # A forked worker must not write to its parent's socket
+        if self._connection is None or self._pid != os.getpid():
+            connection = get_connection(fail_silently=False, **self.connection_kwargs)
+            connection.open()
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def _close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+        self._connection = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def send(self, message):
+        with self._lock:
+            try:
+                return self._open().send_messages([message])
+            except RECONNECT_ERRORS:
+                logger.warning("Mail connection lost, reconnecting", exc_info=True)
+                self._close()
+                return self._open().send_messages([message])
+
+    def send_many(self, messages):
+        """Send each message in turn; the error per message, None if sent."""
+        errors = []
+        for message in messages:
+            try:
+                self.send(message)
+            except Exception as e:
+                errors.append(e)
+            else:
+                errors.append(None)
+        return errors
+
+
+mail_connection = PersistentMailConnection()
+
+
+@worker_process_shutdown.connect
+def _close_mail_connection(**kwargs):
+    mail_connection.close()
+
+
+def build_quotation_email(quotation, username, to_email, attach_pdf=True):
+    data = quotation_pdf_data(quotation, username)
+
+    subject = f"Quotation #{quotation.id} - Sentinel Pricing"
+    body = f"""
+Hi {username},
+
+{"Please find attached" if attach_pdf else "Please find below"} enterprise quotation #{quotation.id}.
+
+Total Cost: ₹{quotation.total_costing}
+
+Regards,
+Sentinel Pricing Team
+"""
+
+    email = EmailMultiAlternatives(subject=subject, body=body, to=[to_email])
+    email.attach_alternative(QuotationHTMLRenderer().render(data).decode(), "text/html")
+
+    # The HTML body carries the whole quotation; the PDF is optional
+    if attach_pdf:
+        email.attach(f"quotation_{quotation.id}.pdf", get_pdf(data), "application/pdf")
+
+    return email
+
+
+def build_delivery_email(delivery):
+    return build_quotation_email(
+        delivery.quotation, delivery.username, delivery.recipient, delivery.attach_pdf
+    )
+
+
+def email_content_hash(data, attach_pdf):
+    raw = json.dumps([quotation_pdf_key(data), attach_pdf])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def email_idempotency_key(quotation_id, recipient, content_hash):
+    raw = json.dumps([quotation_id, recipient.strip().lower(), content_hash])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def queue_email_delivery(delivery_id):
+    get_redis().rpush(EMAIL_QUEUE_KEY, delivery_id)
+
+
+def pop_email_deliveries(count):
+    return [int(delivery_id) for delivery_id in get_redis().lpop(EMAIL_QUEUE_KEY, count) or []]
+
+
+def stale_deliveries(now=None):
+    """
+    Q for deliveries a crashed worker left behind: sending for longer than
+    EMAIL_STALE_AFTER, or queued that long past their retry backoff.
+    """
+    now = now or timezone.now()
+
+    # A retry is due retry_delay(attempts) after the failed attempt
+    queued = Q(updated_at__lt=now - timedelta(seconds=EMAIL_RETRY_MAX_DELAY) - EMAIL_STALE_AFTER)
+    for attempts in range(EMAIL_MAX_ATTEMPTS):
+        backoff = timedelta(seconds=retry_delay(attempts) if attempts else 0)
+        queued |= Q(attempts=attempts, updated_at__lt=now - backoff - EMAIL_STALE_AFTER)
+
+    return Q(status="sending", updated_at__lt=now - EMAIL_STALE_AFTER) | Q(status="queued") & queued
+
+
+def requeue_stale_deliveries():
+    """Put stale deliveries back on the queue; their ids."""
+    now = timezone.now()
+    requeued = []
+
+    for delivery_id in EmailDelivery.objects.filter(stale_deliveries(now)).values_list("id", flat=True):
+        # Only if nobody picked it up since the query
+        if EmailDelivery.objects.filter(stale_deliveries(now), pk=delivery_id).update(status="queued", updated_at=now):
+            requeued.append(delivery_id)
+
+    for delivery_id in requeued:
+        queue_email_delivery(delivery_id)
+
+    return requeued
+
+
+def request_quotation_email(quotation, user, to_email, attach_pdf=True, on_queued=None):
+    """
+    The EmailDelivery for sending the quotation to to_email as it renders
+    now, and whether it was (re)queued. on_queued runs after commit when
+    it was.
+    """
+    data = quotation_pdf_data(quotation, user.username)
+    content_hash = email_content_hash(data, attach_pdf)
+
+    delivery, created = EmailDelivery.objects.get_or_create(
+        idempotency_key=email_idempotency_key(quotation.id, to_email, content_hash),
+        defaults={
+            "quotation": quotation,
+            "requested_by": user,
+            "recipient": to_email,
+            "username": user.username,
+            "attach_pdf": attach_pdf,
+            "content_hash": content_hash,
+        },
+    )
+
+    if not created:
+        requeued = (
+            EmailDelivery.objects
+            .filter(pk=delivery.pk)
+            .filter(
+                Q(status="failed")
+                | Q(status="sent", sent_at__lt=timezone.now() - EMAIL_RESEND_AFTER)
+                | stale_deliveries()
+            )
+            .update(status="queued", attempts=0, last_error="", sent_at=None, updated_at=timezone.now())
+        )
+        delivery.refresh_from_db()
+        if not requeued:
+            return delivery, False
+
+    def queue():
+        queue_email_delivery(delivery.id)
+        if on_queued:
+            on_queued()
+
+    transaction.on_commit(queue)
+    return delivery, True
+
+
+def claim_delivery(delivery_id):
+    """Move a queued delivery to sending; False if someone else has it."""
+    return bool(
+        EmailDelivery.objects
+        .filter(pk=delivery_id, status="queued")
+        .update(status="sending", attempts=F("attempts") + 1, updated_at=timezone.now())
+    )
+
+
+def is_permanent_failure(error):
+    """5xx replies will not change on retry; everything else might."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+def retry_delay(attempts):
+    return min(EMAIL_RETRY_BASE_DELAY * 2 ** (attempts - 1), EMAIL_RETRY_MAX_DELAY)
+
+
+def record_delivery_result(delivery, error):
+    """
+    Store the outcome of an attempt. Returns the backoff in seconds when
+    the delivery should be retried, else None.
+    """
+    now = timezone.now()
+
+    if error is None:
+        EmailDelivery.objects.filter(pk=delivery.pk).update(
+            status="sent", sent_at=now, last_error="", updated_at=now
+        )
+        return None
+
+    if is_permanent_failure(error) or delivery.attempts >= EMAIL_MAX_ATTEMPTS:
+        EmailDelivery.objects.filter(pk=delivery.pk).update(
+            status="failed", last_error=str(error), updated_at=now
+        )
+        return None
+
+    EmailDelivery.objects.filter(pk=delivery.pk).update(
+        status="queued", last_error=str(error), updated_at=now
+    )
+    return retry_delay(delivery.attempts)
@@ -0,0 +1,221 @@
+"""
+Content-addressed cache of rendered quotation PDFs.
+
+A PDF is keyed by a hash of everything printed on it: the quotation's
+priced fields, its CPU/GPU, AI features and licence as currently priced in
+the catalog, and the username in the header. Serving a cached PDF is only
+possible while every one of those inputs is unchanged; any change gives a
+new key and a fresh render.
+
+The store is shared by the web tier and the Celery workers, so a PDF
+rendered for a preview is attached as is when the quotation is then
+emailed. QUOTATION_PDF_STORE picks where it lives:
+
+- "filesystem": files in QUOTATION_PDF_CACHE_DIR, which every web and
+  worker container must mount, evicted least-recently-used once the
+  directory grows past QUOTATION_PDF_CACHE_MAX_BYTES. Each process keeps
+  a running total of the directory size and only scans it when that
+  total passes the budget, or every few minutes to catch up with what
+  other processes wrote.
+- "cache": the Django cache (Redis in production) with a TTL of
+  QUOTATION_PDF_CACHE_TIMEOUT, for hosts that share no disk; Redis evicts
+  under memory pressure.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+from pricingModel.api.catalog import get_catalog
+from pricingModel.api.pdf_renderer import pdf_renderer
+
+# Bump when the PDF layout changes so old renders are not served
+PDF_TEMPLATE_VERSION = 1
+
+
+def quotation_pdf_data(quotation, username):
+    """
+    Everything a quotation rendition prints, as plain data. Shared by the
+    PDF renderer and the JSON/CSV/HTML renderers in renderers.py.
+    """
+    catalog = get_catalog()
+
+    cpu = catalog.components.get(quotation.cpu_id)
+    gpu = catalog.components.get(quotation.gpu_id)
+    licence = catalog.components.get(quotation.DurationU) if quotation.DurationU else None
+    ai_features = [
+        catalog.components.get(ai_id)
+        for ai_id in sorted(quotation.ai_features.values_list("id", flat=True))
+    ]
+
+    return {
+        "id": quotation.id,
+        "date": quotation.created_at.strftime("%d-%m-%Y"),
+        "username": username,
+
+        "storage_days": quotation.storage_days,
+        "storage_cost": quotation.storage_cost,
+        "ram_required": quotation.ram_required,
+        "cpu_cost": quotation.cpu_cost,
+        "gpu_cost": quotation.gpu_cost,
+        "ai_cost": quotation.ai_cost,
+        "total_costing": quotation.total_costing,
+        "licenceCostU": quotation.licenceCostU,
+
+        "cpu": {"name": cpu.core_hardware, "cores": cpu.CPUcores} if cpu else None,
+        "gpu": {"name": gpu.AI_Component, "vram": gpu.VRAM} if gpu else None,
+        "licence": {"duration": licence.Duration, "costing": licence.costing} if licence else None,
+        "ai_features": [
+            {"name": ai.AI_feature, "costing": ai.costing}
+            for ai in ai_features if ai
+        ],
+    }
+
+
+def quotation_pdf_key(data):
+    raw = json.dumps([PDF_TEMPLATE_VERSION, data], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class FileSystemPDFStore:
+
+    # Seconds before set() scans again while under budget; only this
+    # process's own writes are in the running total
+    rescan_interval = 300
+
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._evict_lock = threading.Lock()
+        self._size = None
+        self._scanned_at = 0.0
+
+    def _path(self, key):
+        return self.directory / f"{key}.pdf"
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        # Reads refresh the mtime that LRU eviction sorts on
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return data
+
+    def set(self, key, data):
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        path = self._path(key)
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        with self._evict_lock:
+            if self._size is not None:
+                self._size += len(data) - replaced
+            due = (
+                self._size is None
+                or self._size > self.max_bytes
+                or time.monotonic() - self._scanned_at > self.rescan_interval
+            )
+
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Scan the directory and drop renders until it is under budget."""
+        with self._evict_lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(".pdf"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+            self._scanned_at = time.monotonic()
+            self._size = total
+            if total <= self.max_bytes:
+                return
+
+            # Drop least recently used renders down to 90% of the budget
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes * 0.9:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+            self._size = total
+
+
+class CachePDFStore:
+
+    prefix = "pricing:pdf:"
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+
+    def get(self, key):
+        return cache.get(self.prefix + key)
+
+    def set(self, key, data):
+        cache.set(self.prefix + key, data, timeout=self.timeout)
+
+
+def build_pdf_store():
+    backend = settings.QUOTATION_PDF_STORE
+
+    if backend == "filesystem":
+        return FileSystemPDFStore(
+            settings.QUOTATION_PDF_CACHE_DIR,
+            settings.QUOTATION_PDF_CACHE_MAX_BYTES,
+        )
+    if backend == "cache":
+        return CachePDFStore(settings.QUOTATION_PDF_CACHE_TIMEOUT)
+
+    raise ImproperlyConfigured(f"Unknown QUOTATION_PDF_STORE {backend!r}")
+
+
+pdf_store = build_pdf_store()
+
+
+def get_quotation_pdf(quotation, username) -> bytes:
+    """Cached PDF for the quotation as it stands now, rendering on a miss."""
+    return get_pdf(quotation_pdf_data(quotation, username))
+
+
+def get_pdf(data) -> bytes:
+    """Cached PDF for a quotation_pdf_data payload, rendering on a miss."""
+    key = quotation_pdf_key(data)
+
+    pdf = pdf_store.get(key)
+    if pdf is None:
+        pdf = pdf_renderer.render(data)
+        pdf_store.set(key, pdf)
+
+    return pdf
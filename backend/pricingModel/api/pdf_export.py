@@ -0,0 +1,60 @@
+"""
+Streaming ZIP export of quotation PDFs.
+
+The archive is written straight into the response: each PDF is fetched
+from the PDF cache (or rendered on a miss) only when the archive reaches
+it, and the bytes are yielded as soon as its entry is complete. The ZIP is
+written without seeking (sizes go in data descriptors), so nothing but the
+current PDF and the central directory entries is held in memory.
+"""
+import zipfile
+
+from pricingModel.api.pdf_cache import get_quotation_pdf
+
+EXPORT_CHUNK_SIZE = 100
+
+
+class _StreamBuffer:
+    """Write-only file object whose contents are drained after each entry."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_quotation_zip(quotations, username):
+    """Yield a ZIP archive of the quotations' PDFs, one entry at a time."""
+    buffer = _StreamBuffer()
+
+    # PDF page streams are already compressed
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        for quotation in quotations.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            pdf = get_quotation_pdf(quotation, username)
+
+            info = zipfile.ZipInfo(
+                f"quotation_{quotation.id}.pdf",
+                date_time=quotation.created_at.timetuple()[:6],
+            )
+            with archive.open(info, "w") as entry:
+                entry.write(pdf)
+
+            yield buffer.drain()
+
+    # Central directory
+    yield buffer.drain()
@@ -0,0 +1,85 @@
+"""
+Background quotation PDF renders.
+
+Enqueueing a render returns a job id straight away; the Celery worker
+renders into the PDF cache (see pdf_cache.py) and the web tier only ever
+serves finished files from it.
+
+Each job keeps a small record in the Django cache with its owner and
+quotation, so status and download can be checked against the requesting
+user. A job whose PDF was already cached when it was requested is
+recorded as done with the content key and never reaches Celery.
+"""
+import uuid
+
+from celery.result import AsyncResult
+from django.core.cache import cache
+
+from pricingModel.api.pdf_cache import pdf_store, quotation_pdf_data, quotation_pdf_key
+from pricingModel.api.tasks import render_quotation_pdf_task
+
+PDF_JOB_PREFIX = "pricing:pdf_job:"
+PDF_JOB_TIMEOUT = 60 * 60
+
+QUEUED = "queued"
+RENDERING = "rendering"
+DONE = "done"
+FAILED = "failed"
+
+
+def _job_cache_key(job_id):
+    return PDF_JOB_PREFIX + job_id
+
+
+def enqueue_pdf_job(quotation, user):
+    """Start a render of the quotation for user, returning the job record."""
+    key = quotation_pdf_key(quotation_pdf_data(quotation, user.username))
+
+    job = {
+        "user_id": user.id,
+        "quotation_id": quotation.id,
+        "key": None,
+    }
+
+    if pdf_store.get(key) is not None:
+        job_id = uuid.uuid4().hex
+        job["key"] = key
+    else:
+        job_id = render_quotation_pdf_task.delay(quotation.id, user.username).id
+
+    cache.set(_job_cache_key(job_id), job, timeout=PDF_JOB_TIMEOUT)
+    return job_id, job
+
+
+def get_pdf_job(job_id, user):
+    """The job record, or None if it is unknown, expired or not user's."""
+    job = cache.get(_job_cache_key(job_id))
+    if job is None:
+        return None
+
+    if job["user_id"] != user.id and not user.is_staff:
+        return None
+
+    return job
+
+
+def pdf_job_status(job_id, job):
+    """Current status of the job and, once done, the content key."""
+    if job["key"]:
+        return DONE, job["key"], None
+
+    result = AsyncResult(job_id)
+
+    if result.state == "SUCCESS":
+        outcome = result.result or {}
+        if outcome.get("status") == DONE:
+            return DONE, outcome["key"], None
+        return FAILED, None, outcome.get("error")
+
+    if result.state == "FAILURE":
+        return FAILED, None, "Render failed"
+
+    if result.state in ("STARTED", "RENDERING", "RETRY"):
+        return RENDERING, None, None
+
+    return QUEUED, None, None
@@ -0,0 +1,76 @@
+"""
+Quotation PDF rendering in a pool of worker processes.
+
+ReportLab layout is pure Python, so renders running on threads of one
+worker serialize on the GIL. PDFRenderer hands the plain-data payload from
+pdf_cache.quotation_pdf_data to a ProcessPoolExecutor instead; renderer
+processes only import ReportLab and pricingModel.api.utils, never Django
+or the ORM, and each keeps its own QuotationTemplate.
+
+PDF_RENDER_PROCESSES sets the pool size. With 0, or inside a daemonic
+process such as a Celery prefork child (which may not start children of
+its own), renders run inline.
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from pricingModel.api.utils import generate_enterprise_quotation_pdf
+
+logger = logging.getLogger(__name__)
+
+
+class PDFRenderer:
+
+    def __init__(self, processes):
+        self.processes = processes
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def inline(self):
+        return self.processes <= 0 or multiprocessing.current_process().daemon
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # Spawned, not forked: the parent may be a threaded web
+                # worker holding locks and database connections
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _discard_pool(self, pool):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False)
+
+    def render(self, data: dict) -> bytes:
+        if self.inline:
+            return generate_enterprise_quotation_pdf(data)
+
+        pool = self._get_pool()
+        try:
+            return pool.submit(generate_enterprise_quotation_pdf, data).result()
+        except BrokenProcessPool:
+            # A renderer process died; start a fresh pool for the next
+            # render and do this one here
+            logger.exception("PDF renderer pool broke, rendering inline")
+            self._discard_pool(pool)
+            return generate_enterprise_quotation_pdf(data)
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+
+pdf_renderer = PDFRenderer(settings.PDF_RENDER_PROCESSES)
@@ -0,0 +1,81 @@
+"""
+Persistence helpers for quotes priced by pricingModel.engine.
+"""
+from django.db.models import Prefetch
+
+from pricingModel.models import Component, UserPricing
+
+
+def quotations_with_details():
+    """
+    UserPricing queryset with everything the quotation serializers read
+    loaded up front: the user, the CPU and GPU with their prices (joined)
+    and the AI features with their prices (one prefetch query). A list
+    then costs the same number of queries whatever its length.
+    """
+    return UserPricing.objects.select_related(
+        "user_name", "cpu__price", "gpu__price",
+    ).prefetch_related(
+        Prefetch("ai_features", queryset=Component.objects.select_related("price")),
+    )
+
+
+# What POST Pricingcalculation/ stores; hardware and costs follow on PUT
+REQUIREMENT_FIELDS = (
+    "aiEnabledCam",
+    "storage_days",
+    "storage_used_user",
+    "vram_required",
+    "cpuCores_required",
+    "ram_required",
+    "DurationU",
+    "licenceCostU",
+)
+
+
+def user_pricing_fields(quote):
+    """
+    UserPricing field values for a breakdown from quote_to_representation()
+    (everything but the user, cammera and ai_features).
+    """
+    cpu = quote["cpu"]
+    gpu = quote["gpu"]
+
+    return dict(
+        aiEnabledCam=quote["aiEnabledCam"],
+        storage_days=quote["storage_days"],
+        storage_used_user=quote["storage_used_user"],
+
+        vram_required=quote["vram_required"],
+        cpuCores_required=quote["cpuCores_required"],
+        ram_required=quote["ram_required"],
+
+        cpu_id=cpu["id"] if cpu else None,
+        gpu_id=gpu["id"] if gpu else None,
+
+        cpu_cost=quote["cpu_cost"],
+        gpu_cost=quote["gpu_cost"],
+        ai_cost=quote["ai_cost"],
+        storage_cost=quote["storage_cost"],
+
+        DurationU=quote["DurationU"],
+        licenceCostU=quote["licenceCostU"],
+
+        include_cpu=quote["include_cpu"],
+        include_gpu=quote["include_gpu"],
+        include_storage=quote["include_storage"],
+
+        total_costing=quote["total_costing"],
+    )
+
+
+def build_user_pricing(user, quote):
+    """
+    Unsaved UserPricing row for a breakdown from quote_to_representation()
+    (ai_features are not set).
+    """
+    return UserPricing(
+        user_name=user,
+        cammera=quote["cammera"],
+        **user_pricing_fields(quote),
+    )
@@ -0,0 +1,158 @@
+"""
+Memoised quote breakdowns.
+
+A breakdown only depends on the normalised scenario and the catalog it was
+priced against, so it is cached under both:
+
+    (cammera, aiEnabledCam, sorted AI feature ids, storage_days, DurationU,
+     include_cpu, include_gpu, include_storage) + catalog version
+
+Entries live in the Django cache (Redis in production, shared by every
+gunicorn worker) with a TTL, fronted by a small per-process LRU. Bumping
+the catalog version changes every key, so old entries simply age out.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from pricingModel.engine import PricingError, price_scenario, quote_to_representation
+
+QUOTE_CACHE_PREFIX = "pricing:quote:"
+QUOTE_CACHE_TIMEOUT = getattr(settings, "QUOTE_CACHE_TIMEOUT", 60 * 60)
+QUOTE_CACHE_LOCAL_SIZE = getattr(settings, "QUOTE_CACHE_LOCAL_SIZE", 1024)
+
+HITS_KEY = "pricing:quote_cache:hits"
+MISSES_KEY = "pricing:quote_cache:misses"
+
+
+class _LRU:
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+_local = _LRU(QUOTE_CACHE_LOCAL_SIZE)
+
+
+def normalize_scenario(scenario):
+    ai_features = tuple(sorted(set(scenario.get("ai_features", []))))
+
+    return (
+        scenario.get("cammera"),
+        # aiEnabledCam only matters when AI features are selected
+        (scenario.get("aiEnabledCam") or 0) if ai_features else 0,
+        ai_features,
+        scenario.get("storage_days", 1),
+        scenario.get("DurationU"),
+        bool(scenario.get("include_cpu", True)),
+        bool(scenario.get("include_gpu", True)),
+        bool(scenario.get("include_storage", True)),
+    )
+
+
+def quote_cache_key(catalog_version, scenario):
+    raw = json.dumps([catalog_version, normalize_scenario(scenario)])
+    return QUOTE_CACHE_PREFIX + hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _count(key, delta):
+    if not delta:
+        return
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key, delta)
+
+
+def get_cached_quotes(catalog, scenarios):
+    """
+    Breakdowns for many scenarios, in order. Shared-cache lookups and
+    stores are batched into one round trip each. Scenarios that fail
+    pricing come back as the PricingError instead of a breakdown.
+    """
+    keys = [quote_cache_key(catalog.version, s) for s in scenarios]
+    results = [_local.get(key) for key in keys]
+
+    remote_keys = {key for key, result in zip(keys, results) if result is None}
+    remote = cache.get_many(list(remote_keys)) if remote_keys else {}
+
+    hits = 0
+    fresh = {}
+    for i, (key, scenario) in enumerate(zip(keys, scenarios)):
+        if results[i] is not None:
+            hits += 1
+            continue
+
+        if key in remote:
+            results[i] = remote[key]
+            _local.set(key, results[i])
+            hits += 1
+            continue
+
+        if key in fresh:
+            results[i] = fresh[key]
+            continue
+
+        try:
+            results[i] = quote_to_representation(price_scenario(catalog, scenario))
+        except PricingError as e:
+            results[i] = e
+            continue
+
+        fresh[key] = results[i]
+        _local.set(key, results[i])
+
+    if fresh:
+        cache.set_many(fresh, timeout=QUOTE_CACHE_TIMEOUT)
+
+    _count(HITS_KEY, hits)
+    _count(MISSES_KEY, len(scenarios) - hits)
+
+    return results
+
+
+def get_cached_quote(catalog, scenario):
+    result = get_cached_quotes(catalog, [scenario])[0]
+    if isinstance(result, PricingError):
+        raise result
+    return result
+
+
+def quote_cache_stats():
+    counters = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = counters.get(HITS_KEY, 0)
+    misses = counters.get(MISSES_KEY, 0)
+    lookups = hits + misses
+
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / lookups, 4) if lookups else None,
+        "local_entries": len(_local),
+        "local_size": _local.maxsize,
+        "timeout": QUOTE_CACHE_TIMEOUT,
+    }
@@ -0,0 +1,101 @@
+"""
+Quotation renditions.
+
+Every format renders the same plain-data payload from
+pdf_cache.quotation_pdf_data, so gathering the data is shared and only the
+last step differs. JSON, CSV and HTML are cheap; the PDF goes through the
+PDF cache and renderer pool and is only produced when asked for.
+
+Views pick one through DRF content negotiation: the Accept header, or
+?format=json|csv|html|pdf.
+"""
+import csv
+import io
+
+from django.template.loader import render_to_string
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+from pricingModel.api.pdf_cache import get_pdf
+from pricingModel.api.utils import format_licence_duration
+
+
+def quotation_line_items(data):
+    """(section, item, detail, cost) rows of a quotation payload."""
+    cpu, gpu, licence = data["cpu"], data["gpu"], data["licence"]
+
+    rows = [
+        ("Storage", f"{data['storage_days']} Days", "", data["storage_cost"]),
+        (
+            "CPU",
+            cpu["name"] if cpu else "—",
+            f"{cpu['cores']} cores, {data['ram_required']} GB RAM" if cpu else "",
+            data["cpu_cost"],
+        ),
+        (
+            "GPU",
+            gpu["name"] if gpu else "—",
+            f"{gpu['vram']} GB VRAM" if gpu else "",
+            data["gpu_cost"],
+        ),
+        (
+            "Licence",
+            format_licence_duration(licence["duration"]) if licence else "-",
+            "",
+            data["licenceCostU"],
+        ),
+        ("AI Services", "", "", data["ai_cost"]),
+    ]
+
+    rows.extend(
+        ("AI Feature", ai["name"], "", ai["costing"] or 0)
+        for ai in data["ai_features"]
+    )
+
+    return rows
+
+
+class QuotationCSVRenderer(BaseRenderer):
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        out = io.StringIO()
+        writer = csv.writer(out)
+
+        writer.writerow(["section", "item", "detail", "cost"])
+        writer.writerow(["Quotation", data["id"], data["date"], ""])
+        writer.writerows(quotation_line_items(data))
+        writer.writerow(["Total", "", "", data["total_costing"]])
+
+        return out.getvalue().encode(self.charset)
+
+
+class QuotationHTMLRenderer(BaseRenderer):
+    media_type = "text/html"
+    format = "html"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return render_to_string(
+            "pricingModel/quotation.html",
+            {"quotation": data, "line_items": quotation_line_items(data)},
+        ).encode(self.charset)
+
+
+class QuotationPDFRenderer(BaseRenderer):
+    media_type = "application/pdf"
+    format = "pdf"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return get_pdf(data)
+
+
+QUOTATION_RENDERERS = [
+    JSONRenderer,
+    QuotationCSVRenderer,
+    QuotationHTMLRenderer,
+    QuotationPDFRenderer,
+]
@@ -1,5 +1,5 @@
 # from pricingModel.models import Cammera_Pricing, UserPricing, AI_ENABLED, 
-from pricingModel.models import Category, Component, Price,UserPricing, AuditLog
+from pricingModel.models import Category, Component, Price,UserPricing, AuditLog, EmailDelivery
 from rest_framework import serializers
 from django.db.models import Q
 from django.contrib.auth.models import User
@@ -7,6 +7,7 @@ from pricingModel.models import  UserPricing, AuditLog
 from rest_framework import serializers
 from django.db.models import Q
 from django.contrib.auth.models import User
+from pricingModel.api.catalog import get_catalog
 
 class AdminUserSerializer(serializers.ModelSerializer):
     role = serializers.SerializerMethodField()
@@ -43,7 +44,16 @@ class AdminQuotationSerializer(serializers.ModelSerializer):
         return obj.user_name.username if obj.user_name else None
 
     def get_ai_features(self, obj):
-        return list(obj.ai_features.values("AI_feature", "price"))
+        # Read from the prefetched features (with their price) instead of
+        # a .values() query per row; "price" stays the Price id
+        features = []
+        for feature in obj.ai_features.all():
+            price = getattr(feature, "price", None)
+            features.append({
+                "AI_feature": feature.AI_feature,
+                "price": price.pk if price else None,
+            })
+        return features
 
                         
 class userRequirementSerializer(serializers.ModelSerializer):
@@ -79,6 +89,70 @@ class userRequirementSerializer(serializers.ModelSerializer):
             'created_at',
         ]
 
+class QuoteScenarioSerializer(serializers.Serializer):
+    cammera = serializers.IntegerField(min_value=1)
+    aiEnabledCam = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+    ai_features = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        default=list
+    )
+    storage_days = serializers.IntegerField(min_value=1, default=1)
+    DurationU = serializers.IntegerField()
+
+    include_cpu = serializers.BooleanField(default=True)
+    include_gpu = serializers.BooleanField(default=True)
+    include_storage = serializers.BooleanField(default=True)
+
+
+class PriceCurveSerializer(QuoteScenarioSerializer):
+    cammera = None
+
+    camera_from = serializers.IntegerField(min_value=1)
+    camera_to = serializers.IntegerField(min_value=1)
+    camera_step = serializers.IntegerField(min_value=1, default=1)
+
+    def validate(self, attrs):
+        if attrs["camera_to"] < attrs["camera_from"]:
+            raise serializers.ValidationError("camera_to must not be lower than camera_from")
+
+        points = (attrs["camera_to"] - attrs["camera_from"]) // attrs["camera_step"] + 1
+        if points > 10000:
+            raise serializers.ValidationError("Price curve is limited to 10000 points")
+
+        return attrs
+
+
+class QuotationBatchSerializer(serializers.Serializer):
+    scenarios = QuoteScenarioSerializer(many=True, allow_empty=False, max_length=1000)
+    persist = serializers.BooleanField(default=False)
+
+
+class QuotationExportSerializer(serializers.Serializer):
+    user = serializers.IntegerField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, data):
+        if "date_from" in data and "date_to" in data and data["date_from"] > data["date_to"]:
+            raise serializers.ValidationError("date_from must not be after date_to")
+        return data
+
+class AuditLogSearchSerializer(serializers.Serializer):
+    # Not limited to ACTION_CHOICES; the log also records other actions
+    action = serializers.CharField(required=False, max_length=50)
+    user = serializers.IntegerField(required=False)
+    username = serializers.CharField(required=False)
+    ip = serializers.IPAddressField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    q = serializers.CharField(required=False, max_length=200)
+
+    def validate(self, data):
+        if "date_from" in data and "date_to" in data and data["date_from"] > data["date_to"]:
+            raise serializers.ValidationError("date_from must not be after date_to")
+        return data
+
 class AI_ENABLEDserializer(serializers.ModelSerializer):
         costing = serializers.IntegerField(source='price.costing')
         class Meta:
@@ -128,6 +202,7 @@ class UserFinalQuotationSerializer(serializers.ModelSerializer):
         fields = [
             "id",
             "cammera",
+            "aiEnabledCam",
             "cpuCores_required",
             "ram_required",
             "vram_required",
@@ -159,10 +234,17 @@ class UserFinalQuotationSerializer(serializers.ModelSerializer):
         if not obj.DurationU:
             return None
 
-        licence_obj = Component.objects.filter(id=obj.DurationU).first()
+        # From the catalog snapshot rather than a Component query per row;
+        # list views resolve it once and pass it in the context
+        catalog = self.context.get("catalog") or get_catalog()
+        licence = catalog.components.get(obj.DurationU)
 
-        if licence_obj:
-            return licensePricingSerializer(licence_obj).data
+        if licence:
+            return {
+                "id": licence.id,
+                "Duration": licence.Duration,
+                "costing": licence.costing,
+            }
 
         return None
 
@@ -232,6 +314,23 @@ class processorSerializer(serializers.ModelSerializer):
         ]
 
 
+class EmailDeliverySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EmailDelivery
+        fields = [
+            "id",
+            "quotation",
+            "recipient",
+            "attach_pdf",
+            "status",
+            "attempts",
+            "last_error",
+            "created_at",
+            "updated_at",
+            "sent_at",
+        ]
+
+
 class AuditLogSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source="user.username", read_only=True)
 
@@ -1,31 +1,139 @@
+import logging
+
 from celery import shared_task
-from django.core.mail import EmailMessage
-from pricingModel.models import UserPricing
-from pricingModel.api.utils import generate_enterprise_quotation_pdf  # reuse your pdf function
+from django.conf import settings
+from pricingModel.models import EmailDelivery, UserPricing
+from pricingModel.api.audit_archive import archive_old_audit_logs, ensure_audit_partitions, is_partitioned
+from pricingModel.api.mail import (
+    build_delivery_email,
+    claim_delivery,
+    mail_connection,
+    pop_email_deliveries,
+    record_delivery_result,
+    requeue_stale_deliveries,
+)
+from pricingModel.api.pdf_cache import (
+    pdf_store,
+    quotation_pdf_data,
+    quotation_pdf_key,
+)
+from pricingModel.api.pdf_renderer import pdf_renderer
+
+logger = logging.getLogger(__name__)
+
+
+def _finish_delivery(delivery, error):
+    """Record an attempt; the retry backoff in seconds, or None if final."""
+    delay = record_delivery_result(delivery, error)
+
+    if error is not None:
+        logger.error(
+            "Email delivery %s to %s failed (attempt %s, %s): %s",
+            delivery.id, delivery.recipient, delivery.attempts,
+            "final" if delay is None else f"retry in {delay}s", error,
+        )
+
+    return delay
+
+
+@shared_task(bind=True, max_retries=None)
+def send_email_delivery_task(self, delivery_id):
+    """Send one EmailDelivery, retrying transient failures with backoff."""
+    if not claim_delivery(delivery_id):
+        return {"status": "skipped", "delivery_id": delivery_id}
+
+    delivery = EmailDelivery.objects.select_related("quotation").get(pk=delivery_id)
+
+    try:
+        mail_connection.send(build_delivery_email(delivery))
+    except Exception as e:
+        error = e
+    else:
+        error = None
+
+    delay = _finish_delivery(delivery, error)
+    if delay is not None:
+        raise self.retry(countdown=delay)
+
+    return {"status": "failed" if error else "sent", "delivery_id": delivery_id}
+
+
+@shared_task
+def drain_quotation_emails_task():
+    """Send queued email deliveries in batches until the queue is empty."""
+    sent = failed = retrying = 0
+
+    while True:
+        delivery_ids = pop_email_deliveries(settings.QUOTATION_EMAIL_BATCH_SIZE)
+        if not delivery_ids:
+            break
+
+        # Deliveries already picked up elsewhere are skipped
+        claimed = [delivery_id for delivery_id in delivery_ids if claim_delivery(delivery_id)]
+
+        results = []
+        batch = []
+        for delivery in EmailDelivery.objects.select_related("quotation").filter(pk__in=claimed):
+            try:
+                batch.append((delivery, build_delivery_email(delivery)))
+            except Exception as e:
+                results.append((delivery, e))
+
+        errors = mail_connection.send_many([message for _, message in batch])
+        results.extend((delivery, error) for (delivery, _), error in zip(batch, errors))
+
+        for delivery, error in results:
+            delay = _finish_delivery(delivery, error)
+            if error is None:
+                sent += 1
+            elif delay is None:
+                failed += 1
+            else:
+                retrying += 1
+                send_email_delivery_task.apply_async((delivery.id,), countdown=delay)
+
+    return {"sent": sent, "failed": failed, "retrying": retrying}
+
+
+@shared_task
+def requeue_stale_email_deliveries_task():
+    """Periodic: re-queue deliveries a crashed worker left queued or sending."""
+    requeued = requeue_stale_deliveries()
+
+    if requeued:
+        logger.warning("Re-queued %s stale email deliveries: %s", len(requeued), requeued)
+        drain_quotation_emails_task.delay()
+
+    return {"requeued": requeued}
+
 
 @shared_task(bind=True)
-def send_quotation_email_task(self, quotation_id, username, to_email):
+def render_quotation_pdf_task(self, quotation_id, username):
     quotation = UserPricing.objects.filter(id=quotation_id).first()
     if not quotation:
         return {"status": "failed", "error": "Quotation not found"}
 
-    pdf = generate_enterprise_quotation_pdf(quotation, username)
-
-    subject = f"Quotation #{quotation.id} - Sentinel Pricing"
-    body = f"""
-Hi {username},
+    self.update_state(state="RENDERING", meta={"quotation_id": quotation_id})
 
-Please find attached enterprise quotation #{quotation.id}.
+    data = quotation_pdf_data(quotation, username)
+    key = quotation_pdf_key(data)
+    if pdf_store.get(key) is None:
+        pdf_store.set(key, pdf_renderer.render(data))
 
-Total Cost: ₹{quotation.total_costing}
+    return {"status": "done", "quotation_id": quotation_id, "key": key}
 
-Regards,
-Sentinel Pricing Team
-"""
 
-    email = EmailMessage(subject=subject, body=body, to=[to_email])
-    email.attach(f"quotation_{quotation.id}.pdf", pdf, "application/pdf")
+@shared_task
+def maintain_audit_log_task():
+    """Daily: create upcoming audit partitions and archive expired months."""
+    if is_partitioned():
+        ensure_audit_partitions()
 
-    email.send()
+    archived = archive_old_audit_logs()
 
-    return {"status": "success", "quotation_id": quotation.id, "sent_to": to_email}
+    return {
+        "archived": [
+            {"month": f"{month:%Y-%m}", "file": path and str(path), "rows": count}
+            for month, path, count in archived
+        ]
+    }
@@ -16,6 +16,7 @@ from pricingModel.api.views import (
     AdminUsersListView,
     AdminAllQuotationsView,
     AdminAuditLogsView,
+    AdminAuditLogSearchView,
     aiFeaturesCLDetails,
     storageCostingDetails,
     creatingCategoryRUD,
@@ -26,7 +27,18 @@ from pricingModel.api.views import (
     toggle_user_role,
     toggle_user_status,
     setConfig,
-    setConfigRUD
+    setConfigRUD,
+    QuotationBatchView,
+    QuotationPreviewView,
+    PriceCurveView,
+    quote_cache_statistics,
+    QuotationCreateView,
+    enqueue_quotation_pdf,
+    quotation_pdf_job_status,
+    download_quotation_pdf_job,
+    export_quotation_pdfs,
+    QuotationExportView,
+    EmailDeliveryDetail,
 )
 
 urlpatterns = [
@@ -59,6 +71,26 @@ urlpatterns = [
         pricingCalculate.as_view(),
         name='cal'
     ),
+    path(
+        'Pricingcalculation/preview/',
+        QuotationPreviewView.as_view(),
+        name='calPreview'
+    ),
+    path(
+        'Pricingcalculation/quote/',
+        QuotationCreateView.as_view(),
+        name='calQuote'
+    ),
+    path(
+        'Pricingcalculation/curve/',
+        PriceCurveView.as_view(),
+        name='calCurve'
+    ),
+    path(
+        'Pricingcalculation/batch/',
+        QuotationBatchView.as_view(),
+        name='calBatch'
+    ),
     path(
         'Pricingcalculation/<int:pk>/',
         pricingRecomendationview.as_view(),
@@ -76,10 +108,35 @@ urlpatterns = [
         download_quotation_pdf,
         name='quotation-pdf'
     ),
+    path(
+        'quotation/<int:pk>/export/',
+        QuotationExportView.as_view(),
+        name='quotation-export'
+    ),
+    path(
+        'quotation/<int:pk>/pdf/jobs/',
+        enqueue_quotation_pdf,
+        name='quotation-pdf-enqueue'
+    ),
+    path(
+        'quotation/pdf-jobs/<str:job_id>/',
+        quotation_pdf_job_status,
+        name='quotation-pdf-job'
+    ),
+    path(
+        'quotation/pdf-jobs/<str:job_id>/download/',
+        download_quotation_pdf_job,
+        name='quotation-pdf-job-download'
+    ),
     path(
         'quotation/<int:pk>/send-email/',
         send_quotation_email,
         name='quotation-pdf'
+    ),
+    path(
+        'quotation/email-deliveries/<int:pk>/',
+        EmailDeliveryDetail.as_view(),
+        name='quotation-email-delivery'
     ),
      path(
         'storage-costing/',
@@ -110,10 +167,13 @@ urlpatterns = [
     path('admin/users/', AdminUsersListView.as_view(), name='admin-users'),
     
     path('admin/quotations/', AdminAllQuotationsView.as_view(), name='admin-quotations'),
+    path('admin/quotations/export/', export_quotation_pdfs, name='admin-quotations-export'),
     path('admin/quotations/<int:pk>/', AdminQuatationDetail.as_view(), name='admin-quotations-detail'),
     
 
     path('admin/audit-logs/', AdminAuditLogsView.as_view(), name='admin-audit-logs'),
+    path('admin/audit-logs/search/', AdminAuditLogSearchView.as_view(), name='admin-audit-logs-search'),
+    path('admin/quote-cache/', quote_cache_statistics, name='admin-quote-cache'),
     # urls.py
 path(
         'admin/users/<int:user_id>/toggle-role/',
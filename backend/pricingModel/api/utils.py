@@ -6,323 +6,338 @@ from reportlab.platypus import (
     Table,
     TableStyle
 )
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 
-from pricingModel.models import Component
-
-
-def generate_enterprise_quotation_pdf(quotation, username: str) -> bytes:
-    buffer = BytesIO()
-
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        rightMargin=40,
-        leftMargin=40,
-        topMargin=40,
-        bottomMargin=40
-    )
-
-    PAGE_WIDTH = A4[0] - doc.leftMargin - doc.rightMargin
-
-    LEFT_COL = PAGE_WIDTH * 0.65
-    RIGHT_COL = PAGE_WIDTH * 0.35
-
-    styles = getSampleStyleSheet()
-    elements = []
-
-    # ==========================
-    # STYLES
-    # ==========================
-    title = ParagraphStyle(
-        "title",
-        fontSize=20,
-        fontName="Helvetica-Bold",
-        textColor=colors.HexColor("#0d6efd"),
-        spaceAfter=0
-    )
-
-    section = ParagraphStyle(
-        "section",
-        fontSize=12,
-        fontName="Helvetica-Bold",
-        spaceBefore=18,
-        spaceAfter=8
-    )
-
-    normal = ParagraphStyle(
-        "normal",
-        fontSize=10,
-        leading=14
-    )
-
-    footer = ParagraphStyle(
-        "footer",
-        fontSize=9,
-        textColor=colors.grey,
-        spaceBefore=20
-    )
-
+MARGIN = 40
+
+
+def format_licence_duration(duration):
+    """Licence duration in years as printed on a quotation, e.g. "2 Years"."""
+    try:
+        years = int(duration)
+    except Exception:
+        return duration
+    return f"{years} Year" if years == 1 else f"{years} Years"
+
+
+class QuotationTemplate:
+    """
+    Paragraph and table styles of the enterprise quotation PDF.
+
+    Building them costs as much as laying out a small document, so one
+    template is built per process (see get_quotation_template) and renders
+    every quotation. ReportLab copies style commands into each Table, so
+    the shared TableStyle objects are never mutated by a render.
+
+    Rendering works on the plain-data payload from
+    pdf_cache.quotation_pdf_data, never on ORM objects, so it can run in
+    a renderer process without Django (see pdf_renderer.py).
+    """
+
+    def __init__(self):
+        self.page_width = A4[0] - 2 * MARGIN
+
+        self.left_col = self.page_width * 0.65
+        self.right_col = self.page_width * 0.35
+
+        # ==========================
+        # STYLES
+        # ==========================
+        self.title = ParagraphStyle(
+            "title",
+            fontSize=20,
+            fontName="Helvetica-Bold",
+            textColor=colors.HexColor("#0d6efd"),
+            spaceAfter=0
+        )
+
+        self.section = ParagraphStyle(
+            "section",
+            fontSize=12,
+            fontName="Helvetica-Bold",
+            spaceBefore=18,
+            spaceAfter=8
+        )
+
+        self.normal = ParagraphStyle(
+            "normal",
+            fontSize=10,
+            leading=14
+        )
+
+        self.footer = ParagraphStyle(
+            "footer",
+            fontSize=9,
+            textColor=colors.grey,
+            spaceBefore=20
+        )
+
+        # ==========================
+        # TABLE STYLES
+        # ==========================
+        self.info_style = TableStyle([
+            ("BOX", (0, 0), (-1, -1), 0.75, colors.grey),
+            ("PADDING", (0, 0), (-1, -1), 10),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ])
+
+        self.summary_style = TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#0d6efd")),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ("ALIGN", (1, 1), (1, -1), "RIGHT"),
+            ("PADDING", (0, 0), (-1, -1), 8),
+        ])
+
+        # CPU and GPU breakdowns
+        self.breakdown_style = TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ("ALIGN", (-1, 1), (-1, -1), "RIGHT"),
+            ("PADDING", (0, 0), (-1, -1), 8),
+        ])
+
+        self.licence_style = TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ("ALIGN", (1, 1), (1, -1), "RIGHT"),
+            ("PADDING", (0, 0), (-1, -1), 8),
+        ])
+
+        self.ai_style = TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#198754")),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ("ALIGN", (-1, 1), (-1, -1), "RIGHT"),
+            ("PADDING", (0, 0), (-1, -1), 8),
+        ])
+
+        self.total_style = TableStyle([
+            ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#198754")),
+            ("TEXTCOLOR", (0, 0), (-1, -1), colors.white),
+            ("FONTNAME", (0, 0), (-1, -1), "Helvetica-Bold"),
+            ("FONTSIZE", (0, 0), (-1, -1), 12),
+            ("ALIGN", (1, 0), (1, 0), "RIGHT"),
+            ("PADDING", (0, 0), (-1, -1), 10),
+        ])
+
+    def render(self, data: dict) -> bytes:
+        buffer = BytesIO()
+
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=A4,
+            rightMargin=MARGIN,
+            leftMargin=MARGIN,
+            topMargin=MARGIN,
+            bottomMargin=MARGIN
+        )
+
+        elements = []
+
+        # ==========================
+        # HEADER
+        # ==========================
+        elements.append(Paragraph("SENTINEL", self.title))
+        elements.append(Spacer(1, 12))
+
+
+        info_table = Table(
+                    [[
+                        Paragraph("<b>Client</b><br/>Enterprise Customer", self.normal),
+                        Paragraph(
+                            f"<b>Quotation ID:</b> {data['id']}<br/>"
+                            f"<b>Date:</b> {data['date']}<br/>"
+                            f"<b>Prepared By:</b> {data['username']}",
+                            self.normal
+                        )
+                    ]],
+                    colWidths=[self.left_col, self.right_col]
+                )
+        info_table.setStyle(self.info_style)
+
+        elements.append(info_table)
+
+        # ==========================
+        # SAFE DATA FETCH
+        # ==========================
+        storage_days = data["storage_days"]
+        storage_cost = data["storage_cost"]
+
+        cpu = data["cpu"]
+        cpu_name = cpu["name"] if cpu else "—"
+        CPUcores = cpu["cores"] if cpu else "-"
+        ram_required = data["ram_required"]
+        cpu_cost = data["cpu_cost"]
+
+        gpu = data["gpu"]
+        gpu_name = gpu["name"] if gpu else "—"
+        gpu_vram = gpu["vram"] if gpu else "-"
+        gpu_cost = data["gpu_cost"]
+
+        ai_cost = data["ai_cost"]
+        total_cost = data["total_costing"]
+
+        # ==========================
+        # LICENCE
+        # ==========================
+        licence = data["licence"]
+
+        # The summary shows the licence at its catalog price, the breakdown
+        # at the price stored on the quotation
+        licence_cost = data["licenceCostU"]
+        if licence and licence["costing"] is not None:
+            licence_cost = licence["costing"]
+
+        duration_value = format_licence_duration(licence["duration"]) if licence else "-"
+
+        # ==========================
+        # COST SUMMARY
+        # ==========================
+        elements.append(Paragraph("Cost Summary", self.section))
+
+        summary_table = Table(
+            [
+                ["Component", "Total Cost"],
+                [f"Storage ({storage_days} Days)", f"₹ {storage_cost}"],
+                ["CPU", f"₹ {cpu_cost}"],
+                ["GPU", f"₹ {gpu_cost}"],
+                ["Licences", f"₹ {licence_cost}"],
+                ["AI Services", f"₹ {ai_cost}"],
+            ],
+            colWidths=[self.left_col, self.right_col]
+        )
+
+        summary_table.setStyle(self.summary_style)
+
+        elements.append(summary_table)
+
+        # ==========================
+        # CPU BREAKDOWN
+        # ==========================
+        elements.append(Paragraph("CPU Breakdown", self.section))
+
+        cpu_table = Table(
+            [
+                ["CPU Model", "Cores", "RAM (GB)", "Cost"],
+                [cpu_name, CPUcores, ram_required, f"₹ {cpu_cost}"],
+            ],
+            colWidths=[self.left_col * 0.5, self.left_col * 0.2, self.left_col * 0.3, self.right_col]
+        )
+
+        cpu_table.setStyle(self.breakdown_style)
+
+        elements.append(cpu_table)
+
+        # ==========================
+        # GPU BREAKDOWN
+        # ==========================
+        elements.append(Paragraph("GPU Breakdown", self.section))
+
+        gpu_table = Table(
+            [
+                ["GPU Model", "VRAM (GB)", "Cost"],
+                [gpu_name, gpu_vram, f"₹ {gpu_cost}"],
+            ],
+            colWidths=[self.left_col * 0.7, self.left_col * 0.3, self.right_col]
+        )
+
+        gpu_table.setStyle(self.breakdown_style)
+
+        elements.append(gpu_table)
+
+        # ==========================
+        # LICENCE BREAKDOWN
+        # ==========================
+        elements.append(Paragraph("Licence Breakdown", self.section))
+
+        licence_table = Table(
+            [
+                ["Duration", "Cost"],
+                [duration_value, f"₹ {data['licenceCostU']}"],
+            ],
+            colWidths=[self.left_col, self.right_col]
+        )
+
+        licence_table.setStyle(self.licence_style)
+
+        elements.append(licence_table)
     # ==========================
-    # HEADER
+    # AI FEATURE BREAKDOWN
     # ==========================
-    elements.append(Paragraph("SENTINEL", title))
-    elements.append(Spacer(1, 12))
-
-
-    info_table = Table(
-                [[
-                    Paragraph("<b>Client</b><br/>Enterprise Customer", normal),
-                    Paragraph(
-                        f"<b>Quotation ID:</b> {quotation.id}<br/>"
-                        f"<b>Date:</b> {quotation.created_at.strftime('%d-%m-%Y')}<br/>"
-                        f"<b>Prepared By:</b> {username}",
-                        normal
-                    )
-                ]],
-                colWidths=[LEFT_COL, RIGHT_COL]
-            )
-    info_table.setStyle(TableStyle([
-        ("BOX", (0, 0), (-1, -1), 0.75, colors.grey),
-        ("PADDING", (0, 0), (-1, -1), 10),
-        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-    ]))
-
-    elements.append(info_table)
+        elements.append(Paragraph("AI Feature Breakdown", self.section))
 
-    # ==========================
-    # SAFE DATA FETCH
-    # ==========================
-    storage_days = getattr(quotation, "storage_days", 7)
-    storage_cost = getattr(quotation, "storage_cost", 0)
+        ai_data = [["Sr No", "Feature", "Cost"]]
 
-    cpu_name = getattr(quotation.cpu, "core_hardware", "—") if getattr(quotation, "cpu", None) else "—"
-    CPUcores = getattr(quotation.cpu, "CPUcores", 0) if getattr(quotation, "cpu", None) else "-"
-    ram_required = getattr(quotation, "ram_required", 0)
-    cpu_cost = getattr(quotation, "cpu_cost", 0)
+        features = data["ai_features"]
 
-    gpu_name = getattr(quotation.gpu, "AI_Component", "—") if getattr(quotation, "gpu", None) else "—"
-    gpu_vram = getattr(quotation.gpu, "VRAM", 0) if getattr(quotation, "gpu", None) else "-"
-    gpu_cost = getattr(quotation, "gpu_cost", 0)
+        if features:
+            for i, ai in enumerate(features, start=1):
+                ai_data.append([
+                    i,
+                    ai["name"],
+                    f"₹ {ai['costing'] or 0}"
+                ])
+        else:
+            ai_data.append(["-", "No AI Features Selected", "-"])
 
-    ai_cost = getattr(quotation, "ai_cost", 0)
-    total_cost = getattr(quotation, "total_costing", 0)
 
-    # ==========================
-    # LICENCE FETCH (MODEL-CORRECT)
-    # ==========================
-    duration_value = "-"
-    licence_cost = getattr(quotation, "licenceCostU", 0)
+        ai_table = Table(
+            ai_data,
+            colWidths=[
+                self.page_width * 0.10,
+                self.left_col - (self.page_width * 0.10),
+                self.right_col,
+            ]
+        )
 
-    if getattr(quotation, "DurationU", None):
-        licence_obj = Component.objects.filter(id=quotation.DurationU).first()
+        ai_table.setStyle(self.ai_style)
 
-        if licence_obj:
-            duration_value = getattr(licence_obj, "Duration", 0)
+        elements.append(ai_table)
 
-            if hasattr(licence_obj, "price"):
-                licence_cost = licence_obj.price.costing
+        # ==========================
+        # GRAND TOTAL
+        # ==========================
+        elements.append(Spacer(1, 16))
 
-    if duration_value != "-":
-        try:
-            years = int(duration_value)
-            duration_value = f"{years} Year" if years == 1 else f"{years} Years"
-        except Exception:
-            pass
+        total_table = Table(
+            [["GRAND TOTAL", f"₹ {total_cost}"]],
+            colWidths=[self.left_col, self.right_col]
+        )
 
-    # ==========================
-    # COST SUMMARY
-    # ==========================
-    elements.append(Paragraph("Cost Summary", section))
-
-    summary_table = Table(
-        [
-            ["Component", "Total Cost"],
-            [f"Storage ({storage_days} Days)", f"₹ {storage_cost}"],
-            ["CPU", f"₹ {cpu_cost}"],
-            ["GPU", f"₹ {gpu_cost}"],
-            ["Licences", f"₹ {licence_cost}"],
-            ["AI Services", f"₹ {ai_cost}"],
-        ],
-        colWidths=[LEFT_COL, RIGHT_COL]
-    )
-
-    summary_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#0d6efd")),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-        ("ALIGN", (1, 1), (1, -1), "RIGHT"),
-        ("PADDING", (0, 0), (-1, -1), 8),
-    ]))
-
-    elements.append(summary_table)
+        total_table.setStyle(self.total_style)
 
-    # ==========================
-    # CPU BREAKDOWN
-    # ==========================
-    elements.append(Paragraph("CPU Breakdown", section))
-
-    cpu_table = Table(
-        [
-            ["CPU Model", "Cores", "RAM (GB)", "Cost"],
-            [cpu_name, CPUcores, ram_required, f"₹ {cpu_cost}"],
-        ],
-        colWidths=[LEFT_COL * 0.5, LEFT_COL * 0.2, LEFT_COL * 0.3, RIGHT_COL]
-    )
-
-    cpu_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-        ("ALIGN", (-1, 1), (-1, -1), "RIGHT"),
-        ("PADDING", (0, 0), (-1, -1), 8),
-    ]))
-
-    elements.append(cpu_table)
+        elements.append(total_table)
 
-    # ==========================
-    # GPU BREAKDOWN
-    # ==========================
-    elements.append(Paragraph("GPU Breakdown", section))
-
-    gpu_table = Table(
-        [
-            ["GPU Model", "VRAM (GB)", "Cost"],
-            [gpu_name, gpu_vram, f"₹ {gpu_cost}"],
-        ],
-        colWidths=[LEFT_COL * 0.7, LEFT_COL * 0.3, RIGHT_COL]
-    )
-
-    gpu_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-        ("ALIGN", (-1, 1), (-1, -1), "RIGHT"),
-        ("PADDING", (0, 0), (-1, -1), 8),
-    ]))
-
-    elements.append(gpu_table)
+        elements.append(Paragraph(
+            "This quotation is system generated and valid for 15 days.<br/>"
+            "Taxes applicable as per government norms.",
+            self.footer
+        ))
 
-    # ==========================
-    # LICENCE BREAKDOWN
-    # ==========================
-    elements.append(Paragraph("Licence Breakdown", section))
-
-    duration_value = "-"
-    licence_cost = getattr(quotation, "licenceCostU", 0)
-
-    if getattr(quotation, "DurationU", None):
-
-        licence_obj = Component.objects.filter(id=quotation.DurationU).first()
-
-        if licence_obj:
-            duration_value = getattr(licence_obj, "Duration", "-")
-
-    if duration_value != "-":
-        try:
-            years = int(duration_value)
-            duration_value = f"{years} Year" if years == 1 else f"{years} Years"
-        except:
-            pass
-
-
-
-    licence_table = Table(
-        [
-            ["Duration", "Cost"],
-            [duration_value, f"₹ {licence_cost}"],
-        ],
-        colWidths=[LEFT_COL, RIGHT_COL]
-    )
-
-    licence_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-        ("ALIGN", (1, 1), (1, -1), "RIGHT"),
-        ("PADDING", (0, 0), (-1, -1), 8),
-    ]))
-
-    elements.append(licence_table)
-# ==========================
-# AI FEATURE BREAKDOWN
-# ==========================
-    elements.append(Paragraph("AI Feature Breakdown", section))
-
-    ai_data = [["Sr No", "Feature", "Cost"]]
-
-    features = quotation.ai_features.all()
-
-    if features.exists():
-        for i, ai in enumerate(features, start=1):
-
-            try:
-                cost = ai.price.costing
-            except Exception:
-                cost = 0
-
-            ai_data.append([
-                i,
-                getattr(ai, "AI_feature", "—"),
-                f"₹ {cost}"
-            ])
-    else:
-        ai_data.append(["-", "No AI Features Selected", "-"])
-
-
-    ai_table = Table(
-        ai_data,
-        colWidths=[
-            PAGE_WIDTH * 0.10,
-            LEFT_COL - (PAGE_WIDTH * 0.10),
-            RIGHT_COL,
-        ]
-    )
-
-    ai_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#198754")),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-        ("ALIGN", (-1, 1), (-1, -1), "RIGHT"),
-        ("PADDING", (0, 0), (-1, -1), 8),
-    ]))
-
-    elements.append(ai_table)
+        doc.build(elements)
 
-    # ==========================
-    # GRAND TOTAL
-    # ==========================
-    elements.append(Spacer(1, 16))
+        pdf = buffer.getvalue()
+        buffer.close()
 
-    total_table = Table(
-        [["GRAND TOTAL", f"₹ {total_cost}"]],
-        colWidths=[LEFT_COL, RIGHT_COL]
-    )
+        return pdf
 
-    total_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#198754")),
-        ("TEXTCOLOR", (0, 0), (-1, -1), colors.white),
-        ("FONTNAME", (0, 0), (-1, -1), "Helvetica-Bold"),
-        ("FONTSIZE", (0, 0), (-1, -1), 12),
-        ("ALIGN", (1, 0), (1, 0), "RIGHT"),
-        ("PADDING", (0, 0), (-1, -1), 10),
-    ]))
 
-    elements.append(total_table)
+_template = None
 
-    elements.append(Paragraph(
-        "This quotation is system generated and valid for 15 days.<br/>"
-        "Taxes applicable as per government norms.",
-        footer
-    ))
 
-    doc.build(elements)
+def get_quotation_template() -> QuotationTemplate:
+    global _template
+    if _template is None:
+        _template = QuotationTemplate()
+    return _template
 
-    pdf = buffer.getvalue()
-    buffer.close()
 
-    return pdf
+def generate_enterprise_quotation_pdf(data: dict) -> bytes:
+    return get_quotation_template().render(data)
@@ -2,26 +2,55 @@ from django.contrib.auth.models import User
 from rest_framework import generics
 from django.db.models import Q
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from rest_framework.exceptions import ValidationError
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_email
+from django.utils.decorators import method_decorator
+from rest_framework.renderers import JSONRenderer
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from django.views.decorators.clickjacking import xframe_options_exempt
 from rest_framework.decorators import api_view, permission_classes
 # from pricingModel.models import Cammera_Pricing, UserPricing, AI_ENABLED,
-from pricingModel.models import Category, Component, Price,UserPricing,AuditLog
+from pricingModel.models import Category, Component, Price,UserPricing,EmailDelivery
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from django.core.mail import EmailMessage
 from rest_framework.response import Response
-from pricingModel.api.tasks import send_quotation_email_task
-from pricingModel.api.utils import generate_enterprise_quotation_pdf
+from pricingModel.api.mail import request_quotation_email
+from pricingModel.api.tasks import drain_quotation_emails_task
+from pricingModel.api.pdf_cache import get_quotation_pdf, pdf_store, quotation_pdf_data
+from pricingModel.api.renderers import QUOTATION_RENDERERS
+from pricingModel.api.audit_search import search_audit_logs
+from pricingModel.api.pagination import CreatedAtPagination, DateJoinedPagination
+from pricingModel.api.pdf_export import stream_quotation_zip
+from pricingModel.api.pdf_jobs import (
+    DONE,
+    QUEUED,
+    enqueue_pdf_job,
+    get_pdf_job,
+    pdf_job_status,
+)
 from io import BytesIO
 from rest_framework import status
-from rest_framework import filters
 from pricingModel.api.audit import create_audit_log   
+from pricingModel.api.audit_archive import hot_audit_logs
+from pricingModel.api.catalog import get_catalog
+from pricingModel.api.pricing import (
+    REQUIREMENT_FIELDS,
+    build_user_pricing,
+    quotations_with_details,
+    user_pricing_fields,
+)
+from pricingModel.engine import (
+    PricingError,
+    calculate_requirements,
+    price_curve,
+)
+from pricingModel.api.quote_cache import get_cached_quote, get_cached_quotes, quote_cache_stats
 from pricingModel.api.serializers import (
     AI_ENABLEDserializer,
     licensePricingSerializer,
@@ -32,18 +61,28 @@ from pricingModel.api.serializers import (
     AdminUserSerializer,
     AdminQuotationSerializer,
     AuditLogSerializer,
+    AuditLogSearchSerializer,
     userRequirementSerializer,
     UserFinalQuotationSerializer,
     processorSerializer,
     configuration,
+    QuotationBatchSerializer,
+    QuoteScenarioSerializer,
+    PriceCurveSerializer,
+    QuotationExportSerializer,
+    EmailDeliverySerializer,
 )
+from django.db import transaction
 import math
+import time
+import numpy as np
  
  
  
 class AdminUsersListView(generics.ListAPIView):
     serializer_class = AdminUserSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
+    pagination_class = DateJoinedPagination
  
     def get_queryset(self):
         return User.objects.all().order_by('-date_joined')
@@ -51,21 +90,13 @@ class AdminUsersListView(generics.ListAPIView):
 class AdminAllQuotationsView(generics.ListAPIView):
     serializer_class = AdminQuotationSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
-    filter_backends = [filters.OrderingFilter]
- 
-    # ✅ Allow only correct fields
-    ordering_fields = ["created_at", "id"]  # add other valid fields if needed
-    ordering = ["-created_at"]
+    # Pages are always newest first
+    pagination_class = CreatedAtPagination
  
     def get_queryset(self):
-        return (
-            UserPricing.objects
-            .select_related("user_name")
-            .prefetch_related("ai_features")
-            .order_by("-created_at")
-        )
+        return quotations_with_details().order_by("-created_at")
 class AdminQuatationDetail(generics.RetrieveDestroyAPIView):
-    queryset = UserPricing.objects.all()
+    queryset = quotations_with_details()
     serializer_class = AdminQuotationSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
           
@@ -187,9 +218,6 @@ def send_quotation_email(request, pk):
     if not quotation:
         return Response({"detail": "Quotation not found"}, status=404)
  
-    print("REQUEST DATA:", request.data)
-    print("USER EMAIL:", request.user.email)
- 
     to_email = (
         request.data.get("Email")
         or request.data.get("email")
@@ -199,13 +227,40 @@ def send_quotation_email(request, pk):
     if not to_email:
         return Response({"detail": "Email is required"}, status=400)
  
-    send_quotation_email_task.delay(
-        quotation.id,
-        request.user.username,
-        to_email
+    to_email = str(to_email).strip()
+
+    try:
+        validate_email(to_email)
+    except DjangoValidationError:
+        return Response({"detail": "Invalid email address"}, status=400)
+
+    attach_pdf = request.data.get("attach_pdf", True) not in (False, "false", "0", 0)
+
+    # An identical request that is queued, sending or just sent returns
+    # the existing delivery instead of emailing twice
+    delivery, queued = request_quotation_email(
+        quotation,
+        request.user,
+        to_email,
+        attach_pdf,
+        on_queued=drain_quotation_emails_task.delay
     )
- 
-    return Response({"detail": "Email sending started ✅"})
+
+    data = EmailDeliverySerializer(delivery).data
+    data["detail"] = "Email sending started ✅" if queued else f"Email already {delivery.status}"
+    data["status_url"] = reverse("quotation-email-delivery", args=[delivery.id])
+
+    return Response(data, status=status.HTTP_202_ACCEPTED if queued else status.HTTP_200_OK)
+
+
+class EmailDeliveryDetail(generics.RetrieveAPIView):
+    serializer_class = EmailDeliverySerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        if self.request.user.is_staff:
+            return EmailDelivery.objects.all()
+        return EmailDelivery.objects.filter(quotation__user_name=self.request.user)
  
  
 @api_view(['GET'])
@@ -221,7 +276,7 @@ def download_quotation_pdf(request, pk):
     if not quotation:
         return Response({"detail": "Quotation not found"}, status=404)
  
-    pdf = generate_enterprise_quotation_pdf(quotation, request.user.username)
+    pdf = get_quotation_pdf(quotation, request.user.username)
  
     response = HttpResponse(pdf, content_type="application/pdf")
  
@@ -230,6 +285,111 @@ def download_quotation_pdf(request, pk):
     response["Content-Length"] = len(pdf)
  
     return response
+
+
+@method_decorator(xframe_options_exempt, name="dispatch")
+class QuotationExportView(generics.GenericAPIView):
+    """
+    A quotation as JSON, CSV, HTML or PDF, chosen by the Accept header or
+    ?format=. All four render the same payload; only PDF is expensive.
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = QUOTATION_RENDERERS
+
+    def get_queryset(self):
+        if self.request.user.is_staff:
+            return UserPricing.objects.all()
+        return UserPricing.objects.filter(user_name=self.request.user)
+
+    def get(self, request, pk):
+        quotation = self.get_object()
+
+        response = Response(quotation_pdf_data(quotation, request.user.username))
+
+        fmt = request.accepted_renderer.format
+        if fmt in ("csv", "pdf"):
+            disposition = "inline" if fmt == "pdf" else "attachment"
+            response["Content-Disposition"] = f'{disposition}; filename="quotation_{quotation.id}.{fmt}"'
+
+        return response
+
+    def handle_exception(self, exc):
+        # Errors are JSON whatever format was asked for
+        self.request.accepted_renderer = JSONRenderer()
+        self.request.accepted_media_type = JSONRenderer.media_type
+        return super().handle_exception(exc)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def enqueue_quotation_pdf(request, pk):
+
+    if request.user.is_staff:
+        quotation = UserPricing.objects.filter(pk=pk).first()
+    else:
+        quotation = UserPricing.objects.filter(pk=pk, user_name=request.user).first()
+
+    if not quotation:
+        return Response({"detail": "Quotation not found"}, status=404)
+
+    job_id, job = enqueue_pdf_job(quotation, request.user)
+
+    return Response(
+        {
+            "job_id": job_id,
+            "status": DONE if job["key"] else QUEUED,
+            "status_url": reverse("quotation-pdf-job", args=[job_id]),
+            "download_url": reverse("quotation-pdf-job-download", args=[job_id]),
+        },
+        status=status.HTTP_200_OK if job["key"] else status.HTTP_202_ACCEPTED,
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def quotation_pdf_job_status(request, job_id):
+
+    job = get_pdf_job(job_id, request.user)
+    if job is None:
+        return Response({"detail": "Job not found"}, status=404)
+
+    job_status, _, error = pdf_job_status(job_id, job)
+
+    data = {
+        "job_id": job_id,
+        "quotation_id": job["quotation_id"],
+        "status": job_status,
+    }
+    if job_status == DONE:
+        data["download_url"] = reverse("quotation-pdf-job-download", args=[job_id])
+    if error:
+        data["error"] = error
+
+    return Response(data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@xframe_options_exempt
+def download_quotation_pdf_job(request, job_id):
+
+    job = get_pdf_job(job_id, request.user)
+    if job is None:
+        return Response({"detail": "Job not found"}, status=404)
+
+    job_status, key, _ = pdf_job_status(job_id, job)
+    if job_status != DONE:
+        return Response({"detail": f"PDF is not ready ({job_status})"}, status=409)
+
+    pdf = pdf_store.get(key)
+    if pdf is None:
+        return Response({"detail": "PDF has expired, request a new render"}, status=404)
+
+    response = HttpResponse(pdf, content_type="application/pdf")
+    response["Content-Disposition"] = f'inline; filename="quotation_{job["quotation_id"]}.pdf"'
+    response["Content-Length"] = len(pdf)
+
+    return response
  
 class cameraSlabsCS(generics.ListCreateAPIView):
     serializer_class = processorSerializer
@@ -343,111 +503,46 @@ class pricingCalculate(generics.ListCreateAPIView):
         def get_queryset(self):
             # Each user sees only their own pricing calculations
             if self.request.user.is_superuser:
-                return UserPricing.objects.all()
+                return quotations_with_details()
             else:
-                return UserPricing.objects.filter(user_name=self.request.user).order_by('-created_at')
+                return quotations_with_details().filter(user_name=self.request.user).order_by('-created_at')
  
         def perform_create(self, serializer):
  
             # ---------- SAFE INPUT ----------
-            cameras = serializer.validated_data.get("cammera")
-            storage_days = serializer.validated_data.get("storage_days", 1)
             ai_features = serializer.validated_data.get("ai_features", [])
-            aiEnabledCam = serializer.validated_data.get("aiEnabledCam")
-            duration_id = serializer.validated_data.get("DurationU")
-
-            configDetail = Component.objects.filter(category__name = 'CPU_GPU_Config').first()
-            print(configDetail)
-            ram_required1 = configDetail.ram_required1
-            vram_required1 = configDetail.VRAM_required
-            cores_required1 = configDetail.cores_required1
-            cores_required2 = configDetail.cores_required2
-            camera_for_intel = int((20*0.8)/cores_required1)
-            
-            if not cameras:
-                raise ValidationError("Camera count is required")
- 
-            if not duration_id:
-                raise ValidationError("Licence duration is required")
- 
-            # ---------- VALIDATE LICENCE ----------
-            license_component = Component.objects.filter(
-                id=duration_id,
-                category__name="licence"
-            ).first()
- 
-            if not license_component:
-                raise ValidationError("Invalid licence selection")
- 
-            try:
-                licence_cost = license_component.price.costing
-            except Price.DoesNotExist:
-                raise ValidationError("Licence price not configured")
- 
-            # ---------- STORAGE ----------
-            storage = Component.objects.filter(category__name="Storage").first()
- 
-            if not storage:
-                raise ValidationError("Storage component not configured")
+            catalog = get_catalog()
  
+            # The memoised breakdown already holds the requirements
             try:
-                storage_unit_cost = storage.price.costing
-            except Price.DoesNotExist:
-                raise ValidationError("Storage pricing not configured")
- 
-            # ---------- AI ENABLED CAMERAS ----------
-            if aiEnabledCam:
-                ai_enabled_cams = aiEnabledCam
-            else:
-                ai_enabled_cams = cameras
- 
-            ai_enabled_cams = int(ai_enabled_cams)
- 
-            # If no AI features → disable AI load
-            if ai_features:
-                ai_load_cams = ai_enabled_cams
-            else:
-                ai_load_cams = 0
- 
-            # ---------- REQUIREMENTS ----------
-            vram_calculation = int(vram_required1 * ai_load_cams)
-            vram_required = int(vram_calculation * 1.10 + 3)
-
-            if cameras < camera_for_intel:
-                cpuCores_calculation = int(cores_required1 * cameras)
-            else:
-                cpuCores_calculation = int(cores_required2 * cameras)
-
-            cpuCores_required = int(cpuCores_calculation * 1.10)
-
-            ram_calculation = int(ram_required1 * cameras)
-            ram_required = int(ram_calculation * 1.10)
-
-            # ---------- STORAGE CALCULATION ----------
-            storage_used = cameras * storage_days
-            storage_used_user = storage_used * 19
+                quote = get_cached_quote(catalog, {
+                    **serializer.validated_data,
+                    "ai_features": [feature.id for feature in ai_features],
+                })
+                requirements = {field: quote[field] for field in REQUIREMENT_FIELDS}
+            except PricingError:
+                # Hardware is only picked on PUT; a scenario nothing fits
+                # yet still gets its requirements stored
+                requirements = calculate_requirements(
+                    catalog,
+                    cameras=serializer.validated_data.get("cammera"),
+                    storage_days=serializer.validated_data.get("storage_days", 1),
+                    ai_features=ai_features,
+                    aiEnabledCam=serializer.validated_data.get("aiEnabledCam"),
+                    duration_id=serializer.validated_data.get("DurationU"),
+                )
  
             # ---------- SAVE CLEAN DATA ----------
             user_pricing = serializer.save(
                 user_name=self.request.user,
- 
-                aiEnabledCam=ai_load_cams,
-                storage_days=storage_days,
-                storage_used_user=storage_used_user,
- 
-                vram_required=vram_required,
-                cpuCores_required=cpuCores_required,
-                ram_required=ram_required,
- 
-                DurationU=license_component.id,
-                licenceCostU=licence_cost,          
+                **requirements,
             )
  
             user_pricing.ai_features.set(ai_features)
  
     
  
- 
+
 class pricingRecomendationview(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = UserFinalQuotationSerializer
     permission_classes = [IsAuthenticated]
@@ -455,147 +550,193 @@ class pricingRecomendationview(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
             # Each user sees only their own pricing calculations
             if self.request.user.is_superuser:
-                return UserPricing.objects.all()
+                return quotations_with_details()
             else:
-                return UserPricing.objects.filter(user_name=self.request.user).order_by('-created_at')
+                return quotations_with_details().filter(user_name=self.request.user).order_by('-created_at')
  
  
     def perform_update(self, serializer):
         instance = self.get_object()
         validated = serializer.validated_data
  
-        vramUser = instance.vram_required
- 
-        include_cpu = validated.get("include_cpu", instance.include_cpu)
-        include_gpu = validated.get("include_gpu", instance.include_gpu)
-        include_storage = validated.get("include_storage", instance.include_storage)
-        
-        cpu = None
-        cpu_cost = 0
- 
-        # ---------- CPU ----------
-        if include_cpu:
-            cpu = Component.objects.filter(
-                category__name="Processor",
-                ram_required__isnull=False,
-                CPUcores__isnull = False,
-                CPUcores__gte = instance.cpuCores_required,
-                ram_required__gte=instance.ram_required 
-            ).order_by("ram_required").first()
- 
-            if not cpu:
-                raise ValidationError("No CPU meets required core count")
+        def field(name):
+            return validated.get(name, getattr(instance, name))
+
+        # The stored scenario with whatever this request changes, priced
+        # through the quote cache
+        cammera = field("cammera")
+        features = validated.get("ai_features", instance.ai_features.all())
+        ai_cams = validated.get("aiEnabledCam")
+        if ai_cams is None:
+            # AI on every camera keeps following the camera count
+            stored = instance.aiEnabledCam
+            ai_cams = None if not stored or stored == instance.cammera else min(stored, cammera)
+
+        quote = get_cached_quote(get_catalog(), {
+            "cammera": cammera,
+            "aiEnabledCam": ai_cams,
+            "ai_features": [feature.id for feature in features],
+            "storage_days": field("storage_days"),
+            "DurationU": validated.get("DurationU") or instance.DurationU,
+            "include_cpu": field("include_cpu"),
+            "include_gpu": field("include_gpu"),
+            "include_storage": field("include_storage"),
+        })
+        costs = user_pricing_fields(quote)
+ 
+        serializer.save(**costs)
  
-            try:
-                cpu_cost = cpu.price.costing
-            except Price.DoesNotExist:
-                raise ValidationError(f"Price not configured for CPU: {cpu.core_hardware}")
+        create_audit_log(
+            self.request,
+            "UPDATE_PRICING",
+            f"Final pricing calculated. Total={costs['total_costing']}"
+        )
  
-        # ---------- GPU ----------
-        gpu = None
-        gpu_cost = 0
  
-        if include_gpu and vramUser > 0:
  
-            gpu = Component.objects.filter(
-                category__name="Processor",
-                VRAM__isnull=False,
-                VRAM__gte=vramUser
-            ).order_by("VRAM").first()
+class QuotationPreviewView(generics.GenericAPIView):
+    """
+    Price one scenario in memory for interactive recalculation.
+    Returns the same breakdown as a POST + PUT on Pricingcalculation/
+    without creating or updating a UserPricing row.
+    """
+    serializer_class = QuoteScenarioSerializer
+    permission_classes = [IsAuthenticated]
  
-            if not gpu:
-                raise ValidationError("No GPU meets VRAM requirement")
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
  
-            try:
-                gpu_cost = gpu.price.costing
-            except Price.DoesNotExist:
-                raise ValidationError("GPU price not configured")
+        return Response(get_cached_quote(get_catalog(), serializer.validated_data))
  
-        # ---------- AI FEATURES ----------
-        ai_cost = 0
-        for ai in instance.ai_features.all():
-            ai_price = Price.objects.filter(component=ai).first()
  
-            if not ai_price:
-                raise ValidationError(f"Price not configured for AI feature: {ai.AI_feature}")
+class QuotationCreateView(generics.GenericAPIView):
+    """
+    Create and finalize a quotation in one request: validate, compute the
+    requirements, select hardware, price it and save it in one transaction.
+    Replaces POST Pricingcalculation/ followed by PUT Pricingcalculation/<pk>/.
+    """
+    serializer_class = QuoteScenarioSerializer
+    permission_classes = [IsAuthenticated]
  
-            ai_cost += ai_price.costing
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+ 
+        quote = get_cached_quote(get_catalog(), serializer.validated_data)
+        user_pricing = build_user_pricing(request.user, quote)
+        Through = UserPricing.ai_features.through
+ 
+        with transaction.atomic():
+            user_pricing.save()
+            Through.objects.bulk_create([
+                Through(userpricing_id=user_pricing.id, component_id=ai_id)
+                for ai_id in quote["ai_features"]
+            ])
+ 
+            create_audit_log(
+                request,
+                "CREATE_QUOTATION",
+                f"Quotation created. Total={quote['total_costing']}"
+            )
  
-        # ---------- STORAGE ----------
-        storage_cost = 0
+        return Response(
+            {"id": user_pricing.id, **quote, "created_at": user_pricing.created_at},
+            status=status.HTTP_201_CREATED
+        )
  
-        if include_storage:
-            storage = Component.objects.filter(
-                category__name="Storage"
-            ).first()
  
-            if not storage:
-                raise ValidationError("Storage component not configured")
+class PriceCurveView(generics.GenericAPIView):
+    """
+    Requirements, hardware fit and total cost for every camera count in
+    camera_from..camera_to (inclusive, every camera_step cameras).
+    """
+    serializer_class = PriceCurveSerializer
+    permission_classes = [IsAuthenticated]
  
-            storage_price = Price.objects.filter(component=storage).first()
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
  
-            if not storage_price:
-                raise ValidationError("Storage price not configured")
+        cameras = np.arange(data["camera_from"], data["camera_to"] + 1, data["camera_step"])
  
-            storage_cost = (instance.storage_used_user / 19) * storage_price.costing
+        return Response(price_curve(get_catalog(), cameras, data))
  
-        # ---------- LICENCE (TRULY FIXED) ----------
-        duration_id = serializer.validated_data.get("DurationU")
  
-        if duration_id is None:
-            duration_id = instance.DurationU
+class QuotationBatchView(generics.GenericAPIView):
+    """
+    Price many scenarios against one catalog snapshot in a single request.
+    Each result is what a POST + PUT on Pricingcalculation/ would store;
+    with persist=true the priced scenarios are saved with bulk_create.
+    """
+    serializer_class = QuotationBatchSerializer
+    permission_classes = [IsAuthenticated]
  
-        license = Component.objects.filter(
-            id=duration_id,
-            category__name="licence",
-        ).first()
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
  
-        if not license:
-            raise ValidationError("Selected licence component not configured")
+        scenarios = serializer.validated_data["scenarios"]
+        started = time.perf_counter()
  
-        try:
-            licenseCost = license.price.costing
-        except Price.DoesNotExist:
-            raise ValidationError("Licence price not configured")
+        quotes = []
+        results = []
  
-        # ---------- TOTAL ----------
-        total_cost = cpu_cost + gpu_cost + ai_cost + storage_cost + licenseCost
+        for index, quote in enumerate(get_cached_quotes(get_catalog(), scenarios)):
+            if isinstance(quote, PricingError):
+                results.append({"index": index, "errors": [str(quote)]})
+                continue
  
-        serializer.save(
-        cpu=cpu,
-        gpu=gpu,
+            quotes.append((index, quote))
+            results.append({"index": index, **quote})
  
-        cpu_cost=cpu_cost,
-        gpu_cost=gpu_cost,
-        ai_cost=ai_cost,
-        storage_cost=storage_cost,
+        if serializer.validated_data["persist"] and quotes:
+            rows = [build_user_pricing(request.user, quote) for _, quote in quotes]
+            Through = UserPricing.ai_features.through
  
-        DurationU=duration_id,        # ⭐⭐⭐ MISSING PIECE
-        licenceCostU=licenseCost,
+            with transaction.atomic():
+                UserPricing.objects.bulk_create(rows)
+                Through.objects.bulk_create([
+                    Through(userpricing_id=row.id, component_id=ai_id)
+                    for row, (_, quote) in zip(rows, quotes)
+                    for ai_id in quote["ai_features"]
+                ])
  
-        include_cpu=include_cpu,
-        include_gpu=include_gpu,
-        include_storage=include_storage,
+            for row, (index, _) in zip(rows, quotes):
+                results[index]["id"] = row.id
  
-        total_costing=total_cost,
-    )
+            create_audit_log(
+                request,
+                "CREATE_QUOTATION",
+                f"Batch quotation saved. Quotes={len(rows)}"
+            )
  
-        create_audit_log(
-            self.request,
-            "UPDATE_PRICING",
-            f"Final pricing calculated. Total={total_cost}"
-        )
+        elapsed = time.perf_counter() - started
  
+        return Response({
+            "count": len(results),
+            "priced": len(quotes),
+            "failed": len(results) - len(quotes),
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "quotes_per_second": round(len(results) / elapsed, 1) if elapsed else None,
+            "results": results,
+        })
  
  
 class UserQuotationList(generics.ListAPIView):
             serializer_class = UserFinalQuotationSerializer
             permission_classes = [IsAuthenticated]
+            pagination_class = CreatedAtPagination
  
             def get_queryset(self):
-                return UserPricing.objects.filter(
+                return quotations_with_details().filter(
                     user_name=self.request.user
                 ).order_by('-created_at')
+
+            def get_serializer_context(self):
+                # One catalog lookup for the whole page, not one per row
+                return {**super().get_serializer_context(), "catalog": get_catalog()}
  
  
 class storageCosting(generics.ListCreateAPIView):
@@ -718,12 +859,62 @@ class  processorUnitDetail(generics.RetrieveUpdateDestroyAPIView):
         instance.delete()
         
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def quote_cache_statistics(request):
+    return Response(quote_cache_stats())
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def export_quotation_pdfs(request):
+    serializer = QuotationExportSerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    params = serializer.validated_data
+
+    quotations = UserPricing.objects.select_related("user_name").order_by("created_at", "id")
+
+    if "user" in params:
+        quotations = quotations.filter(user_name_id=params["user"])
+    if "date_from" in params:
+        quotations = quotations.filter(created_at__date__gte=params["date_from"])
+    if "date_to" in params:
+        quotations = quotations.filter(created_at__date__lte=params["date_to"])
+
+    create_audit_log(
+        request,
+        "EXPORT_QUOTATIONS",
+        f"Quotation PDF export. Filters={request.query_params.dict()}"
+    )
+
+    response = StreamingHttpResponse(
+        stream_quotation_zip(quotations, request.user.username),
+        content_type="application/zip",
+    )
+    response["Content-Disposition"] = 'attachment; filename="quotations.zip"'
+
+    return response
+ 
+ 
 class AdminAuditLogsView(generics.ListAPIView):
     serializer_class = AuditLogSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
+    pagination_class = CreatedAtPagination
     
     def get_queryset(self):
-        return AuditLog.objects.select_related("user").all().order_by("-created_at")
+        # Only the recent partitions; older months are in the archive
+        return hot_audit_logs().select_related("user").order_by("-created_at")
+
+class AdminAuditLogSearchView(generics.ListAPIView):
+    """Filter and full-text search over all retained audit logs."""
+    serializer_class = AuditLogSerializer
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    pagination_class = CreatedAtPagination
+
+    def get_queryset(self):
+        serializer = AuditLogSearchSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return search_audit_logs(serializer.validated_data)
 
 class setConfig(generics.ListCreateAPIView):
 
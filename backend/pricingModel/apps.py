@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PricingmodelConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pricingModel'
+
+    def ready(self):
+        import pricingModel.signals
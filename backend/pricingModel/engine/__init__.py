@@ -0,0 +1,42 @@
+"""
+Framework-free pricing core.
+
+Everything here works on plain catalog data (CatalogSnapshot/CatalogItem)
+and plain dicts; nothing touches Django, the ORM or DRF. Views, Celery
+tasks and scripts load a catalog (see pricingModel.api.catalog) and call
+into these functions. Invalid input raises PricingError.
+"""
+from pricingModel.engine.catalog import (
+    AI_CATEGORY,
+    CONFIG_CATEGORY,
+    LICENCE_CATEGORY,
+    PROCESSOR_CATEGORY,
+    STORAGE_CATEGORY,
+    CatalogItem,
+    CatalogSnapshot,
+    build_catalog,
+)
+from pricingModel.engine.costs import calculate_costs
+from pricingModel.engine.curve import price_curve
+from pricingModel.engine.exceptions import PricingError
+from pricingModel.engine.hardware import HardwareIndex
+from pricingModel.engine.quote import price_scenario, quote_to_representation
+from pricingModel.engine.requirements import calculate_requirements
+
+__all__ = [
+    "AI_CATEGORY",
+    "CONFIG_CATEGORY",
+    "LICENCE_CATEGORY",
+    "PROCESSOR_CATEGORY",
+    "STORAGE_CATEGORY",
+    "CatalogItem",
+    "CatalogSnapshot",
+    "HardwareIndex",
+    "PricingError",
+    "build_catalog",
+    "calculate_costs",
+    "calculate_requirements",
+    "price_curve",
+    "price_scenario",
+    "quote_to_representation",
+]
@@ -0,0 +1,84 @@
+"""
+Plain-data view of the pricing catalog.
+
+CatalogItem mirrors the Component fields the pricing math reads, with the
+component's price folded in as `costing` (None when no Price exists).
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional
+
+from pricingModel.engine.hardware import HardwareIndex
+
+CONFIG_CATEGORY = "CPU_GPU_Config"
+LICENCE_CATEGORY = "licence"
+STORAGE_CATEGORY = "Storage"
+PROCESSOR_CATEGORY = "Processor"
+AI_CATEGORY = "AI"
+
+
+@dataclass(frozen=True)
+class CatalogItem:
+    id: int
+    category: str
+    costing: Optional[int]
+
+    core_hardware: Optional[str] = None
+    CPUcores: Optional[int] = None
+    ram_required: Optional[int] = None
+    AI_feature: Optional[str] = None
+    AI_Component: Optional[str] = None
+    VRAM: Optional[int] = None
+    storage_per_cam: Optional[int] = None
+    storage_perDay: Optional[int] = None
+    Duration: int = 1
+    cores_required1: Optional[float] = None
+    cores_required2: Optional[float] = None
+    ram_required1: Optional[float] = None
+    VRAM_required: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    version: int
+    components: Mapping[int, CatalogItem]
+
+    config: Optional[CatalogItem]
+    storage: Optional[CatalogItem]
+    licences: Mapping[int, CatalogItem]
+    ai_features: Mapping[int, CatalogItem]
+
+    # Minimum-fit CPU/GPU lookup over the Processor components
+    hardware: HardwareIndex
+
+    def select_cpu(self, cores_required: int, ram_required: int) -> Optional[CatalogItem]:
+        return self.hardware.select_cpu(cores_required, ram_required)
+
+    def select_gpu(self, vram_required: int) -> Optional[CatalogItem]:
+        return self.hardware.select_gpu(vram_required)
+
+
+def _component_order(item: CatalogItem):
+    # Component.Meta.ordering is CPUcores (NULLs last on Postgres)
+    return (item.CPUcores is None, item.CPUcores or 0, item.id)
+
+
+def build_catalog(version: int, items: Iterable[CatalogItem]) -> CatalogSnapshot:
+    """Index catalog items by category the way the pricing queries pick them."""
+    items = sorted(items, key=_component_order)
+
+    def in_category(name):
+        return [item for item in items if item.category == name]
+
+    configs = in_category(CONFIG_CATEGORY)
+    storages = in_category(STORAGE_CATEGORY)
+
+    return CatalogSnapshot(
+        version=version,
+        components=MappingProxyType({item.id: item for item in items}),
+        config=configs[0] if configs else None,
+        storage=storages[0] if storages else None,
+        licences=MappingProxyType({item.id: item for item in in_category(LICENCE_CATEGORY)}),
+        ai_features=MappingProxyType({item.id: item for item in in_category(AI_CATEGORY)}),
+        hardware=HardwareIndex(in_category(PROCESSOR_CATEGORY)),
+    )
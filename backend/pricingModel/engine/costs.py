@@ -0,0 +1,104 @@
+"""
+Hardware selection and cost aggregation: what pricingRecomendationview
+stores when a quotation is finalized.
+"""
+from pricingModel.engine.exceptions import PricingError
+
+
+def calculate_costs(
+    catalog,
+    cpuCores_required,
+    ram_required,
+    vram_required,
+    storage_used_user,
+    ai_feature_ids,
+    duration_id,
+    include_cpu=True,
+    include_gpu=True,
+    include_storage=True,
+):
+    cpu = None
+    cpu_cost = 0
+
+    # ---------- CPU ----------
+    if include_cpu:
+        cpu = catalog.select_cpu(cpuCores_required, ram_required)
+
+        if not cpu:
+            raise PricingError("No CPU meets required core count")
+
+        cpu_cost = cpu.costing
+        if cpu_cost is None:
+            raise PricingError(f"Price not configured for CPU: {cpu.core_hardware}")
+
+    # ---------- GPU ----------
+    gpu = None
+    gpu_cost = 0
+
+    if include_gpu and vram_required > 0:
+
+        gpu = catalog.select_gpu(vram_required)
+
+        if not gpu:
+            raise PricingError("No GPU meets VRAM requirement")
+
+        gpu_cost = gpu.costing
+        if gpu_cost is None:
+            raise PricingError("GPU price not configured")
+
+    # ---------- AI FEATURES ----------
+    ai_cost = 0
+    for ai_id in ai_feature_ids:
+        ai = catalog.components.get(ai_id)
+
+        if not ai or ai.costing is None:
+            name = ai.AI_feature if ai else ai_id
+            raise PricingError(f"Price not configured for AI feature: {name}")
+
+        ai_cost += ai.costing
+
+    # ---------- STORAGE ----------
+    storage_cost = 0
+
+    if include_storage:
+        storage = catalog.storage
+
+        if not storage:
+            raise PricingError("Storage component not configured")
+
+        if storage.costing is None:
+            raise PricingError("Storage price not configured")
+
+        storage_cost = (storage_used_user / 19) * storage.costing
+
+    # ---------- LICENCE ----------
+    license = catalog.licences.get(duration_id)
+
+    if not license:
+        raise PricingError("Selected licence component not configured")
+
+    licenseCost = license.costing
+    if licenseCost is None:
+        raise PricingError("Licence price not configured")
+
+    # ---------- TOTAL ----------
+    total_cost = cpu_cost + gpu_cost + ai_cost + storage_cost + licenseCost
+
+    return {
+        "cpu": cpu,
+        "gpu": gpu,
+
+        "cpu_cost": cpu_cost,
+        "gpu_cost": gpu_cost,
+        "ai_cost": ai_cost,
+        "storage_cost": storage_cost,
+
+        "DurationU": duration_id,
+        "licenceCostU": licenseCost,
+
+        "include_cpu": include_cpu,
+        "include_gpu": include_gpu,
+        "include_storage": include_storage,
+
+        "total_costing": total_cost,
+    }
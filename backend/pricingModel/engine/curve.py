@@ -0,0 +1,173 @@
+"""
+Vectorised price curve over a range of camera counts.
+
+Reproduces calculate_requirements() and calculate_costs() for every camera
+count at once with NumPy: the int(... * 1.10) truncations, the
+camera_for_intel switch between cores_required1 and cores_required2, the
+* 19 storage factor and the minimum-fit CPU/GPU selection.
+"""
+import numpy as np
+
+from pricingModel.engine.exceptions import PricingError
+
+
+def _truncate(values):
+    # int() on the positive floats used in the pricing math
+    return values.astype(np.int64)
+
+
+def price_curve(catalog, cameras, scenario):
+    cameras = np.asarray(cameras, dtype=np.int64)
+
+    configDetail = catalog.config
+    if not configDetail:
+        raise PricingError("Hardware configuration not set")
+
+    license_component = catalog.licences.get(scenario.get("DurationU"))
+    if not license_component:
+        raise PricingError("Invalid licence selection")
+    if license_component.costing is None:
+        raise PricingError("Licence price not configured")
+
+    storage = catalog.storage
+    if not storage:
+        raise PricingError("Storage component not configured")
+    if storage.costing is None:
+        raise PricingError("Storage pricing not configured")
+
+    ai_feature_ids = sorted(set(scenario.get("ai_features", [])))
+    ai_cost = 0
+    for ai_id in ai_feature_ids:
+        ai = catalog.ai_features.get(ai_id)
+        if not ai:
+            raise PricingError(f"Invalid AI feature: {ai_id}")
+        if ai.costing is None:
+            raise PricingError(f"Price not configured for AI feature: {ai.AI_feature}")
+        ai_cost += ai.costing
+
+    include_cpu = scenario.get("include_cpu", True)
+    include_gpu = scenario.get("include_gpu", True)
+    include_storage = scenario.get("include_storage", True)
+    storage_days = scenario.get("storage_days", 1)
+
+    # ---------- REQUIREMENTS ----------
+    aiEnabledCam = scenario.get("aiEnabledCam")
+    if not ai_feature_ids:
+        ai_load_cams = np.zeros_like(cameras)
+    elif aiEnabledCam:
+        ai_load_cams = np.full_like(cameras, int(aiEnabledCam))
+    else:
+        ai_load_cams = cameras
+
+    vram_required = _truncate(_truncate(configDetail.VRAM_required * ai_load_cams) * 1.10 + 3)
+
+    camera_for_intel = int((20*0.8)/configDetail.cores_required1)
+    cores_factor = np.where(
+        cameras < camera_for_intel,
+        configDetail.cores_required1,
+        configDetail.cores_required2,
+    )
+    cpuCores_required = _truncate(_truncate(cores_factor * cameras) * 1.10)
+
+    ram_required = _truncate(_truncate(configDetail.ram_required1 * cameras) * 1.10)
+
+    storage_used_user = cameras * storage_days * 19
+
+    # ---------- HARDWARE ----------
+    priced = np.ones(cameras.shape, dtype=bool)
+    errors = np.full(cameras.shape, None, dtype=object)
+
+    def fail(mask, message):
+        # Like the scalar path, the first failing check wins
+        mask = mask & priced
+        errors[mask] = message
+        priced[mask] = False
+
+    def attributes(items, name):
+        return np.array([getattr(item, name) for item in items], dtype=np.int64)
+
+    def costings(items):
+        return np.array(
+            [np.nan if item.costing is None else item.costing for item in items],
+            dtype=np.float64,
+        )
+
+    cpu_ids = np.zeros(cameras.shape, dtype=np.int64)
+    cpu_cost = np.zeros(cameras.shape, dtype=np.float64)
+
+    if include_cpu:
+        # cpus are ordered by (ram_required, id): the first fit is the ORM's pick
+        cpus = catalog.hardware.cpus
+
+        first = catalog.hardware.select_cpu_indices(cpuCores_required, ram_required)
+        found = first >= 0
+        first = np.maximum(first, 0)
+
+        fail(~found, "No CPU meets required core count")
+
+        if cpus:
+            cpu_ids = np.where(found, attributes(cpus, "id")[first], 0)
+            cpu_cost = np.where(found, costings(cpus)[first], 0.0)
+
+            unpriced = np.isnan(cpu_cost) & priced
+            for i in np.flatnonzero(unpriced):
+                errors[i] = f"Price not configured for CPU: {cpus[first[i]].core_hardware}"
+            priced &= ~unpriced
+
+    gpu_ids = np.zeros(cameras.shape, dtype=np.int64)
+    gpu_cost = np.zeros(cameras.shape, dtype=np.float64)
+
+    if include_gpu:
+        # gpus are ordered by (VRAM, id); searchsorted is bisect_left
+        gpus = catalog.hardware.gpus
+
+        needs_gpu = vram_required > 0
+        pick = np.searchsorted(attributes(gpus, "VRAM"), vram_required, side="left")
+        found = pick < len(gpus)
+
+        fail(needs_gpu & ~found, "No GPU meets VRAM requirement")
+
+        if gpus:
+            pick = np.minimum(pick, len(gpus) - 1)
+            use_gpu = needs_gpu & found
+            gpu_ids = np.where(use_gpu, attributes(gpus, "id")[pick], 0)
+            gpu_cost = np.where(use_gpu, costings(gpus)[pick], 0.0)
+
+            fail(np.isnan(gpu_cost), "GPU price not configured")
+
+    # ---------- COSTS ----------
+    if include_storage:
+        storage_cost = (storage_used_user / 19) * storage.costing
+    else:
+        storage_cost = np.zeros(cameras.shape, dtype=np.float64)
+
+    total_cost = cpu_cost + gpu_cost + ai_cost + storage_cost + license_component.costing
+
+    def column(values, is_set=None):
+        mask = priced if is_set is None else priced & is_set
+        values = _truncate(np.where(mask, values, 0))
+        return [v if ok else None for v, ok in zip(values.tolist(), mask.tolist())]
+
+    return {
+        "cammera": cameras.tolist(),
+        "aiEnabledCam": ai_load_cams.tolist(),
+        "vram_required": vram_required.tolist(),
+        "cpuCores_required": cpuCores_required.tolist(),
+        "ram_required": ram_required.tolist(),
+        "storage_used_user": storage_used_user.tolist(),
+
+        "cpu": column(cpu_ids, cpu_ids > 0),
+        "gpu": column(gpu_ids, gpu_ids > 0),
+
+        "cpu_cost": column(cpu_cost),
+        "gpu_cost": column(gpu_cost),
+        "ai_cost": ai_cost,
+        "storage_cost": column(storage_cost),
+        "licenceCostU": license_component.costing,
+        "total_costing": column(total_cost),
+
+        "errors": [
+            {"cammera": int(cameras[i]), "error": errors[i]}
+            for i in np.flatnonzero(~priced)
+        ],
+    }
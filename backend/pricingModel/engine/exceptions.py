@@ -0,0 +1,2 @@
+class PricingError(ValueError):
+    """A quote cannot be priced against the catalog (bad input or missing data)."""
@@ -0,0 +1,108 @@
+"""
+Minimum-fit CPU/GPU lookup over the processor catalog.
+
+Matches the ORM selection pricingRecomendationview used to run:
+
+    CPU: CPUcores >= cores, ram_required >= ram, order_by("ram_required")
+    GPU: VRAM >= vram, order_by("VRAM")
+
+CPUs are kept sorted by (ram_required, id) together with a sparse table of
+CPUcores maxima over that order. A bisect on RAM finds the first CPU with
+enough memory, and a binary search over the range maxima finds the first
+one from there with enough cores. GPUs are sorted by (VRAM, id) and need a
+single bisect. Both lookups are O(log n).
+
+select_cpu_indices does the CPU lookup for a whole array of requirements
+at once (the price curve): searchsorted on RAM, then a binary-lifting walk
+over the same sparse table, O(points * log n) without a points x CPUs
+matrix.
+"""
+from bisect import bisect_left
+
+import numpy as np
+
+
+class HardwareIndex:
+
+    def __init__(self, processors):
+        cpus = sorted(
+            (p for p in processors if p.CPUcores is not None and p.ram_required is not None),
+            key=lambda p: (p.ram_required, p.id),
+        )
+        gpus = sorted(
+            (p for p in processors if p.VRAM is not None),
+            key=lambda p: (p.VRAM, p.id),
+        )
+
+        self.cpus = tuple(cpus)
+        self.gpus = tuple(gpus)
+
+        self._cpu_ram = [p.ram_required for p in cpus]
+        self._cpu_cores_max = self._sparse_table([p.CPUcores for p in cpus])
+        self._cpu_cores_max_arrays = [np.array(row, dtype=np.int64) for row in self._cpu_cores_max]
+        self._gpu_vram = [p.VRAM for p in gpus]
+
+    @staticmethod
+    def _sparse_table(values):
+        # table[k][i] = max(values[i : i + 2**k])
+        table = [list(values)]
+        span = 1
+        while 2 * span <= len(values):
+            prev = table[-1]
+            table.append([
+                max(prev[i], prev[i + span])
+                for i in range(len(values) - 2 * span + 1)
+            ])
+            span *= 2
+        return table
+
+    def _max_cores(self, lo, hi):
+        # max CPUcores over cpus[lo..hi], inclusive
+        level = (hi - lo + 1).bit_length() - 1
+        row = self._cpu_cores_max[level]
+        return max(row[lo], row[hi - (1 << level) + 1])
+
+    def select_cpu(self, cores_required, ram_required):
+        start = bisect_left(self._cpu_ram, ram_required)
+        last = len(self.cpus) - 1
+
+        if start > last or self._max_cores(start, last) < cores_required:
+            return None
+
+        lo, hi = start, last
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._max_cores(start, mid) >= cores_required:
+                hi = mid
+            else:
+                lo = mid + 1
+
+        return self.cpus[lo]
+
+    def select_cpu_indices(self, cores_required, ram_required):
+        """
+        select_cpu over arrays of requirements: the index into self.cpus of
+        each pick, or -1 where no CPU fits.
+        """
+        cores_required = np.asarray(cores_required, dtype=np.int64)
+        count = len(self.cpus)
+        if not count:
+            return np.full(cores_required.shape, -1, dtype=np.int64)
+
+        position = np.searchsorted(self._cpu_ram, ram_required, side="left")
+
+        # From the first CPU with enough RAM, skip every block whose best
+        # core count falls short, largest blocks first; what is left is
+        # the first CPU with enough cores
+        for level in reversed(range(len(self._cpu_cores_max_arrays))):
+            span = 1 << level
+            row = self._cpu_cores_max_arrays[level]
+            inside = position + span <= count
+            short = row[np.where(inside, position, 0)] < cores_required
+            position = position + np.where(inside & short, span, 0)
+
+        return np.where(position < count, position, -1)
+
+    def select_gpu(self, vram_required):
+        i = bisect_left(self._gpu_vram, vram_required)
+        return self.gpus[i] if i < len(self.gpus) else None
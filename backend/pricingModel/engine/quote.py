@@ -0,0 +1,73 @@
+"""
+A whole quote from one scenario: requirements followed by costs.
+"""
+from pricingModel.engine.costs import calculate_costs
+from pricingModel.engine.exceptions import PricingError
+from pricingModel.engine.requirements import calculate_requirements
+
+
+def price_scenario(catalog, scenario):
+    """
+    Requirements and costs for one scenario, as pricingCalculate followed
+    by pricingRecomendationview would store them.
+    """
+    # A quotation's ai_features is a set (M2M); duplicates are not charged twice
+    ai_feature_ids = sorted(set(scenario.get("ai_features", [])))
+
+    for ai_id in ai_feature_ids:
+        if ai_id not in catalog.ai_features:
+            raise PricingError(f"Invalid AI feature: {ai_id}")
+
+    requirements = calculate_requirements(
+        catalog,
+        cameras=scenario.get("cammera"),
+        storage_days=scenario.get("storage_days", 1),
+        ai_features=ai_feature_ids,
+        aiEnabledCam=scenario.get("aiEnabledCam"),
+        duration_id=scenario.get("DurationU"),
+    )
+
+    costs = calculate_costs(
+        catalog,
+        cpuCores_required=requirements["cpuCores_required"],
+        ram_required=requirements["ram_required"],
+        vram_required=requirements["vram_required"],
+        storage_used_user=requirements["storage_used_user"],
+        ai_feature_ids=ai_feature_ids,
+        duration_id=requirements["DurationU"],
+        include_cpu=scenario.get("include_cpu", True),
+        include_gpu=scenario.get("include_gpu", True),
+        include_storage=scenario.get("include_storage", True),
+    )
+
+    return {
+        "cammera": scenario.get("cammera"),
+        "ai_features": ai_feature_ids,
+        **requirements,
+        **costs,
+    }
+
+
+def quote_to_representation(quote):
+    """JSON-ready breakdown; costs are truncated like the integer columns."""
+    cpu = quote["cpu"]
+    gpu = quote["gpu"]
+
+    return {
+        **quote,
+        "cpu": {
+            "id": cpu.id,
+            "core_hardware": cpu.core_hardware,
+            "CPUcores": cpu.CPUcores,
+            "ram_required": cpu.ram_required,
+            "costing": cpu.costing,
+        } if cpu else None,
+        "gpu": {
+            "id": gpu.id,
+            "AI_Component": gpu.AI_Component,
+            "VRAM": gpu.VRAM,
+            "costing": gpu.costing,
+        } if gpu else None,
+        "storage_cost": int(quote["storage_cost"]),
+        "total_costing": int(quote["total_costing"]),
+    }
@@ -0,0 +1,94 @@
+"""
+Hardware and storage requirements of a quote: the math pricingCalculate
+stores on a new quotation.
+"""
+from pricingModel.engine.exceptions import PricingError
+
+
+def calculate_requirements(
+    catalog,
+    cameras,
+    storage_days=1,
+    ai_features=(),
+    aiEnabledCam=None,
+    duration_id=None,
+):
+    configDetail = catalog.config
+    if not configDetail:
+        raise PricingError("Hardware configuration not set")
+
+    ram_required1 = configDetail.ram_required1
+    vram_required1 = configDetail.VRAM_required
+    cores_required1 = configDetail.cores_required1
+    cores_required2 = configDetail.cores_required2
+    camera_for_intel = int((20*0.8)/cores_required1)
+
+    if not cameras:
+        raise PricingError("Camera count is required")
+
+    if not duration_id:
+        raise PricingError("Licence duration is required")
+
+    # ---------- VALIDATE LICENCE ----------
+    license_component = catalog.licences.get(duration_id)
+
+    if not license_component:
+        raise PricingError("Invalid licence selection")
+
+    licence_cost = license_component.costing
+    if licence_cost is None:
+        raise PricingError("Licence price not configured")
+
+    # ---------- STORAGE ----------
+    storage = catalog.storage
+
+    if not storage:
+        raise PricingError("Storage component not configured")
+
+    if storage.costing is None:
+        raise PricingError("Storage pricing not configured")
+
+    # ---------- AI ENABLED CAMERAS ----------
+    if aiEnabledCam:
+        ai_enabled_cams = aiEnabledCam
+    else:
+        ai_enabled_cams = cameras
+
+    ai_enabled_cams = int(ai_enabled_cams)
+
+    # If no AI features → disable AI load
+    if ai_features:
+        ai_load_cams = ai_enabled_cams
+    else:
+        ai_load_cams = 0
+
+    # ---------- REQUIREMENTS ----------
+    vram_calculation = int(vram_required1 * ai_load_cams)
+    vram_required = int(vram_calculation * 1.10 + 3)
+
+    if cameras < camera_for_intel:
+        cpuCores_calculation = int(cores_required1 * cameras)
+    else:
+        cpuCores_calculation = int(cores_required2 * cameras)
+
+    cpuCores_required = int(cpuCores_calculation * 1.10)
+
+    ram_calculation = int(ram_required1 * cameras)
+    ram_required = int(ram_calculation * 1.10)
+
+    # ---------- STORAGE CALCULATION ----------
+    storage_used = cameras * storage_days
+    storage_used_user = storage_used * 19
+
+    return {
+        "aiEnabledCam": ai_load_cams,
+        "storage_days": storage_days,
+        "storage_used_user": storage_used_user,
+
+        "vram_required": vram_required,
+        "cpuCores_required": cpuCores_required,
+        "ram_required": ram_required,
+
+        "DurationU": license_component.id,
+        "licenceCostU": licence_cost,
+    }
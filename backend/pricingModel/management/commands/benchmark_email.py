@@ -0,0 +1,106 @@
+import os
+import socket
+import time
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management.base import BaseCommand, CommandError
+
+from pricingModel.api.mail import PersistentMailConnection
+
+SMTP_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def sample_messages(count):
+    html = "<p>" + "Quotation line item. " * 150 + "</p>"
+    pdf = os.urandom(3 * 1024)
+
+    messages = []
+    for i in range(count):
+        message = EmailMultiAlternatives(
+            subject=f"Quotation #{i} - Sentinel Pricing",
+            body="Please find attached enterprise quotation.",
+            from_email="pricing@example.com",
+            to=[f"customer{i}@example.com"],
+        )
+        message.attach_alternative(html, "text/html")
+        message.attach(f"quotation_{i}.pdf", pdf, "application/pdf")
+        messages.append(message)
+    return messages
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark quotation emails/s for one worker: a new SMTP connection "
+        "per email against one persistent connection. Without --host a local "
+        "aiosmtpd sink is started."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--emails", type=int, default=200)
+        parser.add_argument("--host", help="SMTP server to send to instead of a local sink")
+        parser.add_argument("--port", type=int, default=25)
+        parser.add_argument("--tls", action="store_true", help="STARTTLS to --host")
+
+    def handle(self, *args, **options):
+        controller = None
+
+        if options["host"]:
+            connection_kwargs = {
+                "backend": SMTP_BACKEND,
+                "host": options["host"],
+                "port": options["port"],
+                "use_tls": options["tls"],
+            }
+        else:
+            try:
+                from aiosmtpd.controller import Controller
+                from aiosmtpd.handlers import Sink
+            except ImportError:
+                raise CommandError("aiosmtpd is needed for the local SMTP sink (pip install aiosmtpd), or pass --host.")
+
+            controller = Controller(Sink(), hostname="127.0.0.1", port=free_port())
+            controller.start()
+            connection_kwargs = {
+                "backend": SMTP_BACKEND,
+                "host": controller.hostname,
+                "port": controller.port,
+                "use_tls": False,
+                "username": "",
+                "password": "",
+            }
+
+        try:
+            self.run(options["emails"], connection_kwargs)
+        finally:
+            if controller is not None:
+                controller.stop()
+
+    def run(self, count, connection_kwargs):
+        messages = sample_messages(count)
+        self.stdout.write(f"emails:           {count} to {connection_kwargs['host']}:{connection_kwargs['port']}")
+
+        # ---------- CONNECTION PER EMAIL ----------
+        started = time.perf_counter()
+        for message in messages:
+            get_connection(fail_silently=False, **connection_kwargs).send_messages([message])
+        fresh = count / (time.perf_counter() - started)
+
+        # ---------- PERSISTENT CONNECTION ----------
+        connection = PersistentMailConnection(**connection_kwargs)
+        started = time.perf_counter()
+        errors = connection.send_many(messages)
+        persistent = count / (time.perf_counter() - started)
+        connection.close()
+
+        failed = sum(error is not None for error in errors)
+        if failed:
+            raise CommandError(f"{failed} emails failed on the persistent connection: {next(filter(None, errors))}")
+
+        self.stdout.write(f"per email:        {fresh:,.0f} emails/s")
+        self.stdout.write(f"persistent:       {persistent:,.0f} emails/s ({persistent / fresh:.2f}x)")
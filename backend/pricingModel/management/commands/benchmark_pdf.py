@@ -0,0 +1,132 @@
+import os
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pricingModel.api.pdf_cache import quotation_pdf_data
+from pricingModel.api.pdf_renderer import PDFRenderer
+from pricingModel.api.utils import QuotationTemplate
+from pricingModel.models import UserPricing
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark bulk quotation PDF rendering: a template built per PDF "
+        "against one shared QuotationTemplate, and renders/s against the "
+        "number of renderer processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pdfs", type=int, default=200)
+        parser.add_argument("--username", default="benchmark")
+        parser.add_argument(
+            "--processes",
+            default=None,
+            help="Comma separated renderer pool sizes to compare (default 0,1,2,4,... up to the core count)",
+        )
+
+    def handle(self, *args, **options):
+        quotations = list(
+            UserPricing.objects
+            .order_by("-created_at")[:50]
+        )
+        if not quotations:
+            raise CommandError("No quotations in the database to render.")
+
+        count = options["pdfs"]
+        payloads = [quotation_pdf_data(q, options["username"]) for q in quotations]
+        batch = [payloads[i % len(payloads)] for i in range(count)]
+
+        self.stdout.write(f"pdfs:            {count} ({len(payloads)} distinct quotations)")
+
+        self.benchmark_template(batch)
+        self.benchmark_processes(batch, options["processes"])
+
+    def benchmark_template(self, batch):
+        count = len(batch)
+
+        # ---------- TEMPLATE BUILD ----------
+        started = time.process_time()
+        for _ in range(count):
+            QuotationTemplate()
+        build_cpu = (time.process_time() - started) / count
+
+        tracemalloc.start()
+        template = QuotationTemplate()
+        build_size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.stdout.write(f"template build:  {build_cpu * 1e6:.0f} us CPU, {build_size / 1024:.1f} KiB")
+
+        # ---------- BULK RENDER ----------
+        arms = {
+            "per pdf": lambda data: QuotationTemplate().render(data),
+            "shared": template.render,
+        }
+
+        # Warm up fonts before timing either arm
+        for render in arms.values():
+            render(batch[0])
+
+        results = {}
+        for name, render in arms.items():
+            started = time.process_time()
+            for data in batch:
+                render(data)
+            cpu = (time.process_time() - started) / count
+
+            peaks = []
+            for data in batch[:20]:
+                tracemalloc.start()
+                render(data)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                peaks.append(peak)
+            peak = sum(peaks) / len(peaks)
+
+            results[name] = (cpu, peak)
+            self.stdout.write(
+                f"{name + ':':<16} {cpu * 1000:.2f} ms CPU/pdf, "
+                f"{peak / 1024:.0f} KiB peak traced/pdf, {1 / cpu:,.0f} pdfs/s"
+            )
+
+        fresh_cpu, fresh_peak = results["per pdf"]
+        shared_cpu, shared_peak = results["shared"]
+        self.stdout.write(
+            f"saved:           {(fresh_cpu - shared_cpu) * 1e6:.0f} us CPU/pdf "
+            f"({(fresh_cpu - shared_cpu) / fresh_cpu:.1%}), "
+            f"{(fresh_peak - shared_peak) / 1024:.1f} KiB peak/pdf"
+        )
+
+    def benchmark_processes(self, batch, processes):
+        if processes:
+            sizes = [int(n) for n in processes.split(",")]
+        else:
+            cores = os.cpu_count() or 1
+            sizes = [0] + [n for n in (1, 2, 4, 8, 16, 32) if n <= cores]
+
+        # ---------- RENDERS/S VS PROCESSES ----------
+        self.stdout.write(f"cores:           {os.cpu_count()}")
+
+        baseline = None
+        for size in sizes:
+            renderer = PDFRenderer(size)
+            # Concurrent requests, as from a threaded web worker
+            clients = max(size, 1) * 2
+
+            with ThreadPoolExecutor(max_workers=clients) as threads:
+                # Start the renderer processes and warm their templates
+                list(threads.map(renderer.render, batch[:clients]))
+
+                started = time.perf_counter()
+                list(threads.map(renderer.render, batch))
+                elapsed = time.perf_counter() - started
+
+            renderer.shutdown()
+
+            rate = len(batch) / elapsed
+            baseline = baseline or rate
+            label = "inline" if size == 0 else f"{size} process{'es' if size > 1 else ''}"
+            self.stdout.write(f"{label + ':':<16} {rate:,.0f} renders/s ({rate / baseline:.2f}x)")
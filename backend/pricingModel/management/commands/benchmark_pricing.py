@@ -0,0 +1,149 @@
+import random
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from pricingModel.api.catalog import get_catalog
+from pricingModel.engine import (
+    AI_CATEGORY,
+    CONFIG_CATEGORY,
+    LICENCE_CATEGORY,
+    PROCESSOR_CATEGORY,
+    STORAGE_CATEGORY,
+    CatalogItem,
+    PricingError,
+    build_catalog,
+    price_curve,
+    price_scenario,
+)
+
+# Median per-quote budget for --check. Recorded baseline on the synthetic
+# catalog: 14 us; the limit leaves room for slow runners while still
+# catching an accidental O(n) scan or per-quote copy of the catalog.
+MEDIAN_LATENCY_US = 250
+
+
+def synthetic_catalog(rng, processors=40, ai_features=10):
+    items = [
+        CatalogItem(id=1, category=CONFIG_CATEGORY, costing=None,
+                    cores_required1=0.5, cores_required2=0.3,
+                    ram_required1=0.5, VRAM_required=0.4),
+        CatalogItem(id=2, category=LICENCE_CATEGORY, costing=1000, Duration=1),
+        CatalogItem(id=3, category=STORAGE_CATEGORY, costing=7, storage_perDay=19),
+    ]
+
+    next_id = 4
+    for i in range(processors):
+        if i % 2:
+            items.append(CatalogItem(
+                id=next_id, category=PROCESSOR_CATEGORY, costing=rng.randint(5, 500) * 1000,
+                core_hardware=f"CPU {i}", CPUcores=rng.randint(4, 256), ram_required=rng.randint(8, 1024),
+            ))
+        else:
+            items.append(CatalogItem(
+                id=next_id, category=PROCESSOR_CATEGORY, costing=rng.randint(20, 900) * 1000,
+                AI_Component=f"GPU {i}", VRAM=rng.randint(4, 640),
+            ))
+        next_id += 1
+
+    for i in range(ai_features):
+        items.append(CatalogItem(
+            id=next_id, category=AI_CATEGORY, costing=rng.randint(1, 50) * 100, AI_feature=f"Feature {i}",
+        ))
+        next_id += 1
+
+    return build_catalog(0, items)
+
+
+def random_scenarios(rng, catalog, count):
+    ai_ids = list(catalog.ai_features)
+    licences = list(catalog.licences)
+
+    return [
+        {
+            "cammera": rng.randint(1, 500),
+            "aiEnabledCam": rng.choice([None, rng.randint(1, 50)]),
+            "ai_features": rng.sample(ai_ids, rng.randint(0, min(3, len(ai_ids)))),
+            "storage_days": rng.randint(1, 90),
+            "DurationU": rng.choice(licences),
+            "include_cpu": True,
+            "include_gpu": True,
+            "include_storage": True,
+        }
+        for _ in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-quote latency and allocations of the pricing engine."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--quotes", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--db",
+            action="store_true",
+            help="Use the catalog from the database instead of a synthetic one",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help=f"Fail when the median quote takes longer than {MEDIAN_LATENCY_US} us",
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        catalog = get_catalog() if options["db"] else synthetic_catalog(rng)
+        scenarios = random_scenarios(rng, catalog, options["quotes"])
+
+        def quote(scenario):
+            try:
+                return price_scenario(catalog, scenario)
+            except PricingError:
+                return None
+
+        # ---------- LATENCY ----------
+        timings = []
+        for scenario in scenarios:
+            started = time.perf_counter_ns()
+            quote(scenario)
+            timings.append(time.perf_counter_ns() - started)
+
+        timings.sort()
+
+        def percentile(p):
+            return timings[min(len(timings) - 1, int(len(timings) * p))] / 1000
+
+        self.stdout.write(f"quotes:        {len(timings)}")
+        self.stdout.write(f"mean:          {statistics.fmean(timings) / 1000:.2f} us/quote")
+        self.stdout.write(f"p50/p95/p99:   {percentile(0.50):.2f} / {percentile(0.95):.2f} / {percentile(0.99):.2f} us")
+        self.stdout.write(f"throughput:    {1e9 * len(timings) / sum(timings):,.0f} quotes/s")
+
+        # ---------- ALLOCATIONS ----------
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        results = [quote(scenario) for scenario in scenarios]
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stats = after.compare_to(before, "filename")
+        blocks = sum(max(stat.count_diff, 0) for stat in stats)
+        size = sum(max(stat.size_diff, 0) for stat in stats)
+
+        self.stdout.write(f"retained:      {size / len(results):.0f} B/quote in {blocks / len(results):.1f} blocks/quote")
+        self.stdout.write(f"peak traced:   {peak / 1024:.0f} KiB for {len(results)} quotes")
+
+        # ---------- PRICE CURVE ----------
+        cameras = np.arange(1, 501)
+        started = time.perf_counter()
+        price_curve(catalog, cameras, scenarios[0])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"price curve:   {len(cameras)} points in {elapsed * 1000:.2f} ms")
+
+        if options["check"] and percentile(0.50) > MEDIAN_LATENCY_US:
+            raise CommandError(f"Median quote took {percentile(0.50):.2f} us, over the {MEDIAN_LATENCY_US} us budget")
@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+
+from django.db import migrations, models
+
+INDEX = models.Index(fields=["created_at"], name="auditlog_created_at_idx")
+
+# Partitions created up front, from the month of the oldest row; after
+# that the daily maintenance task (pricingModel/api/audit_archive.py)
+# keeps them ahead
+MONTHS_AHEAD = 3
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_audit_log(apps, schema_editor):
+    """
+    Rebuild the audit table as a Postgres table partitioned by month of
+    created_at and copy the existing rows over. A partitioned table's
+    primary key must include the partition key, so it becomes
+    (id, created_at); ids still come from one sequence and stay unique.
+
+    Other databases only get the created_at index.
+    """
+    AuditLog = apps.get_model("pricingModel", "AuditLog")
+
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.add_index(AuditLog, INDEX)
+        return
+
+    quote = schema_editor.quote_name
+    table = AuditLog._meta.db_table
+    user_table = AuditLog._meta.get_field("user").related_model._meta.db_table
+    new_table = f"{table}_new"
+    sequence = f"{new_table}_id_seq"
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"SELECT min(created_at) FROM {quote(table)}")
+        oldest = cursor.fetchone()[0] or datetime.now(timezone.utc)
+
+    schema_editor.execute(f"CREATE SEQUENCE {quote(sequence)}")
+    schema_editor.execute(f"""
+        CREATE TABLE {quote(new_table)} (
+            "id" bigint NOT NULL DEFAULT nextval('{quote(sequence)}'),
+            "action" varchar(50) NOT NULL,
+            "details" text NULL,
+            "ip_address" inet NULL,
+            "user_agent" text NULL,
+            "created_at" timestamp with time zone NOT NULL,
+            "user_id" integer NULL,
+            CONSTRAINT {quote(f"{new_table}_pkey")} PRIMARY KEY ("id", "created_at"),
+            CONSTRAINT {quote(f"{table}_user_id_fk")} FOREIGN KEY ("user_id")
+                REFERENCES {quote(user_table)} ("id") DEFERRABLE INITIALLY DEFERRED
+        ) PARTITION BY RANGE ("created_at")
+    """)
+    schema_editor.execute(f'ALTER SEQUENCE {quote(sequence)} OWNED BY {quote(new_table)}."id"')
+    schema_editor.execute(f'CREATE INDEX {quote(INDEX.name)} ON {quote(new_table)} ("created_at")')
+    schema_editor.execute(f'CREATE INDEX {quote(f"{table}_user_id_idx")} ON {quote(new_table)} ("user_id")')
+
+    month = datetime(oldest.year, oldest.month, 1, tzinfo=timezone.utc)
+    last = _add_months(datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0), MONTHS_AHEAD)
+    while month <= last:
+        schema_editor.execute(
+            f"CREATE TABLE {quote(f'{table}_p{month:%Y_%m}')} PARTITION OF {quote(new_table)} "
+            f"FOR VALUES FROM (%s) TO (%s)",
+            [month, _add_months(month, 1)],
+        )
+        month = _add_months(month, 1)
+
+    columns = '"id", "action", "details", "ip_address", "user_agent", "created_at", "user_id"'
+    schema_editor.execute(f"INSERT INTO {quote(new_table)} ({columns}) SELECT {columns} FROM {quote(table)}")
+    schema_editor.execute(
+        f"SELECT setval('{quote(sequence)}', COALESCE(max(\"id\"), 0) + 1, false) FROM {quote(new_table)}"
+    )
+
+    schema_editor.execute(f"DROP TABLE {quote(table)}")
+    schema_editor.execute(f"ALTER TABLE {quote(new_table)} RENAME TO {quote(table)}")
+    schema_editor.execute(f"ALTER SEQUENCE {quote(sequence)} RENAME TO {quote(f'{table}_id_seq')}")
+    schema_editor.execute(
+        f"ALTER TABLE {quote(table)} RENAME CONSTRAINT {quote(f'{new_table}_pkey')} TO {quote(f'{table}_pkey')}"
+    )
+
+
+def unpartition_audit_log(apps, schema_editor):
+    # A partitioned table serves the earlier schema just as well; only the
+    # index added on other databases is removed
+    AuditLog = apps.get_model("pricingModel", "AuditLog")
+
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.remove_index(AuditLog, INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricingModel', '0003_auditlog_created_at_default'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name='auditlog', index=INDEX),
+            ],
+            database_operations=[
+                migrations.RunPython(partition_audit_log, unpartition_audit_log),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricingModel', '0004_auditlog_partitioning'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='auditlog_created_at_idx',
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['created_at', 'id'], name='auditlog_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userpricing',
+            index=models.Index(fields=['created_at', 'id'], name='userpricing_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userpricing',
+            index=models.Index(fields=['user_name', 'created_at', 'id'], name='userpricing_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:28
+
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+# Same expression as audit_search_vector() in pricingModel/api/audit_search.py,
+# so full-text queries can use the index
+SEARCH_INDEX = GinIndex(
+    SearchVector("details", "user_agent", config="english"),
+    name="auditlog_search_idx",
+)
+
+# See AUDIT_SEARCH_STATISTICS in pricingModel/api/audit_archive.py
+SEARCH_STATISTICS = 1000
+
+
+def add_search_index(apps, schema_editor):
+    # tsvector and GIN are Postgres only; elsewhere search scans instead
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.add_index(apps.get_model("pricingModel", "AuditLog"), SEARCH_INDEX)
+
+    quote = schema_editor.quote_name
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = to_regclass(%s)",
+            [quote(SEARCH_INDEX.name)],
+        )
+        indexes = [quote(SEARCH_INDEX.name)] + [name for name, in cursor.fetchall()]
+
+    for index in indexes:
+        schema_editor.execute(f"ALTER INDEX {index} ALTER COLUMN 1 SET STATISTICS {SEARCH_STATISTICS}")
+
+
+def remove_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.remove_index(apps.get_model("pricingModel", "AuditLog"), SEARCH_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricingModel', '0005_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['action', 'created_at', 'id'], name='auditlog_action_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='auditlog_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['ip_address', 'created_at', 'id'], name='auditlog_ip_created_idx'),
+        ),
+        migrations.RunPython(add_search_index, remove_search_index),
+    ]
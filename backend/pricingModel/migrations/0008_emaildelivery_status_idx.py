@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricingModel', '0007_catalogversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emaildelivery',
+            index=models.Index(fields=['status', 'updated_at'], name='emaildelivery_status_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+def add_default_partition(apps, schema_editor):
+    """
+    Give the partitioned audit table a DEFAULT partition, so a row for a
+    month whose partition does not exist yet (the maintenance task has
+    not run for a while) is stored instead of failing the insert.
+    ensure_audit_partitions moves such rows into their month once it
+    creates it.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    AuditLog = apps.get_model("pricingModel", "AuditLog")
+    quote = schema_editor.quote_name
+    table = AuditLog._meta.db_table
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [quote(table)],
+        )
+        if cursor.fetchone() is None:
+            return
+
+    schema_editor.execute(
+        f"CREATE TABLE IF NOT EXISTS {quote(f'{table}_default')} PARTITION OF {quote(table)} DEFAULT"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricingModel', '0008_emaildelivery_status_idx'),
+    ]
+
+    operations = [
+        # Kept on the way back: the earlier schema works the same with it,
+        # and dropping it would drop whatever rows it holds
+        migrations.RunPython(add_default_partition, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
    
 class Category(models.Model):
@@ -171,6 +172,13 @@ class UserPricing(models.Model):
     include_storage = models.BooleanField(default=True)
     # include_ai = models.BooleanField(default=True)
 
+    class Meta:
+        # Keyset pagination keys (pricingModel/api/pagination.py)
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="userpricing_created_id_idx"),
+            models.Index(fields=["user_name", "created_at", "id"], name="userpricing_user_created_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user_name.username} - ₹{self.total_costing}"
 
@@ -194,15 +202,78 @@ class AuditLog(models.Model):
         ip_address = models.GenericIPAddressField(null=True, blank=True)
         user_agent = models.TextField(null=True, blank=True)
 
-        created_at = models.DateTimeField(auto_now_add=True)
+        # When the action happened, not when the buffered writer stored it
+        created_at = models.DateTimeField(default=timezone.now, editable=False)
 
         class Meta:
             ordering = ["-created_at"]
+            # On Postgres the table is also partitioned by month of
+            # created_at (migration 0004, pricingModel/api/audit_archive.py)
+            # plus, on Postgres, a GIN index for full-text search over
+            # details and user_agent (pricingModel/api/audit_search.py)
+            indexes = [
+                models.Index(fields=["created_at", "id"], name="auditlog_created_id_idx"),
+                models.Index(fields=["action", "created_at", "id"], name="auditlog_action_created_idx"),
+                models.Index(fields=["user", "created_at", "id"], name="auditlog_user_created_idx"),
+                models.Index(fields=["ip_address", "created_at", "id"], name="auditlog_ip_created_idx"),
+            ]
 
         def __str__(self):
             return f"{self.user_name} -{self.total_costing}"
 
 
+class EmailDelivery(models.Model):
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("sending", "Sending"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    ]
+
+    quotation = models.ForeignKey(
+        UserPricing,
+        on_delete=models.CASCADE,
+        related_name="email_deliveries"
+    )
+    requested_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
+
+    recipient = models.EmailField()
+    username = models.CharField(max_length=150)
+    attach_pdf = models.BooleanField(default=True)
+
+    # Hash of everything the email renders; with the quotation and
+    # recipient it makes up the idempotency key
+    content_hash = models.CharField(max_length=64)
+    idempotency_key = models.CharField(max_length=64, unique=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="queued")
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        # Stale queued/sending rows for the reaper (pricingModel/api/mail.py)
+        indexes = [
+            models.Index(fields=["status", "updated_at"], name="emaildelivery_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"Quotation {self.quotation_id} -> {self.recipient} ({self.status})"
+
+
+class CatalogVersion(models.Model):
+    # Shared catalog version when there is no shared cache
+    # (CATALOG_VERSION_STORE = "database", pricingModel/api/catalog.py)
+    version = models.BigIntegerField()
+
+    def __str__(self):
+        return f"Catalog version {self.version}"
+
+
 # class AuditLog(models.Model):
 #         ACTION_CHOICES = [
 #             ("LOGIN", "Login"),
@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from pricingModel.api.catalog import bump_catalog_version
+from pricingModel.models import Category, Component, Price
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Component)
+@receiver(post_delete, sender=Component)
+@receiver(post_save, sender=Price)
+@receiver(post_delete, sender=Price)
+def invalidate_catalog(sender, **kwargs):
+    # Admin writes to the catalog make every worker's snapshot stale
+    transaction.on_commit(bump_catalog_version)
@@ -1,3 +1,881 @@
-from django.test import TestCase
+import random
+import smtplib
+import socket
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import EmailMessage
+from django.db import OperationalError, connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from reportlab import rl_config
+from rest_framework.test import APIClient
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:
+    Controller = None
+
+from pricingModel.api import catalog
+from pricingModel.api import mail
+from pricingModel.api import audit_archive
+from pricingModel.api.audit import AuditBuffer, get_client_ip
+from pricingModel.api.mail import PersistentMailConnection
+from pricingModel.api.pagination import CreatedAtPagination
+from pricingModel.api.pdf_cache import FileSystemPDFStore, quotation_pdf_data
+from pricingModel.api.quote_cache import quote_cache_stats
+from pricingModel.api.utils import QuotationTemplate, get_quotation_template
+from pricingModel.engine import (
+    AI_CATEGORY,
+    CONFIG_CATEGORY,
+    LICENCE_CATEGORY,
+    PROCESSOR_CATEGORY,
+    STORAGE_CATEGORY,
+    CatalogItem,
+    HardwareIndex,
+    PricingError,
+    build_catalog,
+    calculate_costs,
+    calculate_requirements,
+    price_curve,
+    price_scenario,
+)
+from pricingModel.management.commands.benchmark_pricing import random_scenarios, synthetic_catalog
+from pricingModel.models import AuditLog, CatalogVersion, Category, Component, EmailDelivery, Price, UserPricing
+
+
+def create_component(category, costing=None, **fields):
+    component = Component.objects.create(category=category, **fields)
+    if costing is not None:
+        Price.objects.create(component=component, costing=costing)
+    return component
+
+
+class PricingCatalogMixin:
+    """A small but complete pricing catalog and a signed in staff user."""
+
+    def setUp(self):
+        super().setUp()
+        categories = {
+            name: Category.objects.create(name=name)
+            for name in ["CPU_GPU_Config", "licence", "Storage", "Processor", "AI"]
+        }
+
+        create_component(
+            categories["CPU_GPU_Config"],
+            cores_required1=0.5, cores_required2=0.3, ram_required1=0.5, VRAM_required=0.4,
+        )
+        self.licence = create_component(categories["licence"], 1000, Duration=1)
+        create_component(categories["Storage"], 7, storage_per_cam=1, storage_perDay=19)
+
+        for i, (cores, ram) in enumerate([(8, 16), (16, 32), (32, 64), (64, 128)]):
+            create_component(categories["Processor"], 10000 * (i + 1), core_hardware=f"cpu{i}", CPUcores=cores, ram_required=ram)
+        for i, vram in enumerate([8, 16, 24, 48]):
+            create_component(categories["Processor"], 20000 * (i + 1), AI_Component=f"gpu{i}", VRAM=vram)
+
+        self.ai_features = [
+            create_component(categories["AI"], 500 * (i + 1), AI_feature=f"feature{i}")
+            for i in range(3)
+        ]
+
+        self.user = User.objects.create_user("staff", "staff@example.com", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_quotations(self, count):
+        """count quotations for self.user, each with every AI feature."""
+        cpu = Component.objects.filter(core_hardware__isnull=False).first()
+        gpu = Component.objects.filter(AI_Component__isnull=False).first()
+
+        quotations = UserPricing.objects.bulk_create([
+            UserPricing(user_name=self.user, cammera=i + 1, cpu=cpu, gpu=gpu, DurationU=self.licence.id, licenceCostU=1000)
+            for i in range(count)
+        ])
+        Through = UserPricing.ai_features.through
+        Through.objects.bulk_create([
+            Through(userpricing_id=quotation.id, component_id=feature.id)
+            for quotation in quotations
+            for feature in self.ai_features
+        ])
+        return quotations
+
+
+@override_settings(CATALOG_VERSION_STORE="database")
+class DatabaseCatalogVersionTests(TestCase):
+
+    def setUp(self):
+        self.licence = create_component(Category.objects.create(name="licence"), 1000, Duration=1)
+
+    def test_bump_is_shared_through_the_database(self):
+        version = catalog.get_catalog_version()
+
+        self.assertEqual(catalog.bump_catalog_version(), version + 1)
+        self.assertEqual(CatalogVersion.objects.get().version, version + 1)
+
+    def test_price_change_reloads_the_snapshot(self):
+        self.assertEqual(catalog.get_catalog().licences[self.licence.id].costing, 1000)
+
+        # A write made by another worker: only the shared version moves
+        Price.objects.filter(component=self.licence).update(costing=1500)
+        CatalogVersion.objects.update(version=catalog.get_catalog_version() + 1)
+
+        self.assertEqual(catalog.get_catalog().licences[self.licence.id].costing, 1500)
+
+
+class HardwareIndexParityTests(TestCase):
+    """HardwareIndex picks the component the ORM queries it replaced did."""
+
+    def orm_cpu(self, cores, ram):
+        return (
+            Component.objects
+            .filter(category__name="Processor", CPUcores__gte=cores, ram_required__gte=ram)
+            .order_by("ram_required", "id")
+            .first()
+        )
+
+    def orm_gpu(self, vram):
+        return (
+            Component.objects
+            .filter(category__name="Processor", VRAM__gte=vram)
+            .order_by("VRAM", "id")
+            .first()
+        )
+
+    def test_randomized_catalogs(self):
+        rng = random.Random(4)
+        processor = Category.objects.create(name="Processor")
+
+        for _ in range(20):
+            Component.objects.filter(category=processor).delete()
+            for _ in range(rng.randint(0, 30)):
+                if rng.random() < 0.5:
+                    # Small value ranges so ties on RAM and VRAM are common
+                    create_component(processor, 1, CPUcores=rng.randint(1, 16), ram_required=rng.randint(1, 12))
+                else:
+                    create_component(processor, 1, VRAM=rng.randint(1, 12))
+
+            index = catalog.load_catalog(0).hardware
+
+            for _ in range(50):
+                cores, ram, vram = rng.randint(0, 18), rng.randint(0, 14), rng.randint(0, 14)
+
+                cpu = index.select_cpu(cores, ram)
+                gpu = index.select_gpu(vram)
+                expected_cpu = self.orm_cpu(cores, ram)
+                expected_gpu = self.orm_gpu(vram)
+
+                self.assertEqual(cpu and cpu.id, expected_cpu and expected_cpu.id, (cores, ram))
+                self.assertEqual(gpu and gpu.id, expected_gpu and expected_gpu.id, vram)
+
+
+# Audit events are written inline, inside each test's transaction
+@override_settings(AUDIT_BUFFERED=False)
+class QuotationQuoteCacheTests(PricingCatalogMixin, TestCase):
+
+    def test_create_and_finalize_go_through_the_quote_cache(self):
+        scenario = {
+            "cammera": 40,
+            "aiEnabledCam": 20,
+            "storage_days": 7,
+            "ai_features": [self.ai_features[0].id, self.ai_features[2].id],
+            "DurationU": self.licence.id,
+        }
+
+        response = self.client.post("/pricing-Model/Pricingcalculation/", scenario, format="json")
+        self.assertEqual(response.status_code, 201)
+        created = quote_cache_stats()
+
+        pk = response.json()["id"]
+        response = self.client.patch(f"/pricing-Model/Pricingcalculation/{pk}/", {"DurationU": self.licence.id}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+        # Same scenario as the POST: finalizing is a cache hit
+        self.assertEqual(quote_cache_stats()["hits"], created["hits"] + 1)
+
+        expected = self.client.post("/pricing-Model/Pricingcalculation/preview/", scenario, format="json").json()
+        quotation = UserPricing.objects.get(pk=pk)
+        self.assertEqual(quotation.total_costing, expected["total_costing"])
+        self.assertEqual(quotation.cpu_id, expected["cpu"]["id"])
+        self.assertEqual(quotation.gpu_id, expected["gpu"]["id"])
+
+    def test_create_stores_requirements_when_no_hardware_fits(self):
+        response = self.client.post("/pricing-Model/Pricingcalculation/", {
+            "cammera": 3000,
+            "storage_days": 1,
+            "DurationU": self.licence.id,
+        }, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertGreater(response.json()["cpuCores_required"], 64)
+
+    def finalize(self, scenario, changes):
+        pk = self.client.post("/pricing-Model/Pricingcalculation/", scenario, format="json").json()["id"]
+        response = self.client.patch(f"/pricing-Model/Pricingcalculation/{pk}/", changes, format="json")
+        self.assertEqual(response.status_code, 200)
+
+        expected = self.client.post(
+            "/pricing-Model/Pricingcalculation/preview/", {**scenario, **changes}, format="json",
+        ).json()
+        return UserPricing.objects.get(pk=pk), expected
+
+    def test_finalize_prices_the_fields_it_changes(self):
+        scenario = {
+            "cammera": 10,
+            "storage_days": 1,
+            "ai_features": [self.ai_features[0].id],
+            "DurationU": self.licence.id,
+        }
+
+        quotation, expected = self.finalize(scenario, {"storage_days": 30})
+
+        self.assertEqual(quotation.storage_days, 30)
+        self.assertEqual(quotation.storage_used_user, expected["storage_used_user"])
+        self.assertEqual(quotation.total_costing, expected["total_costing"])
+
+    def test_finalize_with_more_cameras_moves_the_ai_load(self):
+        scenario = {
+            "cammera": 10,
+            "storage_days": 1,
+            "ai_features": [self.ai_features[0].id],
+            "DurationU": self.licence.id,
+        }
+
+        # AI on every camera follows the new count
+        quotation, expected = self.finalize(scenario, {"cammera": 40})
+        self.assertEqual(quotation.aiEnabledCam, 40)
+        self.assertEqual(quotation.vram_required, expected["vram_required"])
+        self.assertEqual(quotation.total_costing, expected["total_costing"])
+
+        # An explicit AI camera count is taken as sent
+        quotation, expected = self.finalize(scenario, {"cammera": 40, "aiEnabledCam": 20})
+        self.assertEqual(quotation.aiEnabledCam, 20)
+        self.assertEqual(quotation.total_costing, expected["total_costing"])
+
+
+def engine_catalog():
+    return build_catalog(1, [
+        CatalogItem(id=1, category=CONFIG_CATEGORY, costing=None,
+                    cores_required1=0.5, cores_required2=0.3, ram_required1=0.5, VRAM_required=0.4),
+        CatalogItem(id=2, category=LICENCE_CATEGORY, costing=1000, Duration=1),
+        CatalogItem(id=3, category=STORAGE_CATEGORY, costing=7, storage_perDay=19),
+        CatalogItem(id=10, category=PROCESSOR_CATEGORY, costing=10000, core_hardware="cpu8", CPUcores=8, ram_required=16),
+        CatalogItem(id=11, category=PROCESSOR_CATEGORY, costing=20000, core_hardware="cpu16", CPUcores=16, ram_required=32),
+        CatalogItem(id=20, category=PROCESSOR_CATEGORY, costing=20000, AI_Component="gpu8", VRAM=8),
+        CatalogItem(id=21, category=PROCESSOR_CATEGORY, costing=40000, AI_Component="gpu16", VRAM=16),
+        CatalogItem(id=30, category=AI_CATEGORY, costing=500, AI_feature="feature0"),
+        CatalogItem(id=31, category=AI_CATEGORY, costing=None, AI_feature="unpriced"),
+    ])
+
+
+class PricingEngineTests(SimpleTestCase):
+
+    def setUp(self):
+        self.catalog = engine_catalog()
+
+    def test_requirements(self):
+        requirements = calculate_requirements(
+            self.catalog, cameras=10, storage_days=7, ai_features=[30], aiEnabledCam=4, duration_id=2,
+        )
+
+        self.assertEqual(requirements, {
+            "aiEnabledCam": 4,
+            "storage_days": 7,
+            "storage_used_user": 1330,
+            "vram_required": 4,
+            "cpuCores_required": 5,
+            "ram_required": 5,
+            "DurationU": 2,
+            "licenceCostU": 1000,
+        })
+
+    def test_requirements_switch_core_factor_above_camera_for_intel(self):
+        # camera_for_intel = int(20 * 0.8 / 0.5) = 32
+        below = calculate_requirements(self.catalog, cameras=31, duration_id=2)
+        above = calculate_requirements(self.catalog, cameras=32, duration_id=2)
+
+        self.assertEqual(below["cpuCores_required"], int(int(0.5 * 31) * 1.10))
+        self.assertEqual(above["cpuCores_required"], int(int(0.3 * 32) * 1.10))
+        self.assertEqual(above["aiEnabledCam"], 0)
+
+    def test_costs_pick_the_minimum_fit_hardware(self):
+        costs = calculate_costs(
+            self.catalog, cpuCores_required=10, ram_required=5, vram_required=9,
+            storage_used_user=1330, ai_feature_ids=[30], duration_id=2,
+        )
+
+        self.assertEqual(costs["cpu"].id, 11)
+        self.assertEqual(costs["gpu"].id, 21)
+        self.assertEqual(costs["storage_cost"], 490)
+        self.assertEqual(costs["total_costing"], 20000 + 40000 + 500 + 490 + 1000)
+
+    def test_excluded_hardware_is_not_charged(self):
+        costs = calculate_costs(
+            self.catalog, cpuCores_required=500, ram_required=5, vram_required=500,
+            storage_used_user=19, ai_feature_ids=[], duration_id=2,
+            include_cpu=False, include_gpu=False, include_storage=False,
+        )
+
+        self.assertIsNone(costs["cpu"])
+        self.assertIsNone(costs["gpu"])
+        self.assertEqual(costs["total_costing"], 1000)
+
+    def test_pricing_errors(self):
+        scenario = {"cammera": 10, "DurationU": 2}
+
+        for changes, message in [
+            ({"DurationU": 99}, "Invalid licence selection"),
+            ({"ai_features": [99]}, "Invalid AI feature: 99"),
+            ({"ai_features": [31]}, "Price not configured for AI feature: unpriced"),
+            ({"cammera": 1000}, "No CPU meets required core count"),
+        ]:
+            with self.subTest(changes=changes), self.assertRaisesMessage(PricingError, message):
+                price_scenario(self.catalog, {**scenario, **changes})
+
+    def test_price_curve_matches_price_scenario(self):
+        rng = random.Random(8)
+        catalog = synthetic_catalog(rng)
+        cameras = np.arange(1, 400, 7)
+
+        for scenario in random_scenarios(rng, catalog, 20):
+            curve = price_curve(catalog, cameras, scenario)
+            errors = {error["cammera"]: error["error"] for error in curve["errors"]}
+
+            for i, count in enumerate(cameras.tolist()):
+                try:
+                    quote = price_scenario(catalog, {**scenario, "cammera": count})
+                except PricingError as e:
+                    self.assertEqual(errors.get(count), str(e))
+                    continue
+
+                self.assertNotIn(count, errors)
+                self.assertEqual(curve["total_costing"][i], int(quote["total_costing"]))
+                self.assertEqual(curve["cpu"][i], quote["cpu"] and quote["cpu"].id)
+                self.assertEqual(curve["gpu"][i], quote["gpu"] and quote["gpu"].id)
+
+    def test_vectorised_cpu_selection_matches_select_cpu(self):
+        rng = random.Random(5)
+
+        for size in [0, 1, 2, 3, 7, 64, 100]:
+            index = HardwareIndex([
+                CatalogItem(id=i + 1, category=PROCESSOR_CATEGORY, costing=1,
+                            CPUcores=rng.randint(1, 40), ram_required=rng.randint(1, 30))
+                for i in range(size)
+            ])
+            cores = np.array([rng.randint(0, 45) for _ in range(300)])
+            ram = np.array([rng.randint(0, 35) for _ in range(300)])
+
+            picks = index.select_cpu_indices(cores, ram)
+
+            for c, r, pick in zip(cores.tolist(), ram.tolist(), picks.tolist()):
+                expected = index.select_cpu(c, r)
+                self.assertEqual(index.cpus[pick] if pick >= 0 else None, expected, (size, c, r))
+
+
+class PricingEngineBudgetTests(SimpleTestCase):
+    """
+    Per-quote allocation budget for price_scenario. Recorded baseline on a
+    synthetic 40-processor catalog: 1.9 KiB peak traced memory per quote;
+    the limit still catches a per-quote copy of the catalog. Latency
+    depends on the runner, so its budget is checked by
+    `manage.py benchmark_pricing --check` rather than here.
+    """
+
+    PEAK_BYTES = 4 * 1024
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.catalog = synthetic_catalog(rng)
+        self.scenarios = random_scenarios(rng, self.catalog, 500)
+
+    def quote(self, scenario):
+        try:
+            return price_scenario(self.catalog, scenario)
+        except PricingError:
+            return None
+
+    def test_allocations(self):
+        peaks = []
+        tracemalloc.start()
+        try:
+            for scenario in self.scenarios:
+                tracemalloc.reset_peak()
+                baseline, _ = tracemalloc.get_traced_memory()
+                self.quote(scenario)
+                peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(max(peaks), self.PEAK_BYTES)
+
+
+@override_settings(AUDIT_BUFFERED=False)
+class QuotationTemplateTests(PricingCatalogMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        response = self.client.post("/pricing-Model/Pricingcalculation/quote/", {
+            "cammera": 40,
+            "storage_days": 7,
+            "ai_features": [self.ai_features[0].id],
+            "DurationU": self.licence.id,
+        }, format="json")
+        self.data = quotation_pdf_data(UserPricing.objects.get(pk=response.json()["id"]), "staff")
+
+    def test_template_is_built_once_per_process(self):
+        self.assertIs(get_quotation_template(), get_quotation_template())
+
+    def test_shared_template_renders_like_a_fresh_one(self):
+        # Without timestamps and random ids, equal input gives equal bytes
+        with mock.patch.object(rl_config, "invariant", 1):
+            shared = get_quotation_template()
+            first = shared.render(self.data)
+
+            self.assertTrue(first.startswith(b"%PDF"))
+            self.assertEqual(shared.render(self.data), first)
+            self.assertEqual(QuotationTemplate().render(self.data), first)
+
+
+class FileSystemPDFStoreTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.store = FileSystemPDFStore(self.directory, max_bytes=300)
+
+    def age(self, key, seconds_ago):
+        # Deterministic LRU order instead of relying on mtime resolution
+        moment = time.time() - seconds_ago
+        os.utime(os.path.join(self.directory, f"{key}.pdf"), (moment, moment))
+
+    def test_hit_and_miss(self):
+        self.assertIsNone(self.store.get("a"))
+
+        self.store.set("a", b"%PDF a")
+
+        self.assertEqual(self.store.get("a"), b"%PDF a")
+        self.assertIsNone(self.store.get("b"))
+
+    def test_least_recently_used_are_evicted(self):
+        for age, key in enumerate("abc"):
+            self.store.set(key, bytes(100))
+            self.age(key, 100 - age)
+
+        # A read makes "a" the most recently used
+        self.store.get("a")
+        self.store.set("d", bytes(100))
+
+        self.assertEqual(self.store.get("a"), bytes(100))
+        self.assertIsNone(self.store.get("b"))
+        self.assertIsNone(self.store.get("c"))
+        self.assertEqual(self.store.get("d"), bytes(100))
+
+    def test_directory_is_only_scanned_over_budget(self):
+        self.store.set("a", bytes(100))
+
+        with mock.patch("pricingModel.api.pdf_cache.os.scandir", wraps=os.scandir) as scandir:
+            self.store.set("b", bytes(100))
+            # Replacing a render does not count it twice
+            self.store.set("b", bytes(100))
+            scandir.assert_not_called()
+
+            self.store.set("c", bytes(101))
+            scandir.assert_called_once()
+
+
+class RecordingSMTPHandler:
+    """aiosmtpd handler that keeps every message and counts sessions."""
+
+    refused = "refused@example.com"
+
+    def __init__(self):
+        self.sessions = 0
+        self.messages = []
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == self.refused:
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 Message accepted"
+
+
+@skipUnless(Controller, "aiosmtpd is not installed")
+class PersistentMailConnectionTests(SimpleTestCase):
+    """Against a local SMTP server, as the drain task uses it."""
+
+    def setUp(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+
+        self.handler = RecordingSMTPHandler()
+        self.server = self.start_server()
+        self.addCleanup(lambda: self.server.stop())
+
+        self.connection = PersistentMailConnection(
+            backend="django.core.mail.backends.smtp.EmailBackend",
+            host="127.0.0.1", port=self.port,
+            username="", password="", use_tls=False, use_ssl=False, timeout=5,
+        )
+        self.addCleanup(self.connection.close)
+
+    def start_server(self):
+        server = Controller(self.handler, hostname="127.0.0.1", port=self.port)
+        server.start()
+        return server
+
+    def message(self, to="someone@example.com"):
+        return EmailMessage("Quotation", "Body", "sales@example.com", [to])
+
+    def test_batch_goes_out_over_one_connection(self):
+        errors = self.connection.send_many([self.message() for _ in range(5)])
+
+        self.assertEqual(errors, [None] * 5)
+        self.assertEqual(len(self.handler.messages), 5)
+        self.assertEqual(self.handler.sessions, 1)
+
+    def test_connection_is_kept_between_batches(self):
+        self.connection.send_many([self.message()])
+        self.connection.send_many([self.message()])
+
+        self.assertEqual(self.handler.sessions, 1)
+
+    def test_reconnects_when_the_server_dropped_the_connection(self):
+        self.connection.send(self.message())
+
+        # Server restart: the kept connection is now dead
+        self.server.stop()
+        self.server = self.start_server()
+
+        with self.assertLogs("pricingModel.api.mail", "WARNING"):
+            self.assertEqual(self.connection.send(self.message()), 1)
+        self.assertEqual(len(self.handler.messages), 2)
+        self.assertEqual(self.handler.sessions, 2)
+
+    def test_errors_are_reported_per_message(self):
+        errors = self.connection.send_many([
+            self.message(),
+            self.message(to=RecordingSMTPHandler.refused),
+            self.message(),
+        ])
+
+        self.assertIsNone(errors[0])
+        self.assertIsInstance(errors[1], smtplib.SMTPRecipientsRefused)
+        self.assertIsNone(errors[2])
+        # A refused recipient does not cost the connection
+        self.assertEqual(self.handler.sessions, 1)
+
+
+@override_settings(AUDIT_BUFFERED=False)
+class StaleEmailDeliveryTests(PricingCatalogMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        response = self.client.post("/pricing-Model/Pricingcalculation/quote/", {
+            "cammera": 10,
+            "storage_days": 1,
+            "DurationU": self.licence.id,
+        }, format="json")
+        self.quotation = UserPricing.objects.get(pk=response.json()["id"])
+
+        queue = mock.patch.object(mail, "queue_email_delivery")
+        self.queue = queue.start()
+        self.addCleanup(queue.stop)
+
+    def delivery(self, status, age, attempts=0, recipient="client@example.com"):
+        delivery, _ = mail.request_quotation_email(self.quotation, self.user, recipient)
+        EmailDelivery.objects.filter(pk=delivery.pk).update(
+            status=status, attempts=attempts, updated_at=timezone.now() - age,
+        )
+        return delivery
+
+    def test_reaper_requeues_deliveries_left_behind(self):
+        stale = mail.EMAIL_STALE_AFTER + timedelta(minutes=1)
+
+        lost = self.delivery("queued", stale, recipient="lost@example.com")
+        crashed = self.delivery("sending", stale, attempts=1, recipient="crashed@example.com")
+        waiting = self.delivery("queued", stale, attempts=3, recipient="backoff@example.com")
+        busy = self.delivery("sending", timedelta(minutes=1), attempts=1, recipient="busy@example.com")
+        sent = self.delivery("sent", stale, attempts=1, recipient="sent@example.com")
+
+        self.queue.reset_mock()
+        requeued = mail.requeue_stale_deliveries()
+
+        # waiting is still inside its 2 minute backoff plus the grace period
+        self.assertCountEqual(requeued, [lost.id, crashed.id])
+        self.assertCountEqual([c.args[0] for c in self.queue.call_args_list], [lost.id, crashed.id])
+        self.assertEqual(EmailDelivery.objects.get(pk=crashed.pk).status, "queued")
+
+        for delivery, status in [(waiting, "queued"), (busy, "sending"), (sent, "sent")]:
+            self.assertEqual(EmailDelivery.objects.get(pk=delivery.pk).status, status)
+
+    def test_new_request_requeues_a_stale_delivery(self):
+        crashed = self.delivery("sending", mail.EMAIL_STALE_AFTER + timedelta(minutes=1), attempts=1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            delivery, queued = mail.request_quotation_email(self.quotation, self.user, "client@example.com")
+
+        self.assertEqual(delivery.pk, crashed.pk)
+        self.assertTrue(queued)
+        self.assertEqual(delivery.status, "queued")
+        self.queue.assert_called_with(crashed.pk)
+
+    def test_new_request_does_not_requeue_an_active_delivery(self):
+        self.delivery("sending", timedelta(minutes=1), attempts=1)
+
+        delivery, queued = mail.request_quotation_email(self.quotation, self.user, "client@example.com")
+
+        self.assertFalse(queued)
+        self.assertEqual(delivery.status, "sending")
+
+
+class AuditBufferTests(TransactionTestCase):
+    # Real commits, so deferred foreign keys are checked on flush
+
+    def setUp(self):
+        self.user = User.objects.create_user("audited")
+        self.buffer = AuditBuffer(batch_size=10, interval=60, max_size=100)
+
+    def buffer_events(self, *user_ids):
+        # Straight into the deque, so no flusher thread races the test
+        self.buffer._events.extend(
+            {"user_id": user_id, "action": "LOGIN", "details": str(i), "created_at": timezone.now()}
+            for i, user_id in enumerate(user_ids)
+        )
+
+    def test_rejected_event_does_not_block_the_rest(self):
+        gone = User.objects.create_user("gone")
+        gone_id = gone.id
+        gone.delete()
+        self.buffer_events(self.user.id, gone_id, None)
+
+        with self.assertLogs("pricingModel.api.audit", "ERROR"):
+            written = self.buffer.flush()
+
+        self.assertEqual(written, 2)
+        self.assertCountEqual(AuditLog.objects.values_list("details", flat=True), ["0", "2"])
+        self.assertEqual(len(self.buffer._events), 0)
+
+    def test_events_are_kept_while_the_database_is_away(self):
+        self.buffer_events(self.user.id, None)
+
+        with mock.patch.object(AuditLog.objects, "bulk_create", side_effect=OperationalError):
+            with self.assertRaises(OperationalError):
+                self.buffer.flush()
+
+        self.assertEqual(len(self.buffer._events), 2)
+        self.assertEqual(self.buffer.flush(), 2)
+
+    def test_client_ip_is_an_address_or_none(self):
+        factory = RequestFactory()
+
+        spoofed = factory.get("/", HTTP_X_FORWARDED_FOR="not-an-ip, 10.0.0.1", REMOTE_ADDR="198.51.100.7")
+        self.assertEqual(get_client_ip(spoofed), "198.51.100.7")
+        self.assertIsNone(get_client_ip(factory.get("/", REMOTE_ADDR="garbage")))
+
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}):
+            self.assertEqual(get_client_ip(spoofed), "10.0.0.1")
+            self.assertIsNone(get_client_ip(factory.get("/", HTTP_X_FORWARDED_FOR="bogus")))
+
+
+@skipUnless(connection.vendor == "postgresql", "audit partitions are Postgres only")
+class AuditDefaultPartitionTests(TestCase):
+
+    def partition_of(self, log):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT tableoid::regclass::text FROM {connection.ops.quote_name(audit_archive.AUDIT_TABLE)} "
+                f"WHERE id = %s",
+                [log.id],
+            )
+            return cursor.fetchone()[0].strip('"')
+
+    def test_rows_without_a_partition_are_kept_and_moved_later(self):
+        current = audit_archive.month_start(timezone.now())
+        month = audit_archive.add_months(current, 12)
+        log = AuditLog.objects.create(action="LOGIN", created_at=month + timedelta(days=3))
+
+        self.assertEqual(self.partition_of(log), audit_archive.DEFAULT_PARTITION)
+
+        created = audit_archive.ensure_audit_partitions(months_ahead=1)
+
+        self.assertIn(audit_archive.partition_name(month), created)
+        self.assertEqual(self.partition_of(log), audit_archive.partition_name(month))
+        self.assertIn(month, audit_archive.partition_months())
+
+
+class ListPaginationTests(PricingCatalogMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.quotations = self.create_quotations(5)
+
+        page_size = mock.patch.object(CreatedAtPagination, "page_size", 2)
+        page_size.start()
+        self.addCleanup(page_size.stop)
+
+    def test_lists_are_always_paginated(self):
+        newest_first = [q.id for q in UserPricing.objects.order_by("-created_at", "-id")]
+
+        for url in ["/pricing-Model/admin/quotations/", "/pricing-Model/user-quotations/"]:
+            with self.subTest(url):
+                response = self.client.get(url)
+                ids = [row["id"] for row in response.data["results"]]
+
+                while response.data["next"]:
+                    response = self.client.get(response.data["next"])
+                    ids += [row["id"] for row in response.data["results"]]
+
+                self.assertEqual(ids, newest_first)
+
+
+@override_settings(CATALOG_VERSION_STORE="database")
+class QuotationListQueryTests(PricingCatalogMixin, TestCase):
+    """The quotation lists run a fixed number of queries, however many rows."""
+
+    def setUp(self):
+        super().setUp()
+        self.create_quotations(10)
+        # Build the snapshot outside the measured requests
+        catalog.get_catalog()
+
+    def assertListQueries(self, url, queries):
+        for size in (1, 10):
+            with self.subTest(page_size=size), self.assertNumQueries(queries):
+                response = self.client.get(url, {"page_size": size})
+            self.assertEqual(len(response.data["results"]), size)
+
+        with self.subTest("default page size"), self.assertNumQueries(queries):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 10)
+
+    def test_user_quotations(self):
+        # Quotations, their AI features and the catalog version
+        self.assertListQueries("/pricing-Model/user-quotations/", 3)
+
+    def test_admin_quotations(self):
+        self.assertListQueries("/pricing-Model/admin/quotations/", 2)
+
+    def test_catalog_is_resolved_once_per_request(self):
+        with mock.patch("pricingModel.api.serializers.get_catalog") as per_row:
+            response = self.client.get("/pricing-Model/user-quotations/")
+
+        per_row.assert_not_called()
+        self.assertEqual(response.data["results"][0]["licenceDetails"]["id"], self.licence.id)
+
+
+@override_settings(CATALOG_VERSION_STORE="database")
+class QuotationPreviewQueryTests(PricingCatalogMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        catalog.get_catalog()
+
+    def test_preview_never_writes(self):
+        scenario = {
+            "cammera": 10,
+            "ai_features": [feature.id for feature in self.ai_features],
+            "DurationU": self.licence.id,
+        }
+
+        # Only the catalog version check, for a new scenario and a cached one
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as queries, self.assertNumQueries(1):
+                response = self.client.post("/pricing-Model/Pricingcalculation/preview/", scenario, format="json")
+
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(all(query["sql"].startswith("SELECT") for query in queries.captured_queries))
+
+        self.assertFalse(UserPricing.objects.exists())
+
+
+@override_settings(CATALOG_VERSION_STORE="database", AUDIT_BUFFERED=False)
+class QuotationCreateQueryTests(PricingCatalogMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        catalog.get_catalog()
+
+    def test_create_runs_a_fixed_number_of_queries(self):
+        # Catalog version, savepoint, quotation, its AI features in one
+        # insert, audit log, release savepoint; however many features
+        for count in (1, len(self.ai_features)):
+            with self.subTest(ai_features=count), self.assertNumQueries(6):
+                response = self.client.post("/pricing-Model/Pricingcalculation/quote/", {
+                    "cammera": 10,
+                    "ai_features": [feature.id for feature in self.ai_features[:count]],
+                    "DurationU": self.licence.id,
+                }, format="json")
+
+            self.assertEqual(response.status_code, 201)
+            quotation = UserPricing.objects.get(pk=response.json()["id"])
+            self.assertEqual(quotation.ai_features.count(), count)
+            self.assertEqual(quotation.total_costing, response.json()["total_costing"])
+
+
+class AuditLogSearchTests(PricingCatalogMixin, TestCase):
+
+    url = "/pricing-Model/admin/audit-logs/search/"
+
+    def setUp(self):
+        super().setUp()
+        self.other = User.objects.create_user("other")
+        now = timezone.now()
+
+        def log(action, user, ip, days_ago, details, user_agent="Mozilla/5.0"):
+            return AuditLog.objects.create(
+                action=action, user=user, ip_address=ip, details=details,
+                user_agent=user_agent, created_at=now - timedelta(days=days_ago),
+            )
+
+        self.login = log("LOGIN", self.user, "198.51.100.1", 0, "Signed in")
+        self.created = log("CREATE_QUOTATION", self.user, "198.51.100.2", 1, "Quotation created for warehouse cameras")
+        self.emailed = log("SEND_EMAIL", self.other, "198.51.100.1", 10, "Quotation emailed", "Mozilla/5.0 (Android 14; Mobile)")
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row["id"] for row in response.data["results"]]
+
+    def test_filters(self):
+        for params, expected in [
+            ({}, [self.login, self.created, self.emailed]),
+            ({"action": "LOGIN"}, [self.login]),
+            ({"user": self.other.id}, [self.emailed]),
+            ({"username": "staff"}, [self.login, self.created]),
+            ({"ip": "198.51.100.1"}, [self.login, self.emailed]),
+            ({"date_from": (timezone.now() - timedelta(days=2)).date()}, [self.login, self.created]),
+            ({"date_to": (timezone.now() - timedelta(days=5)).date()}, [self.emailed]),
+            ({"ip": "198.51.100.1", "user": self.user.id}, [self.login]),
+        ]:
+            with self.subTest(params=params):
+                self.assertEqual(self.search(**params), [log.id for log in expected])
+
+    def test_full_text_over_details_and_user_agent(self):
+        self.assertEqual(self.search(q="warehouse"), [self.created.id])
+        self.assertEqual(self.search(q="android"), [self.emailed.id])
+        self.assertEqual(self.search(q="quotation emailed"), [self.emailed.id])
+
+    def test_invalid_search_and_non_admins_are_refused(self):
+        response = self.client.get(self.url, {"date_from": "2026-02-01", "date_to": "2026-01-01"})
+        self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
@@ -4,6 +4,7 @@ import { HttpClient } from '@angular/common/http';
 import { RouterModule } from '@angular/router';
 import { ConfirmdialogService } from '../service/confirmdialog.service';
 import { environment } from '../../environments/environment';
+import { PagedListService } from '../service/paged-list.service';
 
 type ActiveSection = 'users' | 'quotations' | 'logs' | null;
 
@@ -62,24 +63,28 @@ export class AdminDashboard implements OnInit {
   quotations: AdminQuotation[] = [];
   logs: AuditLog[] = [];
 
-  constructor(private http: HttpClient, private confirm: ConfirmdialogService) {}
+  constructor(
+    private http: HttpClient,
+    private confirm: ConfirmdialogService,
+    private pagedList: PagedListService
+  ) {}
 
   ngOnInit(): void {
     this.loadCounts();
   }
 
   loadCounts() {
-    this.http.get<AdminUser[]>(this.USERS_API).subscribe({
+    this.pagedList.getAll<AdminUser>(this.USERS_API).subscribe({
       next: (res) => this.totalUsers = (res || []).length,
       error: () => {}
     });
 
-    this.http.get<AdminQuotation[]>(this.QUOTATIONS_API).subscribe({
+    this.pagedList.getAll<AdminQuotation>(this.QUOTATIONS_API).subscribe({
       next: (res) => this.totalQuotations = (res || []).length,
       error: () => {}
     });
 
-    this.http.get<AuditLog[]>(this.LOGS_API).subscribe({
+    this.pagedList.getAll<AuditLog>(this.LOGS_API).subscribe({
       next: (res) => this.logsCount = (res || []).length,
       error: () => {}
     });
@@ -108,7 +113,7 @@ export class AdminDashboard implements OnInit {
     logs: this.LOGS_API,
   };
 
-  this.http.get<any[]>(apiMap[this.activeSection]).subscribe({
+  this.pagedList.getAll<any>(apiMap[this.activeSection]).subscribe({
     next: (res) => {
       this.loadingSection = false;
 
@@ -4,6 +4,7 @@ import { HttpClient, HttpClientModule } from '@angular/common/http';
 import { FormsModule } from '@angular/forms';
 import { ToasterService } from '../service/toaster.service';
 import { environment } from '../../environments/environment';
+import { PagedListService } from '../service/paged-list.service';
 type SortBy = 'latest' | 'oldest';
 type ActionFilter = 'all' | 'LOGIN' | 'LOGOUT' | 'CREATE_QUOTATION' | 'DOWNLOAD_PDF' | 'SEND_EMAIL' | 'DELETE_QUOTATION' | 'UPDATE_PRICING';
 
@@ -49,7 +50,11 @@ export class Logs implements OnInit {
   showModal = false;
   selectedLog: AuditLogRow | null = null;
 
-  constructor(private http: HttpClient, private toast: ToasterService) {}
+  constructor(
+    private http: HttpClient,
+    private toast: ToasterService,
+    private pagedList: PagedListService
+  ) {}
 
   ngOnInit(): void {
     this.loadLogs();
@@ -59,7 +64,7 @@ export class Logs implements OnInit {
     this.loading = true;
     this.errorMsg = null;
 
-    this.http.get<AuditLogRow[]>(this.LOGS_API).subscribe({
+    this.pagedList.getAll<AuditLogRow>(this.LOGS_API).subscribe({
       next: (res) => {
         this.loading = false;
         this.logs = res || [];
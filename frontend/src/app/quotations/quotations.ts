@@ -6,6 +6,7 @@ import { AuthService } from '../service/auth.service';
 import { ToasterService } from '../service/toaster.service';
 import { ConfirmdialogService } from '../service/confirmdialog.service';
 import { environment } from '../../environments/environment';
+import { PagedListService } from '../service/paged-list.service';
 import { DomSanitizer, SafeResourceUrl } from '@angular/platform-browser';
 import { FormsModule } from '@angular/forms';
 export interface QuotationRow {
@@ -82,7 +83,8 @@ export class Quotations implements OnInit {
     private auth: AuthService,
     private toast: ToasterService,
     private confirm: ConfirmdialogService,
-    private sanitizer: DomSanitizer
+    private sanitizer: DomSanitizer,
+    private pagedList: PagedListService
   ) {}
 
   ngOnInit(): void {
@@ -162,7 +164,7 @@ loadMeThenQuotations() {
 
     const api = this.isAdmin ? this.ADMIN_LIST_API : this.USER_LIST_API;
 
-    this.http.get<QuotationRow[]>(api).subscribe({
+    this.pagedList.getAll<QuotationRow>(api).subscribe({
       next: (data) => {
         this.loading = false;
 
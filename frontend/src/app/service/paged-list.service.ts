@@ -0,0 +1,39 @@
+import { Injectable } from '@angular/core';
+import { HttpClient } from '@angular/common/http';
+import { EMPTY, Observable, expand, reduce } from 'rxjs';
+
+/** One page of a keyset (cursor) paginated list endpoint */
+export interface Page<T> {
+  next: string | null;
+  first: string;
+  results: T[];
+}
+
+@Injectable({ providedIn: 'root' })
+export class PagedListService {
+
+  // Largest page the backend serves (KeysetPagination.max_page_size)
+  private pageSize = 200;
+
+  constructor(private http: HttpClient) {}
+
+  /** GET one page; cursor comes from the previous page's next link */
+  getPage<T>(url: string, cursor: string | null = null): Observable<Page<T>> {
+    const params: Record<string, string | number> = { page_size: this.pageSize };
+    if (cursor) params['cursor'] = cursor;
+
+    return this.http.get<Page<T>>(url, { params });
+  }
+
+  /** Every row of a list, following next page by page */
+  getAll<T>(url: string): Observable<T[]> {
+    return this.getPage<T>(url).pipe(
+      // Only the cursor is taken from next, so the host the backend saw
+      // (behind a proxy) does not matter
+      expand(page => page.next
+        ? this.getPage<T>(url, new URL(page.next).searchParams.get('cursor'))
+        : EMPTY),
+      reduce((rows: T[], page: Page<T>) => rows.concat(page.results), [] as T[]),
+    );
+  }
+}
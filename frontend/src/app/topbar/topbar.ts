@@ -7,6 +7,7 @@ import { ConfirmdialogService } from '../service/confirmdialog.service';
 import { ActivatedRoute, NavigationEnd } from '@angular/router';
 import { filter } from 'rxjs/operators';
 import { environment } from '../../environments/environment';
+import { PagedListService } from '../service/paged-list.service';
 export interface Quotation {
   id: number;
   cammera: number;
@@ -57,7 +58,7 @@ export class Topbar implements OnInit {
   loading = false;
   errorMsg: string | null = null;
 
-  constructor(private router: Router, private http: HttpClient, private toast: ToasterService, private confirm: ConfirmdialogService ,  private route: ActivatedRoute ) {}
+  constructor(private router: Router, private http: HttpClient, private toast: ToasterService, private confirm: ConfirmdialogService ,  private route: ActivatedRoute, private pagedList: PagedListService ) {}
 
 private getDeepestRoute(route: ActivatedRoute): ActivatedRoute {
   let currentRoute = route;
@@ -105,7 +106,7 @@ private getDeepestRoute(route: ActivatedRoute): ActivatedRoute {
     this.loading = true;
     this.errorMsg = null;
 
-    this.http.get<Quotation[]>(this.QUOTATION_API).subscribe({
+    this.pagedList.getAll<Quotation>(this.QUOTATION_API).subscribe({
       next: (res) => {
         this.loading = false;
 
@@ -4,6 +4,7 @@ import { Router, RouterLink } from '@angular/router';
 import { HttpClient, HttpClientModule } from '@angular/common/http';
 import { AuthService } from '../service/auth.service';
 import { environment } from '../../environments/environment'; 
+import { PagedListService } from '../service/paged-list.service';
 import { ToasterService } from '../service/toaster.service';
 export interface Quotation {
   id: number;
@@ -59,7 +60,8 @@ export class UserDashboard implements OnInit {
     private http: HttpClient,
     private router: Router,
     private auth: AuthService,
-    private toast: ToasterService
+    private toast: ToasterService,
+    private pagedList: PagedListService
   ) {}
  
   ngOnInit(): void {
@@ -73,7 +75,7 @@ export class UserDashboard implements OnInit {
     this.loading = true;
     this.errorMsg = null;
 
-    this.http.get<any[]>(this.QUOTATION_API).subscribe({
+    this.pagedList.getAll<any>(this.QUOTATION_API).subscribe({
       next: (res) => {
         this.quotations = (res ?? []).map(q => ({
           ...q,
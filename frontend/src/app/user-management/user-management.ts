@@ -5,6 +5,7 @@ import { FormsModule } from '@angular/forms';
 import { ToasterService } from '../service/toaster.service';
 import { Router } from '@angular/router';
 import { environment } from '../../environments/environment';
+import { PagedListService } from '../service/paged-list.service';
 
 type RoleFilter = 'all' | 'admin' | 'user';
 type SortBy = 'latest' | 'oldest' | 'name';
@@ -82,7 +83,8 @@ export class UserManagement implements OnInit {
   constructor(
     private http: HttpClient,
     private toast: ToasterService,
-    private router: Router
+    private router: Router,
+    private pagedList: PagedListService
   ) {}
 
   ngOnInit(): void {
@@ -97,7 +99,7 @@ export class UserManagement implements OnInit {
     this.loading = true;
     this.errorMsg = null;
 
-    this.http.get<AdminUser[]>(this.USERS_API).subscribe({
+    this.pagedList.getAll<AdminUser>(this.USERS_API).subscribe({
       next: (res) => {
         this.users = res || [];
 
@@ -124,7 +126,7 @@ export class UserManagement implements OnInit {
   }
 
   loadQuotations() {
-    this.http.get<AdminQuotation[]>(this.QUOTATIONS_API).subscribe({
+    this.pagedList.getAll<AdminQuotation>(this.QUOTATIONS_API).subscribe({
       next: (res) => {
         this.quotations = res || [];
         this.buildStatsMap();